@@ -16,6 +16,7 @@ from trame.widgets import rca
 from trame.widgets import vuetify3 as v3
 
 from vtk_scene import ColorMode, FieldLocation, RenderView, SceneManager
+from vtk_scene.fields import field_index
 from vtk_scene.io import ReaderFactory
 from vtk_scene.lut import PRESETS
 from vtk_scene.utils import get_range
@@ -133,9 +134,10 @@ class App(TrameApp):
         location, field_name = self.state.color_by.split(LOCATION_FIELD_SEPARATOR)
         field_location = FieldLocation.get(location)
         array = field_location.get_array(self.representation.input_data, field_name)
-        min_value, max_value = get_range(array, mode.vector_component)
-        lut = SceneManager.active_scene.luts[field_name]
-        lut.rescale(min_value, max_value)
+        array_range = get_range(array, mode.vector_component)
+        if array_range is not None:
+            lut = SceneManager.active_scene.luts[field_name]
+            lut.rescale(*array_range)
         self.ctrl.view_update()
 
     @change("color_by")
@@ -146,9 +148,11 @@ class App(TrameApp):
             location, field_name = color_by.split(LOCATION_FIELD_SEPARATOR)
             field_location = FieldLocation.get(location)
             self.representation.color_by(field_name, field_location, reset_range=True)
-            array = field_location.get_array(self.representation.input_data, field_name)
-            if array is not None:
-                self.state.color_modes = [v.label for v in ColorMode.options(array)]
+            entry = field_index(self.representation.input_data).entry(
+                field_name, location
+            )
+            if entry is not None:
+                self.state.color_modes = [v.label for v in ColorMode.options(entry)]
                 self.state.color_mode = self.state.color_modes[0]
             else:
                 self.state.color_modes = []
@@ -178,9 +182,9 @@ class App(TrameApp):
             self.ctrl.view_update()
 
     @change("t_index")
-    def on_time_change(self, t_index, time_values, **_):
+    async def on_time_change(self, t_index, time_values, **_):
         if len(time_values):
-            self.view.update(time_values[t_index])
+            await self.view.update_async(time_values[t_index])
         self.ctrl.view_update()
 
 
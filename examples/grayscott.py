@@ -42,6 +42,7 @@ from trame.widgets import client, html
 from trame.widgets import vtk as vtkw
 
 from vtk_scene import RenderView
+from vtk_scene.io import WriterFactory
 
 # ---------------------------------------------------------------
 n = 200  # grid subdivisions
@@ -74,7 +75,16 @@ class VizApp(TrameApp):
             help="Compute normals",
             action="store_true",
         )
-        self.compute_normals = self.server.cli.parse_known_args()[0].normals
+        self.server.cli.add_argument(
+            "--record",
+            help="Stream the simulation time steps into a .vtkhdf file",
+        )
+        args = self.server.cli.parse_known_args()[0]
+        self.compute_normals = args.normals
+        self.recorder = None
+        if args.record:
+            self.recorder = WriterFactory.stream(args.record, compression=4)
+        self.step = 0
 
         self._setup_vtk()
         self._build_ui()
@@ -158,6 +168,11 @@ class VizApp(TrameApp):
         self.grd.point_data["escals"] = self.V.ravel()
         self.grd.points[:, 2] = self.V.ravel() * 0.1
 
+        # Recording happens in a background thread
+        if self.recorder is not None:
+            self.recorder.append(self.grd, self.step)
+        self.step += 1
+
         # VTK Scene
         self.representation.color_by("escals")
         self.representation.update()
@@ -194,6 +209,8 @@ class VizApp(TrameApp):
 def main():
     app = VizApp()
     app.server.start()
+    if app.recorder is not None:
+        app.recorder.close()
 
 
 if __name__ == "__main__":
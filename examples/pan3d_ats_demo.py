@@ -10,6 +10,7 @@ from vtkmodules.vtkFiltersCore import vtkThreshold
 
 from vtk_scene import FieldLocation, RenderView, SceneManager
 from vtk_scene.io import ReaderFactory
+from vtk_scene.utils import get_range
 
 COLS = {
     1: 12,
@@ -60,7 +61,8 @@ class MultiView(TrameApp):
 
         print("-" * 60)
         print("Available fields:")
-        for name in self.reader().cell_data.keys():
+        metadata = ReaderFactory.inspect(file_to_load)
+        for name in metadata.field_names(FieldLocation.CellData):
             print(f" - {name}")
         print("-" * 60)
 
@@ -94,11 +96,15 @@ class MultiView(TrameApp):
 
             if array is not None:
                 if grow:
-                    old_min, old_max = lut.scalar_range
-                    current_min, current_max = array.GetRange()
-                    lut.rescale(min(old_min, current_min), max(old_max, current_max))
+                    # Keep growing the range with every time step shown
+                    if lut.range_policy != "grow":
+                        lut.range_policy = "grow"
+                    lut.update_range(array)
                 else:
-                    lut.rescale(*array.GetRange())
+                    lut.range_policy = None
+                    array_range = get_range(array)
+                    if array_range is not None:
+                        lut.rescale(*array_range)
 
         self.ctrl.view_update_all()
 
@@ -208,9 +214,14 @@ class MultiView(TrameApp):
         self.ctrl.view_update_all()
 
     @change("time_index")
-    def on_time(self, time_index, time_values, **_):
-        for view in self.views.values():
-            view.update(time_values[time_index])
+    async def on_time(self, time_index, time_values, **_):
+        # Views sharing the reader execute it one at a time
+        await asyncio.gather(
+            *[
+                view.update_async(time_values[time_index])
+                for view in self.views.values()
+            ]
+        )
         self.ctrl.view_update_all()
 
     @change("playing")
@@ -0,0 +1,73 @@
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from vtkmodules.vtkFiltersGeneral import vtkDataSetTriangleFilter
+from vtkmodules.vtkImagingCore import vtkRTAnalyticSource
+from vtkmodules.vtkIOParallelXML import vtkXMLPUnstructuredGridWriter
+
+from vtk_scene.io import ReaderFactory
+
+
+def generate(file_name, size, number_of_pieces):
+    half = size // 2
+    source = vtkRTAnalyticSource(whole_extent=(-half, half, -half, half, -half, half))
+    writer = vtkXMLPUnstructuredGridWriter(
+        file_name=str(file_name),
+        number_of_pieces=number_of_pieces,
+        start_piece=0,
+        end_piece=number_of_pieces - 1,
+    )
+    source >> vtkDataSetTriangleFilter() >> writer
+    writer.Write()
+
+
+def timeit(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser("Parallel partitioned read benchmark")
+    parser.add_argument("--data", help="pvtu/vtkhdf file to read")
+    parser.add_argument("--size", type=int, default=100, help="generated grid size")
+    parser.add_argument("--cores", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_known_args()[0]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = args.data
+        if file_name is None:
+            file_name = Path(tmp) / "benchmark.pvtu"
+            print(f"Generating {args.size}^3 tetrahedral grid in {args.cores} pieces")
+            generate(file_name, args.size, args.cores)
+
+        serial = timeit(lambda: ReaderFactory.read(file_name), args.repeat)
+        print(f"{'serial':>8} {1:>6} {serial:8.3f}s")
+
+        for name, klass in (
+            ("thread", ThreadPoolExecutor),
+            ("process", ProcessPoolExecutor),
+        ):
+            workers = 1
+            while workers <= args.cores:
+                # Keep the pool alive so the worker startup is not measured
+                with klass(max_workers=workers) as pool:
+                    read = lambda pool=pool: ReaderFactory.read_partitioned(
+                        file_name, number_of_pieces=args.cores, executor=pool
+                    )
+                    read()
+                    elapsed = timeit(read, args.repeat)
+                print(f"{name:>8} {workers:>6} {elapsed:8.3f}s x{serial / elapsed:.2f}")
+                workers *= 2
+
+
+if __name__ == "__main__":
+    main()
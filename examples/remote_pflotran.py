@@ -279,7 +279,8 @@ class PFlotranViewer(TrameApp):
             self.slice.Update()
             ds = self.slice.GetOutput()
         data_range = get_range(ds.point_data[color_by])
-        lut.rescale(*data_range)
+        if data_range is not None:
+            lut.rescale(*data_range)
         self.ctx.view.update()
 
     async def _next_timestep(self):
@@ -0,0 +1,157 @@
+"""
+Bounds of (composite) data objects cached by MTime.
+
+Multiblock, partitioned and AMR datasets are traversed once per
+modification, their leaf bounds being computed in the shared range thread
+pool. The per-partition bounds are kept so callers (camera reset, culling)
+can reuse them.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from vtkmodules.vtkCommonDataModel import vtkDataSet
+
+from vtk_scene.ranges import address, executor
+
+
+def leaves(dobj):
+    """Yield the non empty datasets of a (possibly composite) data object"""
+    if dobj is None:
+        return
+    if isinstance(dobj, vtkDataSet):
+        if dobj.GetNumberOfPoints() or dobj.GetNumberOfCells():
+            yield dobj
+        return
+
+    iterator = dobj.NewIterator()
+    iterator.InitTraversal()
+    while not iterator.IsDoneWithTraversal():
+        yield from leaves(iterator.GetCurrentDataObject())
+        iterator.GoToNextItem()
+
+
+def mtime_key(dobj, datasets):
+    """
+    Return a key changing whenever dobj or one of its datasets is modified
+    (composite MTimes do not account for their partitions). Objects are
+    identified by their C++ address (see vtk_scene.ranges.address).
+    """
+    return (
+        (address(dobj), dobj.GetMTime()),
+        tuple((address(ds), ds.GetMTime()) for ds in datasets),
+    )
+
+
+def dataset_bounds(dataset):
+    return dataset.GetBounds()
+
+
+def compute_partition_bounds(datasets, parallel=True):
+    """
+    Return a (n, 6) array with the bounds of each dataset (only the ones
+    with initialized bounds are kept).
+    """
+    if parallel and len(datasets) > 1:
+        bounds = list(executor().map(dataset_bounds, datasets))
+    else:
+        bounds = [dataset_bounds(dataset) for dataset in datasets]
+    bounds = np.array(bounds, dtype=np.float64).reshape(-1, 6)
+    return bounds[(bounds[:, 0] <= bounds[:, 1]) & (bounds[:, 2] <= bounds[:, 3])]
+
+
+def combine(partition_bounds):
+    """Return the bounds enclosing a (n, 6) array of bounds (None if n == 0)"""
+    if partition_bounds.shape[0] == 0:
+        return None
+    mins = partition_bounds[:, 0::2].min(axis=0)
+    maxs = partition_bounds[:, 1::2].max(axis=0)
+    return tuple(float(v) for pair in zip(mins, maxs) for v in pair)
+
+
+class BoundsCache:
+    """
+    Least recently used cache of data object bounds.
+
+    Entries are keyed by the address and MTime of the data object and of
+    each of its leaf datasets, so modifying any partition (or its points)
+    computes the bounds again.
+    """
+
+    def __init__(self, max_entries=256):
+        """Create a cache
+
+        Args:
+            max_entries (int): Number of data objects kept
+        """
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """Return hit/miss counters along with the cache state"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def partition_bounds(self, dobj):
+        """
+        Return a read-only (n, 6) array holding the bounds of the non empty
+        leaf datasets of dobj (in traversal order).
+        """
+        if dobj is None:
+            return np.zeros((0, 6))
+
+        datasets = list(leaves(dobj))
+        key = mtime_key(dobj, datasets)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        bounds = compute_partition_bounds(datasets)
+        bounds.flags.writeable = False
+        with self._lock:
+            self._entries[key] = bounds
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return bounds
+
+    def get_bounds(self, dobj):
+        """Return the bounds of dobj or None when it holds no data"""
+        return combine(self.partition_bounds(dobj))
+
+    def invalidate(self, dobj=None):
+        """Remove the bounds of a given data object or all of them if None"""
+        with self._lock:
+            for key in list(self._entries):
+                if dobj is None or key[0][0] == address(dobj):
+                    del self._entries[key]
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        self.invalidate()
+        self.hits = 0
+        self.misses = 0
+
+
+BOUNDS_CACHE = BoundsCache()
+
+__all__ = [
+    "BOUNDS_CACHE",
+    "BoundsCache",
+    "leaves",
+]
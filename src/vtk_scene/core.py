@@ -129,10 +129,42 @@ class Group:
         self -= name
 
 
+class LookupTableGroup(Group):
+    """
+    Group of lookup tables supporting batch operations.
+    """
+
+    def rescale(self, ranges):
+        """Rescale many lookup tables at once
+
+        Each lookup table replaces its nodes in a single step, so its
+        observers (mappers, views) only see one modification.
+
+        Args:
+            ranges (dict): (min, max) range keyed by lookup table name.
+                Unknown names are ignored.
+
+        Returns:
+            list: Names of the rescaled lookup tables
+        """
+        rescaled = []
+        for name, (min_value, max_value) in ranges.items():
+            lut = self._content.get(name)
+            if lut is not None:
+                lut.rescale(min_value, max_value)
+                rescaled.append(name)
+        return rescaled
+
+
+GROUP_TYPES = {
+    "luts": LookupTableGroup,
+}
+
+
 class Scene:
     def __init__(self, name):
         for k in DEFAULT_GROUPS:
-            setattr(self, k, Group(k))
+            setattr(self, k, GROUP_TYPES.get(k, Group)(k))
         SceneContextManager.get_instance().register_scene(name, self)
 
     def __getitem__(self, name):
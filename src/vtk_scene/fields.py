@@ -0,0 +1,238 @@
+"""
+Index of the fields available on a (composite) data object.
+
+The index is built once per modification of the data object (and of its
+partitions) by walking the VTK field data directly, then answers field
+lookups (location, names, components, dtype) without going through the
+dataset adapter again. Ranges are computed lazily and cached by the index.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+from vtkmodules.util.numpy_support import get_vtk_to_numpy_typemap
+from vtkmodules.vtkCommonCore import vtkDataArray, vtkWeakReference
+from vtkmodules.vtkCommonDataModel import vtkDataSet
+
+from vtk_scene.bounds import leaves, mtime_key
+from vtk_scene.ranges import RANGE_CACHE
+
+# (dataset adapter attribute, vtkDataSet accessor) in default lookup order
+LOCATIONS = (
+    ("point_data", "GetPointData"),
+    ("cell_data", "GetCellData"),
+    ("field_data", "GetFieldData"),
+)
+
+
+@dataclass(frozen=True)
+class FieldEntry:
+    """Description of a field gathered across all the partitions"""
+
+    name: str
+    location: str
+    number_of_components: int
+    dtype: np.dtype
+    partitions: int = 1
+    total_partitions: int = 1
+
+    @property
+    def partial(self):
+        """True when the field only exists on some of the partitions"""
+        return self.partitions < self.total_partitions
+
+
+def arrays_of(dobj, location, name):
+    """Yield the VTK arrays of a field on the partitions of a data object"""
+    accessor = dict(LOCATIONS)[location]
+    datasets = list(leaves(dobj))
+    if not datasets and isinstance(dobj, vtkDataSet):
+        datasets = [dobj]
+    if location == "field_data" and not isinstance(dobj, vtkDataSet):
+        datasets.insert(0, dobj)
+    for dataset in datasets:
+        array = getattr(dataset, accessor)().GetArray(name)
+        if array is not None:
+            yield array
+
+
+class FieldIndex:
+    """
+    Fields of a data object keyed by location and name. Only a weak
+    reference to the VTK data object is kept (for lazy range computation),
+    so ranges stay available as long as the data object exists even when
+    its Python wrapper is collected.
+    """
+
+    def __init__(self, dobj):
+        self._dobj = vtkWeakReference()
+        if dobj is not None:
+            self._dobj.Set(dobj)
+        self._entries = {}
+        self._ranges = {}
+        self._lock = threading.Lock()
+
+        datasets = list(leaves(dobj))
+        if not datasets and isinstance(dobj, vtkDataSet):
+            datasets = [dobj]
+
+        typemap = get_vtk_to_numpy_typemap()
+        found = {}
+        for dataset in datasets:
+            for location, method_name in LOCATIONS:
+                arrays = getattr(dataset, method_name)()
+                for i in range(arrays.GetNumberOfArrays()):
+                    array = arrays.GetAbstractArray(i)
+                    if not isinstance(array, vtkDataArray) or not array.GetName():
+                        continue
+                    key = (location, array.GetName())
+                    if key in found:
+                        found[key][-1] += 1
+                    else:
+                        found[key] = [
+                            array.GetNumberOfComponents(),
+                            np.dtype(typemap.get(array.GetDataType(), np.float64)),
+                            1,
+                        ]
+
+        for (location, name), (components, dtype, count) in found.items():
+            self._entries[location, name] = FieldEntry(
+                name, location, components, dtype, count, len(datasets)
+            )
+
+        # Field data attached to the composite itself
+        if not isinstance(dobj, vtkDataSet) and dobj is not None:
+            arrays = dobj.GetFieldData()
+            for i in range(arrays.GetNumberOfArrays()):
+                array = arrays.GetAbstractArray(i)
+                if isinstance(array, vtkDataArray) and array.GetName():
+                    self._entries.setdefault(
+                        ("field_data", array.GetName()),
+                        FieldEntry(
+                            array.GetName(),
+                            "field_data",
+                            array.GetNumberOfComponents(),
+                            np.dtype(typemap.get(array.GetDataType(), np.float64)),
+                        ),
+                    )
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entries(self, location=None):
+        """Return the FieldEntry of a location (or all of them)"""
+        return [
+            entry
+            for entry in self._entries.values()
+            if location is None or entry.location == location
+        ]
+
+    def field_names(self, location):
+        """Return the field names available at a location"""
+        return [entry.name for entry in self.entries(location)]
+
+    def find(self, name, lookup_order=None):
+        """Return the first location holding a field (None if not found)"""
+        for location in lookup_order or [loc for loc, _ in LOCATIONS]:
+            if (location, name) in self._entries:
+                return location
+        return None
+
+    def entry(self, name, location=None):
+        """Return the FieldEntry of a field (None if not found)"""
+        location = location or self.find(name)
+        return self._entries.get((location, name))
+
+    def range(self, name, location=None, component=-1):
+        """Return (and remember) the range of a field component or magnitude"""
+        location = location or self.find(name)
+        dobj = self._dobj.Get()
+        if dobj is None or (location, name) not in self._entries:
+            return None
+        key = (location, name, component)
+        with self._lock:
+            if key in self._ranges:
+                return self._ranges[key]
+        # Merge the range of each partition array rather than going through
+        # the dataset adapter whose composite array type depends on VTK
+        value = None
+        for array in arrays_of(dobj, location, name):
+            array_range = RANGE_CACHE.get_range(array, component)
+            if array_range is None:
+                continue
+            if value is None:
+                value = array_range
+            else:
+                value = (min(value[0], array_range[0]), max(value[1], array_range[1]))
+        with self._lock:
+            self._ranges[key] = value
+        return value
+
+
+class FieldIndexCache:
+    """Least recently used FieldIndex per data object and MTime"""
+
+    def __init__(self, max_entries=64):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """Return hit/miss counters along with the cache state"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+        }
+
+    def get(self, dobj):
+        """Return the FieldIndex of a data object"""
+        if dobj is None:
+            return FieldIndex(None)
+        key = mtime_key(dobj, leaves(dobj))
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return index
+            self.misses += 1
+
+        index = FieldIndex(dobj)
+        with self._lock:
+            self._entries[key] = index
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+FIELD_INDEX_CACHE = FieldIndexCache()
+
+
+def field_index(dobj):
+    """Return the (cached) FieldIndex of a data object"""
+    return FIELD_INDEX_CACHE.get(dobj)
+
+
+__all__ = [
+    "FIELD_INDEX_CACHE",
+    "FieldEntry",
+    "FieldIndex",
+    "field_index",
+]
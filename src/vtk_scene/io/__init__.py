@@ -1,9 +1,20 @@
+from vtk_scene.io.cache import CACHE, DataObjectCache
 from vtk_scene.io.core import (
     ReaderFactory,
     WriterFactory,
 )
+from vtk_scene.io.pool import READER_POOL, ReaderPool
+from vtk_scene.io.stream import TimeSeriesWriter
+from vtk_scene.io.temporal import TEMPORAL_RANGES, TemporalRanges
 
 __all__ = [
+    "CACHE",
+    "READER_POOL",
+    "TEMPORAL_RANGES",
+    "DataObjectCache",
     "ReaderFactory",
+    "ReaderPool",
+    "TemporalRanges",
+    "TimeSeriesWriter",
     "WriterFactory",
 ]
@@ -0,0 +1,194 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from vtk_scene.io.selection import selection_key
+
+DEFAULT_MEMORY_BUDGET = 1 << 30  # 1 GiB
+
+
+def cache_directory():
+    """
+    Return the directory where vtk-scene persists its caches.
+    (VTK_SCENE_CACHE_DIR environment variable or ~/.cache/vtk-scene)
+    """
+    path = os.environ.get("VTK_SCENE_CACHE_DIR")
+    if path:
+        return Path(path)
+    return Path.home() / ".cache" / "vtk-scene"
+
+
+def memory_size(dobj):
+    """Return the memory footprint in bytes of a vtkDataObject"""
+    return dobj.GetActualMemorySize() * 1024
+
+
+def is_url(file_name):
+    """True when file_name is an http(s) URL"""
+    return str(file_name).startswith(("http://", "https://"))
+
+
+def reader_file_name(reader):
+    """
+    Return the file name of a reader (first one for multi-file readers) or
+    None for algorithms which are not reading a file (sources, filters).
+    """
+    if hasattr(reader, "GetNumberOfFileNames"):
+        return reader.GetFileName(0) if reader.GetNumberOfFileNames() else None
+    get_file_name = getattr(reader, "GetFileName", None)
+    return None if get_file_name is None else get_file_name()
+
+
+def file_key(file_name):
+    """Return (resolved path, modification time) for a given file"""
+    path = Path(file_name).resolve()
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    return (str(path), mtime)
+
+
+def cache_key(reader, time_value):
+    """
+    Return the key identifying the output of a reader at a given time.
+    Readers producing several outputs for the same file and time (i.e.
+    resolution levels) expose a cache_variant attribute to tell them apart.
+
+    Readers of several files (series, glob patterns) expose a
+    cache_file_name(time_value) method so the key follows the modification
+    time of the file actually read. None is returned when no modification
+    time is available (URLs, missing files): such outputs are not cached.
+    """
+    file_name = reader_file_name(reader)
+    if not file_name or is_url(file_name):
+        return None
+
+    path, mtime = file_key(file_name)
+    member_file_name = getattr(reader, "cache_file_name", None)
+    if member_file_name is not None:
+        member = member_file_name(time_value)
+        mtime = file_key(member) if member else (None, 0)
+        if not mtime[1]:
+            return None
+    elif not mtime:
+        return None
+
+    return (
+        path,
+        mtime,
+        time_value,
+        selection_key(reader),
+        getattr(reader, "cache_variant", None),
+    )
+
+
+class DataObjectCache:
+    """
+    Least recently used cache of data objects bounded by their memory size.
+
+    Entries are shallow copies of reader outputs so the arrays they hold are
+    shared with any data object currently in use.
+    """
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """Create a cache
+
+        Args:
+            memory_budget (int): Maximum number of bytes to keep in cache
+        """
+        self._memory_budget = memory_budget
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def memory_budget(self):
+        """Maximum number of bytes to keep in cache"""
+        return self._memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, value):
+        self._memory_budget = value
+        with self._lock:
+            self._evict()
+
+    @property
+    def nbytes(self):
+        """Number of bytes currently held by the cache"""
+        return self._nbytes
+
+    @property
+    def stats(self):
+        """Return hit/miss/eviction counters along with the cache usage"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "nbytes": self._nbytes,
+            "memory_budget": self._memory_budget,
+        }
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the data object stored for key or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def add(self, key, dobj):
+        """Store a data object under key, evicting the least recently used ones"""
+        nbytes = memory_size(dobj)
+        if nbytes > self._memory_budget:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[1]
+            self._entries[key] = (dobj, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+
+    def invalidate(self, file_name=None):
+        """Remove the entries of a given file or all of them if None"""
+        path = None if file_name is None else str(Path(file_name).resolve())
+        with self._lock:
+            for key in list(self._entries):
+                if path is None or (isinstance(key, tuple) and key[0] == path):
+                    self._nbytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        self.invalidate()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evict(self):
+        while self._nbytes > self._memory_budget and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+            self.evictions += 1
+
+
+CACHE = DataObjectCache()
+
+__all__ = [
+    "CACHE",
+    "DataObjectCache",
+    "is_url",
+]
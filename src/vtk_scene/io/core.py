@@ -1,12 +1,36 @@
+import asyncio
+import glob
+from functools import partial
 from pathlib import Path
 
-from vtk_scene.io import decorator, formats
+from vtk_scene.io import metadata, parallel
+from vtk_scene.io.cache import CACHE, is_url
+from vtk_scene.io.pool import READER_POOL
+from vtk_scene.io.prefetch import io_lock
+from vtk_scene.io.registry import REGISTRY
+from vtk_scene.io.selection import select_arrays, select_blocks
+from vtk_scene.io.stream import TimeSeriesWriter
 
-# ---------------------------------------------------------
-# TODO:
-# - Need to have a time series reader...
-# - Allow external registration
-# ---------------------------------------------------------
+
+def get_suffix(file_name):
+    """
+    Return the format suffix handling the given file name.
+    Glob patterns (i.e. out_*.vtu) are handled as file series and
+    http(s) URLs as remote files.
+    """
+    if is_url(file_name):
+        return ".remote"
+    suffix = Path(file_name).suffix
+    if glob.has_magic(str(file_name)) and REGISTRY.reader(suffix) is not None:
+        return ".series"
+    return suffix
+
+
+def resolve(file_name):
+    """Return the absolute path of a file (URLs are kept as is)"""
+    if is_url(file_name):
+        return str(file_name)
+    return str(Path(file_name).resolve())
 
 
 class ReaderFactory:
@@ -16,60 +40,185 @@ class ReaderFactory:
         Return reader class for selected filename.
         The set of preferred names will be used for prioritize class resolution.
         """
-        if ReaderFactory.can_read(file_name):
-            m = formats.get_module_from_suffix(Path(file_name).suffix)
-            for reader_name in preferred_name:
-                if reader_name in m.READERS:
-                    return decorator.add_time_properties(m.READERS[reader_name])
-            return decorator.add_time_properties(m.READERS[m.DEFAULT_READER])
+        klass = REGISTRY.reader(get_suffix(file_name), *preferred_name)
+        if klass is not None:
+            return klass
 
         msg = f"Can not read file: {file_name}"
         raise ValueError(msg)
 
     @staticmethod
-    def create(file_name, *preferred_name):
+    def create(
+        file_name,
+        *preferred_name,
+        arrays=None,
+        blocks=None,
+        time=None,
+        prefetch=0,
+        cache=CACHE,
+        ingested=True,
+    ):
         """
         Return reader instance for selected filename.
         The set of preferred names will be used for prioritize reader resolution.
+
+        Only the listed arrays and blocks (i.e. Exodus element blocks) will be
+        loaded when provided, and the output will be for the given time.
+        Time steps are kept in the provided cache (process wide by default,
+        None to disable) and when prefetch > 0, that many upcoming time steps
+        will be read in background threads (see reader.enable_prefetch).
+
+        When the file went through `python -m vtk_scene.io.ingest` and has not
+        been modified since, the reader will load its precomputed surfaces
+        instead and expose the ingested ranges/bounds through reader.ingest.
+        This only happens when the ingested arrays include the requested ones
+        (all of them when arrays is None) and the preferred names match the
+        ones used to ingest. Use ingested=False to always read the file itself.
+
+        http(s) URLs of VTKHDF files are read with range requests fetching
+        only the needed parts of the file (see vtk_scene.io.remote).
         """
+        if ingested and not is_url(file_name):
+            # Imported on use so `python -m vtk_scene.io.ingest` does not
+            # find the module already imported by the package
+            from vtk_scene.io.ingest import find  # noqa: PLC0415
+
+            index = find(file_name)
+            if index is not None and index.covers(arrays, preferred_name):
+                reader = ReaderFactory.create(
+                    index.file_name,
+                    arrays=arrays,
+                    blocks=blocks,
+                    time=time,
+                    prefetch=prefetch,
+                    cache=cache,
+                    ingested=False,
+                )
+                reader.ingest = index
+                return reader
+
         klass = ReaderFactory.klass(file_name, *preferred_name)
-        return klass(file_name=str(Path(file_name).resolve()))
+        reader = klass(file_name=resolve(file_name))
+        reader.cache = cache
+
+        if arrays is not None or blocks is not None:
+            with io_lock(reader):
+                reader.UpdateInformation()
+            if arrays is not None:
+                select_arrays(reader, arrays)
+            if blocks is not None:
+                select_blocks(reader, blocks)
+
+        if time is not None:
+            reader.UpdateTimeStep(time)
+
+        if prefetch > 0:
+            reader.enable_prefetch(lookahead=prefetch)
+        return reader
+
+    @staticmethod
+    def acquire(file_name, *preferred_name):
+        """
+        Return a session on a reader shared process wide (see
+        vtk_scene.io.pool). Sessions opening the same file share one reader
+        while each of them keeps its own output and time. Close the session
+        once done so the reader can be released after the pool ttl.
+        """
+        return READER_POOL.acquire(file_name, *preferred_name)
 
     @staticmethod
-    def read(file_name, *preferred_name):
+    def read(file_name, *preferred_name, arrays=None, blocks=None, time=None):
         """
         Return dataset for selected filename.
         The set of preferred names will be used for prioritize reader resolution.
+        Only the listed arrays and blocks will be loaded when provided.
+        """
+        reader = ReaderFactory.create(
+            file_name, *preferred_name, arrays=arrays, blocks=blocks, time=time
+        )
+        if time is not None:
+            return reader.GetOutputDataObject(0)
+
+        with io_lock(reader):
+            return reader()
+
+    @staticmethod
+    async def read_async(file_name, *preferred_name, executor=None, **kwargs):
+        """
+        Awaitable ReaderFactory.read executing the reader in the provided
+        executor (default: the loop default executor) so the event loop
+        keeps running while the file is being read.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, partial(ReaderFactory.read, file_name, *preferred_name, **kwargs)
+        )
+
+    @staticmethod
+    def read_partitioned(
+        file_name,
+        *preferred_name,
+        number_of_pieces=None,
+        max_workers=None,
+        executor="process",
+        arrays=None,
+        time=None,
+    ):
+        """
+        Return a vtkPartitionedDataSet gathering the pieces of the file read
+        in parallel by a pool of processes (or threads).
+        See vtk_scene.io.parallel.read_partitioned for the arguments.
+        """
+        return parallel.read_partitioned(
+            file_name,
+            *preferred_name,
+            number_of_pieces=number_of_pieces,
+            max_workers=max_workers,
+            executor=executor,
+            arrays=arrays,
+            time=time,
+        )
+
+    @staticmethod
+    def inspect(file_name, *preferred_name):
         """
-        reader = ReaderFactory.create(file_name, *preferred_name)
-        return reader()
+        Return a summary of the file content (arrays, blocks, time values,
+        bounds when available) gathered without reading the actual data.
+        Results are cached by path and modification time.
+        """
+        return metadata.inspect(file_name, *preferred_name)
 
     @staticmethod
     def can_read(file_name):
         """
         Check if the given file suffix could be read.
         """
-        m = formats.get_module_from_suffix(Path(file_name).suffix)
-        if m is None:
-            return False
-
-        return len(m.READERS) > 0
+        return REGISTRY.reader(get_suffix(file_name)) is not None
 
-    @property
+    @staticmethod
     def names():
         """
         List available reader names. (i.e. 'VTK XML', 'VTK HDF5', 'IOSS')
 
-        This lookup can be costly as it will import all the vtk modules with readers/writers.
+        The first lookup can be costly as it will import all the vtk modules
+        with readers/writers.
         """
-        return formats.extract_reader_names()
+        return REGISTRY.reader_names()
 
-    @property
+    @staticmethod
     def suffix():
         """
         List all the supported suffix.
         """
-        return [f".{module_name}" for module_name in formats.list_available_modules()]
+        return REGISTRY.suffixes()
+
+    @staticmethod
+    def register(suffix, module):
+        """
+        Register a format module (or its import path for lazy loading)
+        providing READERS/WRITERS for the given suffix.
+        """
+        REGISTRY.register(suffix, module)
 
 
 class WriterFactory:
@@ -79,12 +228,9 @@ class WriterFactory:
         Return writer class for selected filename.
         The set of preferred names will be used for prioritize class resolution.
         """
-        if WriterFactory.can_write(file_name):
-            m = formats.get_module_from_suffix(Path(file_name).suffix)
-            for writer_name in preferred_name:
-                if writer_name in m.WRITERS:
-                    return m.WRITERS[writer_name]
-            return m.WRITERS[m.DEFAULT_WRITER]
+        klass = REGISTRY.writer(Path(file_name).suffix, *preferred_name)
+        if klass is not None:
+            return klass
 
         msg = f"Can not write file: {file_name}"
         raise ValueError(msg)
@@ -95,7 +241,7 @@ class WriterFactory:
         Return writer instance for selected filename.
         The set of preferred names will be used for prioritize writer resolution.
         """
-        klass = ReaderFactory.klass(file_name, *preferred_name)
+        klass = WriterFactory.klass(file_name, *preferred_name)
         return klass(file_name=str(Path(file_name).resolve()))
 
     @staticmethod
@@ -116,29 +262,44 @@ class WriterFactory:
             raise ValueError(msg)
         writer.Write()
 
+    @staticmethod
+    def stream(file_name, compression=None, chunk_size=None, queue_size=2):
+        """
+        Return a TimeSeriesWriter appending time steps to a VTKHDF file from a
+        background thread. Points, topology and arrays left unchanged between
+        steps are written only once. Use it as a context manager to make
+        sure all the steps are on disk when leaving the block.
+        """
+        if Path(file_name).suffix != ".vtkhdf":
+            msg = f"Can only stream time steps into .vtkhdf files: {file_name}"
+            raise ValueError(msg)
+        return TimeSeriesWriter(
+            file_name,
+            compression=compression,
+            chunk_size=chunk_size,
+            queue_size=queue_size,
+        )
+
     @staticmethod
     def can_write(file_name):
         """
         Check if the given file suffix could be written.
         """
-        m = formats.get_module_from_suffix(Path(file_name).suffix)
-        if m is None:
-            return False
-
-        return len(m.WRITERS) > 0
+        return REGISTRY.writer(Path(file_name).suffix) is not None
 
-    @property
+    @staticmethod
     def names():
         """
         List available writer names. (i.e. 'VTK XML', 'VTK HDF5', 'IOSS')
 
-        This lookup can be costly as it will import all the vtk modules with readers/writers.
+        The first lookup can be costly as it will import all the vtk modules
+        with readers/writers.
         """
-        return formats.extract_writer_names()
+        return REGISTRY.writer_names()
 
-    @property
+    @staticmethod
     def suffix():
         """
         List all the supported suffix.
         """
-        return [f".{module_name}" for module_name in formats.list_available_modules()]
+        return REGISTRY.suffixes()
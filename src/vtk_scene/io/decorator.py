@@ -1,22 +1,146 @@
 from vtkmodules.vtkCommonDataModel import vtkDataObject
-from vtkmodules.vtkCommonExecutionModel import vtkStreamingDemandDrivenPipeline
+from vtkmodules.vtkCommonExecutionModel import (
+    vtkAlgorithm,
+    vtkStreamingDemandDrivenPipeline,
+)
+
+from vtk_scene.io.cache import CACHE, cache_key
+from vtk_scene.io.prefetch import (
+    TimeStepPrefetcher,
+    io_lock,
+    serialize_execution,
+    shallow_copy,
+)
+from vtk_scene.tasks import CoalescingRunner
 
 
 def get_time_steps(self):
-    self.UpdateInformation()
+    with io_lock(self):
+        self.UpdateInformation()
     oi = self.GetOutputInformation(0)
     return oi.Get(vtkStreamingDemandDrivenPipeline.TIME_STEPS())
 
 
 def get_time_value(self):
-    return self().GetInformation().Get(vtkDataObject.DATA_TIME_STEP())
+    with io_lock(self):
+        dobj = self()
+    return dobj.GetInformation().Get(vtkDataObject.DATA_TIME_STEP())
+
+
+def get_prefetcher(self):
+    return self.__dict__.get("_prefetcher")
+
+
+def get_cache(self):
+    return self.__dict__.get("_cache", CACHE)
+
+
+def set_cache(self, cache):
+    self._cache = cache
+
+
+def set_output(self, time_value, dobj):
+    """Make dobj the current output of the reader for the given time"""
+    with io_lock(self):
+        self.UpdateInformation()
+    self.GetOutputInformation(0).Set(
+        vtkStreamingDemandDrivenPipeline.UPDATE_TIME_STEP(), time_value
+    )
+    self.GetOutputDataObject(0).ShallowCopy(dobj)
+
+
+def update_time_step(self, time_value, *args):
+    prefetcher = get_prefetcher(self)
+    cache = get_cache(self) if prefetcher is None else prefetcher.cache
+    key = None if cache is None or args else cache_key(self, time_value)
+    if key is None:
+        with io_lock(self):
+            return vtkAlgorithm.UpdateTimeStep(self, time_value, *args)
+
+    dobj = cache.get(key) if prefetcher is None else prefetcher.get(key)
+    if dobj is None:
+        with io_lock(self):
+            result = vtkAlgorithm.UpdateTimeStep(self, time_value)
+        cache.add(key, shallow_copy(self.GetOutputDataObject(0)))
+    else:
+        set_output(self, time_value, dobj)
+        result = 1
+
+    if prefetcher is not None:
+        prefetcher.schedule(time_value)
+
+    return result
+
+
+def enable_prefetch(self, lookahead=2, max_workers=2):
+    """
+    Read the next `lookahead` time steps in background threads so
+    subsequent calls to UpdateTimeStep can be served from memory.
+    """
+    disable_prefetch(self)
+    self._prefetcher = TimeStepPrefetcher(
+        self,
+        lookahead=lookahead,
+        max_workers=max_workers,
+        cache=get_cache(self),
+    )
+    return self._prefetcher
+
+
+def disable_prefetch(self):
+    """Stop background time step reading"""
+    prefetcher = get_prefetcher(self)
+    if prefetcher is not None:
+        prefetcher.shutdown()
+        self._prefetcher = None
+
+
+def get_runner(self):
+    runner = self.__dict__.get("_runner")
+    if runner is None:
+        runner = self._runner = CoalescingRunner()
+    return runner
+
+
+def update(self, time_value=None):
+    if time_value is None:
+        with io_lock(self):
+            self.Update()
+    else:
+        self.UpdateTimeStep(time_value)
+    return self.GetOutputDataObject(0)
+
+
+async def update_async(self, time_value=None):
+    """
+    Awaitable UpdateTimeStep (or Update when no time is given) executed in
+    a background thread. Returns the output data object.
+
+    While a call is executing, only the latest following request is kept,
+    the superseded ones raise asyncio.CancelledError.
+    """
+    return await get_runner(self).submit(update, self, time_value)
+
 
+def add_time_properties(klass, thread_safe=True, block_selections=()):
+    def __init__(self, *args, **kwargs):
+        klass.__init__(self, *args, **kwargs)
+        serialize_execution(self)
 
-def add_time_properties(klass):
     class_name = f"Py{klass.__name__}"
     class_dict = {
+        "__init__": __init__,
+        "thread_safe": thread_safe,
+        "block_selections": tuple(block_selections),
+        "ingest": None,
         "time_values": property(get_time_steps),
         "time_value": property(get_time_value),
+        "prefetcher": property(get_prefetcher),
+        "cache": property(get_cache, set_cache),
+        "enable_prefetch": enable_prefetch,
+        "disable_prefetch": disable_prefetch,
+        "UpdateTimeStep": update_time_step,
+        "update_async": update_async,
     }
     return type(class_name, (klass,), class_dict)
 
@@ -2,6 +2,12 @@ from vtkmodules.vtkIOIOSS import vtkIOSSReader, vtkIOSSWriter
 
 DEFAULT_READER = "IOSS"
 DEFAULT_WRITER = "IOSS"
+THREAD_SAFE = False  # HDF5/NetCDF shipped with VTK are not thread safe
+BLOCK_SELECTIONS = (
+    "GetElementBlockSelection",
+    "GetSideSetSelection",
+    "GetNodeSetSelection",
+)
 
 READERS = {
     DEFAULT_READER: vtkIOSSReader,
@@ -0,0 +1,13 @@
+from vtkmodules.vtkIOParallelXML import vtkXMLPUnstructuredGridWriter
+from vtkmodules.vtkIOXML import vtkXMLPUnstructuredGridReader
+
+DEFAULT_READER = "VTK XML"
+DEFAULT_WRITER = "VTK XML"
+
+READERS = {
+    DEFAULT_READER: vtkXMLPUnstructuredGridReader,
+}
+
+WRITERS = {
+    DEFAULT_WRITER: vtkXMLPUnstructuredGridWriter,
+}
@@ -0,0 +1,10 @@
+from vtk_scene.io.remote import RemoteHDFReader
+
+DEFAULT_READER = "VTK HDF5 (HTTP)"
+DEFAULT_WRITER = None
+
+READERS = {
+    DEFAULT_READER: RemoteHDFReader,
+}
+
+WRITERS = {}
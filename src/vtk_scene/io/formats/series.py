@@ -0,0 +1,10 @@
+from vtk_scene.io.series import FileSeriesReader
+
+DEFAULT_READER = "File Series"
+DEFAULT_WRITER = None
+
+READERS = {
+    DEFAULT_READER: FileSeriesReader,
+}
+
+WRITERS = {}
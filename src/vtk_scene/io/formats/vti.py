@@ -3,11 +3,14 @@ from vtkmodules.vtkIOXML import (
     vtkXMLImageDataWriter,
 )
 
+from vtk_scene.io.pyramid import PyramidReader
+
 DEFAULT_READER = "VTK XML"
 DEFAULT_WRITER = "VTK XML"
 
 READERS = {
     DEFAULT_READER: vtkXMLImageDataReader,
+    "Pyramid": PyramidReader,
 }
 
 WRITERS = {
@@ -2,6 +2,7 @@ from vtkmodules.vtkIOHDF import vtkHDFReader, vtkHDFWriter
 
 DEFAULT_READER = "VTK HDF5"
 DEFAULT_WRITER = "VTK HDF5"
+THREAD_SAFE = False  # HDF5/NetCDF shipped with VTK are not thread safe
 
 READERS = {
     DEFAULT_READER: vtkHDFReader,
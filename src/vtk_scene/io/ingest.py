@@ -0,0 +1,319 @@
+"""
+Convert readable files into a render optimized VTKHDF cache.
+
+    python -m vtk_scene.io.ingest data/can.ex2 --arrays EQPS --compression 4
+
+The cache holds the extracted surfaces of every time step along with the
+per-step range of each field and the dataset bounds. Once a file has been
+ingested, ReaderFactory.create transparently reads its cache instead (as
+long as the source file has not been modified since).
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from vtkmodules.util.vtkAlgorithm import VTKPythonAlgorithmBase
+from vtkmodules.vtkCommonDataModel import vtkDataObject
+from vtkmodules.vtkFiltersGeometry import vtkDataSetSurfaceFilter
+from vtkmodules.vtkIOHDF import vtkHDFWriter
+
+from vtk_scene.bounds import leaves
+from vtk_scene.io import core
+from vtk_scene.io.cache import cache_directory, file_key
+from vtk_scene.io.prefetch import closest_index
+from vtk_scene.utils import FieldLocation, merge_bounds, merge_range
+
+logger = logging.getLogger(__name__)
+
+LOCATIONS = (FieldLocation.PointData, FieldLocation.CellData)
+
+
+def range_key(location, name, component=-1):
+    """Key of the ranges of a field component (-1 for the magnitude)"""
+    if component < 0:
+        return f"{location.value}/{name}"
+    return f"{location.value}/{name}/{component}"
+
+
+def source_key(file_name):
+    """
+    Return (resolved path, modification time) of a source.
+    The directory modification time is used for glob patterns.
+    """
+    path, mtime = file_key(file_name)
+    if not mtime:
+        mtime = file_key(Path(path).parent)[1]
+    return path, mtime
+
+
+def cache_files(file_name):
+    """Return the (.vtkhdf, .json) cache files for a given source"""
+    path = str(Path(file_name).resolve())
+    base = cache_directory() / "ingest" / hashlib.sha1(path.encode()).hexdigest()
+    return base.with_suffix(".vtkhdf"), base.with_suffix(".json")
+
+
+@dataclass(frozen=True)
+class IngestIndex:
+    """Content of an ingested cache: surfaces file along with ranges and bounds"""
+
+    source: str
+    mtime: int
+    file_name: str
+    time_values: tuple = field(default_factory=tuple)
+    ranges: dict = field(default_factory=dict)
+    bounds: tuple = field(default_factory=tuple)
+    arrays: tuple = None
+    readers: tuple = field(default_factory=tuple)
+
+    def covers(self, arrays=None, preferred_name=()):
+        """
+        Whether the cache can stand for reading the source with the given
+        arrays (None for all of them) and preferred readers.
+        """
+        if preferred_name and tuple(preferred_name) != self.readers:
+            return False
+        if self.arrays is None:
+            return True
+        return arrays is not None and set(arrays) <= set(self.arrays)
+
+    def step(self, time_value=None):
+        """Return the index of the step for a given time (None for all)"""
+        if time_value is None or not self.time_values:
+            return None
+        return closest_index(self.time_values, time_value)
+
+    def range(self, name, location=None, time_value=None, component=-1):
+        """
+        Return the range of a field component (-1 for the magnitude) for a
+        given time or over all the time steps when time_value is None. None
+        when not available.
+        """
+        locations = LOCATIONS if location is None else (location,)
+        for loc in locations:
+            ranges = self.ranges.get(range_key(loc, name, component))
+            if ranges is None:
+                continue
+            step = self.step(time_value)
+            if step is not None:
+                return tuple(ranges[step]) if ranges[step] else None
+            full_range = None
+            for step_range in ranges:
+                full_range = merge_range(full_range, step_range)
+            return tuple(full_range) if full_range else None
+        return None
+
+    def bounds_at(self, time_value=None):
+        """Return the bounds for a given time or over all the time steps"""
+        step = self.step(time_value)
+        if step is not None:
+            return tuple(self.bounds[step]) if self.bounds[step] else None
+        full_bounds = None
+        for step_bounds in self.bounds:
+            full_bounds = merge_bounds(full_bounds, step_bounds)
+        return tuple(full_bounds) if full_bounds else None
+
+
+@lru_cache(maxsize=256)
+def _cached_find(path, mtime, _index_mtime):
+    data_file, index_file = cache_files(path)
+    if not index_file.exists() or not data_file.exists():
+        return None
+    try:
+        content = json.loads(index_file.read_text())
+    except ValueError:
+        return None
+    if content.get("source") != path or content.get("mtime") != mtime:
+        return None
+    if "arrays" not in content:
+        # Written before the arrays were recorded: can not tell what it holds
+        return None
+    arrays = content["arrays"]
+    return IngestIndex(
+        path,
+        mtime,
+        str(data_file),
+        tuple(content["time_values"]),
+        content["ranges"],
+        tuple(content["bounds"]),
+        None if arrays is None else tuple(arrays),
+        tuple(content.get("readers", ())),
+    )
+
+
+def find(file_name):
+    """Return the IngestIndex of an up to date cache for file_name or None"""
+    path, mtime = source_key(file_name)
+    index_mtime = file_key(cache_files(path)[1])[1]
+    if not index_mtime:
+        return None
+    return _cached_find(path, mtime, index_mtime)
+
+
+class StepRecorder(VTKPythonAlgorithmBase):
+    """
+    Pass-through filter recording the field ranges and bounds of each time
+    step flowing through it.
+    """
+
+    def __init__(self):
+        super().__init__(
+            nInputPorts=1,
+            nOutputPorts=1,
+            inputType="vtkDataObject",
+            outputType="vtkDataObject",
+        )
+        self.steps = {}
+
+    def RequestDataObject(self, _request, in_info, out_info):
+        input = vtkDataObject.GetData(in_info[0])
+        output = vtkDataObject.GetData(out_info)
+        if output is None or output.GetClassName() != input.GetClassName():
+            out_info.GetInformationObject(0).Set(
+                vtkDataObject.DATA_OBJECT(), input.NewInstance()
+            )
+        return 1
+
+    def RequestData(self, _request, in_info, out_info):
+        input = vtkDataObject.GetData(in_info[0])
+        output = vtkDataObject.GetData(out_info)
+        output.ShallowCopy(input)
+
+        time_value = 0.0
+        info = input.GetInformation()
+        if info.Has(vtkDataObject.DATA_TIME_STEP()):
+            time_value = info.Get(vtkDataObject.DATA_TIME_STEP())
+
+        ranges = {}
+        bounds = None
+        for dataset in leaves(input):
+            bounds = merge_bounds(bounds, dataset.GetBounds())
+            for location in LOCATIONS:
+                arrays = getattr(dataset, f"Get{location.name}")()
+                for i in range(arrays.GetNumberOfArrays()):
+                    array = arrays.GetArray(i)
+                    if array is None or not array.GetName():
+                        continue
+                    components = array.GetNumberOfComponents()
+                    for component in range(-1, components if components > 1 else 0):
+                        key = range_key(location, array.GetName(), component)
+                        ranges[key] = merge_range(
+                            ranges.get(key), array.GetRange(component)
+                        )
+
+        self.steps[time_value] = (ranges, bounds)
+        return 1
+
+
+def ingest(file_name, *preferred_name, arrays=None, compression=4, chunk_size=None):
+    """
+    Write the surfaces of all the time steps of a file into the ingest cache
+    along with per-step field ranges and bounds.
+
+    Args:
+        file_name (str): File (or glob pattern) to convert
+        preferred_name (str): Reader names to prioritize
+        arrays (list[str]): Only keep those arrays
+        compression (int): gzip level used in the VTKHDF file (0 to disable)
+        chunk_size (int): Number of values per HDF5 chunk (default: VTK default)
+
+    Returns:
+        IngestIndex of the written cache
+    """
+    path, mtime = source_key(file_name)
+    data_file, index_file = cache_files(path)
+    data_file.parent.mkdir(parents=True, exist_ok=True)
+
+    reader = core.ReaderFactory.create(
+        path, *preferred_name, arrays=arrays, cache=None, ingested=False
+    )
+    recorder = StepRecorder()
+    writer = vtkHDFWriter(
+        file_name=str(data_file),
+        write_all_time_steps=1,
+        compression_level=compression,
+    )
+    if chunk_size:
+        writer.chunk_size = chunk_size
+    reader >> recorder >> vtkDataSetSurfaceFilter() >> writer
+    writer.Write()
+
+    time_values = tuple(reader.time_values or ())
+    recorded = sorted(recorder.steps)
+    steps = [recorder.steps[t] for t in recorded]
+    if time_values:
+        steps = [steps[closest_index(recorded, t)] for t in time_values]
+    ranges = {}
+    for i, (step_ranges, _) in enumerate(steps):
+        for key, value in step_ranges.items():
+            ranges.setdefault(key, [None] * len(steps))[i] = value
+
+    index_file.write_text(
+        json.dumps(
+            {
+                "source": path,
+                "mtime": mtime,
+                "time_values": time_values,
+                "ranges": ranges,
+                "bounds": [bounds for _, bounds in steps],
+                "arrays": None if arrays is None else list(arrays),
+                "readers": list(preferred_name),
+            }
+        )
+    )
+    return find(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        "python -m vtk_scene.io.ingest",
+        description="Convert files into a render optimized VTKHDF cache",
+    )
+    parser.add_argument("files", nargs="+", help="Files (or glob patterns) to ingest")
+    parser.add_argument("--arrays", nargs="+", help="Only keep those arrays")
+    parser.add_argument("--reader", nargs="*", default=(), help="Preferred readers")
+    parser.add_argument("--compression", type=int, default=4, help="gzip level")
+    parser.add_argument("--chunk-size", type=int, help="HDF5 chunk size")
+    parser.add_argument(
+        "--force", action="store_true", help="Ingest even when the cache is valid"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    for file_name in args.files:
+        index = find(file_name)
+        arrays = None if args.arrays is None else tuple(args.arrays)
+        if not args.force and index is not None and index.arrays == arrays:
+            logger.info("%s: up to date", file_name)
+            continue
+        start = time.perf_counter()
+        index = ingest(
+            file_name,
+            *args.reader,
+            arrays=args.arrays,
+            compression=args.compression,
+            chunk_size=args.chunk_size,
+        )
+        logger.info(
+            "%s: %d time steps in %.1fs => %s",
+            file_name,
+            max(1, len(index.time_values)),
+            time.perf_counter() - start,
+            index.file_name,
+        )
+
+
+__all__ = [
+    "IngestIndex",
+    "find",
+    "ingest",
+]
+
+if __name__ == "__main__":
+    main()
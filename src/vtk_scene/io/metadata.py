@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from vtkmodules.util.numpy_support import get_numpy_array_type
+from vtkmodules.vtkCommonDataModel import vtkDataObject
+from vtkmodules.vtkCommonExecutionModel import vtkStreamingDemandDrivenPipeline
+
+from vtk_scene.io import core
+from vtk_scene.io.cache import file_key, reader_file_name
+from vtk_scene.io.prefetch import io_lock
+from vtk_scene.utils import FieldLocation
+
+FIELD_VECTORS = (
+    (FieldLocation.PointData, vtkDataObject.POINT_DATA_VECTOR()),
+    (FieldLocation.CellData, vtkDataObject.CELL_DATA_VECTOR()),
+)
+
+FIELD_SELECTIONS = (
+    (FieldLocation.PointData, "GetPointDataArraySelection"),
+    (FieldLocation.CellData, "GetCellDataArraySelection"),
+    (FieldLocation.FieldData, "GetFieldDataArraySelection"),
+    (FieldLocation.PointData, "GetNodeBlockFieldSelection"),
+    (FieldLocation.CellData, "GetElementBlockFieldSelection"),
+)
+
+BLOCK_SELECTIONS = ("GetElementBlockSelection",)
+
+
+@dataclass(frozen=True)
+class ArrayMetadata:
+    name: str
+    location: FieldLocation
+    components: int | None = None
+    dtype: str | None = None
+
+
+@dataclass(frozen=True)
+class DatasetMetadata:
+    file_name: str
+    reader: str
+    data_type: str
+    arrays: tuple = field(default_factory=tuple)
+    blocks: tuple = field(default_factory=tuple)
+    time_values: tuple = field(default_factory=tuple)
+    bounds: tuple | None = None
+
+    def field_names(self, location=None):
+        """List the array names (optionally for a given FieldLocation)"""
+        return [a.name for a in self.arrays if location in (None, a.location)]
+
+    def get(self, name, location=None):
+        """Return the ArrayMetadata for a given name or None"""
+        for array in self.arrays:
+            if array.name == name and location in (None, array.location):
+                return array
+        return None
+
+
+def numpy_type_name(vtk_type):
+    """Convert a VTK array type into a numpy dtype name"""
+    try:
+        return np.dtype(get_numpy_array_type(vtk_type)).name
+    except KeyError:
+        return None
+
+
+def arrays_from_information(out_info):
+    """Array description published by readers in their output information"""
+    arrays = []
+    for location, key in FIELD_VECTORS:
+        if not out_info.Has(key):
+            continue
+        vector = out_info.Get(key)
+        for i in range(vector.GetNumberOfInformationObjects()):
+            info = vector.GetInformationObject(i)
+            arrays.append(
+                ArrayMetadata(
+                    info.Get(vtkDataObject.FIELD_NAME()),
+                    location,
+                    info.Get(vtkDataObject.FIELD_NUMBER_OF_COMPONENTS()),
+                    numpy_type_name(info.Get(vtkDataObject.FIELD_ARRAY_TYPE())),
+                )
+            )
+    return arrays
+
+
+def arrays_from_selections(reader, known):
+    """Array names exposed by reader selections that are not already known"""
+    arrays = []
+    for location, method_name in FIELD_SELECTIONS:
+        method = getattr(reader, method_name, None)
+        if method is None:
+            continue
+        selection = method()
+        for i in range(selection.GetNumberOfArrays()):
+            name = selection.GetArrayName(i)
+            if (name, location) not in known:
+                known.add((name, location))
+                arrays.append(ArrayMetadata(name, location))
+    return arrays
+
+
+def image_bounds(out_info):
+    """Compute the bounds of image data from its whole extent"""
+    sddp = vtkStreamingDemandDrivenPipeline
+    if not out_info.Has(sddp.WHOLE_EXTENT()) or not out_info.Has(
+        vtkDataObject.SPACING()
+    ):
+        return None
+
+    extent = out_info.Get(sddp.WHOLE_EXTENT())
+    spacing = out_info.Get(vtkDataObject.SPACING())
+    origin = (
+        out_info.Get(vtkDataObject.ORIGIN())
+        if out_info.Has(vtkDataObject.ORIGIN())
+        else (0, 0, 0)
+    )
+    bounds = []
+    for axis in range(3):
+        bounds.append(origin[axis] + extent[2 * axis] * spacing[axis])
+        bounds.append(origin[axis] + extent[2 * axis + 1] * spacing[axis])
+    return tuple(bounds)
+
+
+def extract_metadata(reader):
+    """Gather the metadata of a reader only using its information pass"""
+    with io_lock(reader):
+        reader.UpdateInformation()
+
+    series = getattr(reader, "index", None)
+    if series is not None and len(series):
+        metadata = inspect(series.files[0])
+        return DatasetMetadata(
+            reader_file_name(reader),
+            reader.GetClassName(),
+            metadata.data_type,
+            metadata.arrays,
+            metadata.blocks,
+            tuple(series.time_values),
+            metadata.bounds,
+        )
+
+    out_info = reader.GetOutputInformation(0)
+    arrays = arrays_from_information(out_info)
+    arrays += arrays_from_selections(reader, {(a.name, a.location) for a in arrays})
+
+    blocks = []
+    for method_name in BLOCK_SELECTIONS:
+        method = getattr(reader, method_name, None)
+        if method is not None:
+            selection = method()
+            blocks.extend(
+                selection.GetArrayName(i) for i in range(selection.GetNumberOfArrays())
+            )
+
+    time_values = ()
+    if out_info.Has(vtkStreamingDemandDrivenPipeline.TIME_STEPS()):
+        time_values = tuple(out_info.Get(vtkStreamingDemandDrivenPipeline.TIME_STEPS()))
+
+    output = reader.GetOutputDataObject(0)
+    return DatasetMetadata(
+        reader_file_name(reader),
+        reader.GetClassName(),
+        output.GetClassName() if output else None,
+        tuple(arrays),
+        tuple(blocks),
+        time_values,
+        image_bounds(out_info),
+    )
+
+
+@lru_cache(maxsize=1024)
+def _cached_inspect(file_name, _mtime, preferred_name):
+    reader = core.ReaderFactory.create(
+        file_name, *preferred_name, cache=None, ingested=False
+    )
+    return extract_metadata(reader)
+
+
+def inspect(file_name, *preferred_name):
+    """
+    Return the DatasetMetadata of a file without reading its content.
+    Results are cached by resolved path and modification time.
+    """
+    path, mtime = file_key(file_name)
+    if not mtime:
+        # Glob pattern: use the directory modification time to detect new files
+        mtime = file_key(Path(path).parent)[1]
+    return _cached_inspect(path, mtime, preferred_name)
+
+
+__all__ = [
+    "ArrayMetadata",
+    "DatasetMetadata",
+    "inspect",
+]
@@ -0,0 +1,381 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
+from multiprocessing import shared_memory
+
+import numpy as np
+from vtkmodules.util.numpy_support import (
+    get_numpy_array_type,
+    numpy_to_vtk,
+    numpy_to_vtkIdTypeArray,
+    vtk_to_numpy,
+)
+from vtkmodules.util.vtkConstants import VTK_ID_TYPE, VTK_UNSIGNED_CHAR
+from vtkmodules.vtkCommonCore import vtkCharArray, vtkDataArray, vtkPoints
+from vtkmodules.vtkCommonDataModel import (
+    vtkCellArray,
+    vtkDataSetAttributes,
+    vtkImageData,
+    vtkPartitionedDataSet,
+    vtkPolyData,
+    vtkUnstructuredGrid,
+)
+from vtkmodules.vtkParallelCore import vtkCommunicator
+
+from vtk_scene.bounds import leaves
+from vtk_scene.io import core
+from vtk_scene.io.prefetch import io_lock, shallow_copy
+from vtk_scene.ranges import address
+
+ID_TYPE = np.dtype(get_numpy_array_type(VTK_ID_TYPE))
+
+# Datasets transferred between processes as raw arrays
+DATASET_TYPES = {
+    "vtkImageData": vtkImageData,
+    "vtkPolyData": vtkPolyData,
+    "vtkUnstructuredGrid": vtkUnstructuredGrid,
+}
+
+CELL_ARRAYS = {
+    "vtkPolyData": ("GetVerts", "GetLines", "GetPolys", "GetStrips"),
+    "vtkUnstructuredGrid": ("GetCells",),
+}
+
+ATTRIBUTES = ("GetPointData", "GetCellData", "GetFieldData")
+
+
+def read_piece(file_name, preferred_name, piece, number_of_pieces, arrays, time):
+    """Read one piece of a file and return its non empty datasets"""
+    reader = core.ReaderFactory.create(
+        file_name, *preferred_name, arrays=arrays, cache=None, ingested=False
+    )
+    with io_lock(reader):
+        if time is None:
+            reader.UpdatePiece(piece, number_of_pieces, 0)
+        else:
+            reader.UpdateTimeStep(time, piece, number_of_pieces, 0)
+    return [shallow_copy(dataset) for dataset in leaves(reader.GetOutputDataObject(0))]
+
+
+def decompose(dataset):
+    """
+    Describe a dataset as a header and a list of numpy arrays sharing its
+    memory. Return None for datasets that can not be described that way.
+    """
+    class_name = dataset.GetClassName()
+    if class_name != "vtkImageData" and class_name not in CELL_ARRAYS:
+        return None
+
+    header = {"type": class_name, "arrays": [], "active": {}}
+    arrays = []
+
+    def add(kind, name, vtk_array):
+        header["arrays"].append((kind, name))
+        arrays.append(vtk_to_numpy(vtk_array))
+
+    try:
+        if class_name == "vtkImageData":
+            header["structure"] = (
+                dataset.GetExtent(),
+                dataset.GetOrigin(),
+                dataset.GetSpacing(),
+            )
+        else:
+            if dataset.GetPoints() is not None:
+                add("points", None, dataset.GetPoints().GetData())
+            for method_name in CELL_ARRAYS[class_name]:
+                cells = getattr(dataset, method_name)()
+                add(method_name, "offsets", cells.GetOffsetsArray())
+                add(method_name, "connectivity", cells.GetConnectivityArray())
+            if class_name == "vtkUnstructuredGrid":
+                if dataset.GetPolyhedronFaces() is not None:
+                    return None
+                add("types", None, dataset.GetCellTypesArray())
+
+        for method_name in ATTRIBUTES:
+            fields = getattr(dataset, method_name)()
+            for i in range(fields.GetNumberOfArrays()):
+                array = fields.GetAbstractArray(i)
+                if not isinstance(array, vtkDataArray) or not array.GetName():
+                    return None
+                add(method_name, array.GetName(), array)
+            if fields.IsA("vtkDataSetAttributes"):
+                # Active scalars, vectors, normals...
+                active = header["active"][method_name] = []
+                for attribute_type in range(vtkDataSetAttributes.NUM_ATTRIBUTES):
+                    array = fields.GetAbstractAttribute(attribute_type)
+                    if array is not None:
+                        active.append((attribute_type, array.GetName()))
+    except (AttributeError, ValueError):
+        # Arrays without a contiguous memory layout (implicit, SOA...)
+        return None
+
+    return header, arrays
+
+
+# Owners of the shared memory used by VTK arrays, by array address
+SHARED_ARRAYS = {}
+
+
+class SharedMemoryOwner:
+    """
+    Keep a shared memory block mapped while VTK arrays use its memory. The
+    block is closed once the last of those arrays is deleted.
+    """
+
+    def __init__(self, block):
+        self._block = block
+        self._arrays = []
+
+    def adopt(self, vtk_array, array):
+        """
+        Keep the block alive until vtk_array is deleted.
+
+        Args:
+            vtk_array (vtkDataArray): Array built from array by numpy_to_vtk
+            array (np.ndarray): View on the block used by vtk_array
+        """
+        key = address(vtk_array)
+        self._arrays.append(array)
+        SHARED_ARRAYS[key] = self
+        vtk_array.AddObserver("DeleteEvent", lambda *_: SHARED_ARRAYS.pop(key, None))
+        return vtk_array
+
+    def __del__(self):
+        # The views on the block must be released before closing it
+        self._arrays.clear()
+        with suppress(BufferError):
+            self._block.close()
+
+
+def compose(header, arrays, owner=None):
+    """
+    Build a dataset from the output of decompose without copying the arrays
+    (unless their type needs a conversion).
+
+    Args:
+        header (dict): Description of the dataset
+        arrays (list[np.ndarray]): Arrays of the dataset
+        owner (SharedMemoryOwner): Owner of the memory used by the arrays
+    """
+    items = dict(zip(header["arrays"], arrays))
+    dataset = DATASET_TYPES[header["type"]]()
+
+    def to_vtk(convert, array, **kwargs):
+        vtk_array = convert(array, **kwargs)
+        return vtk_array if owner is None else owner.adopt(vtk_array, array)
+
+    if header["type"] == "vtkImageData":
+        extent, origin, spacing = header["structure"]
+        dataset.SetExtent(extent)
+        dataset.SetOrigin(origin)
+        dataset.SetSpacing(spacing)
+    else:
+        if ("points", None) in items:
+            points = vtkPoints()
+            points.SetData(to_vtk(numpy_to_vtk, items["points", None]))
+            dataset.SetPoints(points)
+
+        cell_arrays = {}
+        for method_name in CELL_ARRAYS[header["type"]]:
+            cells = vtkCellArray()
+            cells.SetData(
+                to_vtk(
+                    numpy_to_vtkIdTypeArray,
+                    items[method_name, "offsets"].astype(ID_TYPE, copy=False),
+                ),
+                to_vtk(
+                    numpy_to_vtkIdTypeArray,
+                    items[method_name, "connectivity"].astype(ID_TYPE, copy=False),
+                ),
+            )
+            cell_arrays[method_name] = cells
+
+        if header["type"] == "vtkUnstructuredGrid":
+            types = to_vtk(
+                numpy_to_vtk, items["types", None], array_type=VTK_UNSIGNED_CHAR
+            )
+            dataset.SetCells(types, cell_arrays["GetCells"])
+        else:
+            dataset.SetVerts(cell_arrays["GetVerts"])
+            dataset.SetLines(cell_arrays["GetLines"])
+            dataset.SetPolys(cell_arrays["GetPolys"])
+            dataset.SetStrips(cell_arrays["GetStrips"])
+
+    for (kind, name), array in items.items():
+        if kind in ATTRIBUTES:
+            vtk_array = to_vtk(numpy_to_vtk, array)
+            vtk_array.SetName(name)
+            getattr(dataset, kind)().AddArray(vtk_array)
+
+    for method_name, active in header.get("active", {}).items():
+        fields = getattr(dataset, method_name)()
+        for attribute_type, name in active:
+            fields.SetActiveAttribute(name, attribute_type)
+
+    return dataset
+
+
+def to_shared_memory(dataset):
+    """
+    Copy the arrays of a dataset into a shared memory block and return a
+    header describing how to rebuild it. Datasets which can not be described
+    by their arrays are marshalled instead.
+    """
+    parts = decompose(dataset)
+    if parts is None:
+        buffer = vtkCharArray()
+        vtkCommunicator.MarshalDataObject(dataset, buffer)
+        parts = {"type": None, "arrays": [("marshal", None)]}, [vtk_to_numpy(buffer)]
+    header, arrays = parts
+
+    layout = []
+    size = 0
+    for array in arrays:
+        layout.append((array.dtype.str, array.shape, size))
+        size += (array.nbytes + 7) & ~7
+
+    block = shared_memory.SharedMemory(create=True, size=max(1, size))
+    for array, (dtype, shape, offset) in zip(arrays, layout):
+        np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)[...] = array
+    header["layout"] = layout
+    header["block"] = block.name
+    # The reading process unlinks the block (which also unregisters it from
+    # the resource tracker shared with the pool)
+    block.close()
+    return header
+
+
+def from_shared_memory(header):
+    """
+    Rebuild a dataset from a shared memory block. The arrays of the dataset
+    use the block memory which stays mapped as long as they exist, the block
+    name being unlinked right away.
+    """
+    block = shared_memory.SharedMemory(name=header["block"])
+    try:
+        arrays = [
+            np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+            for dtype, shape, offset in header["layout"]
+        ]
+        if header["type"] is not None:
+            return compose(header, arrays, SharedMemoryOwner(block))
+
+        buffer = vtkCharArray()
+        buffer.SetNumberOfValues(arrays[0].size)
+        vtk_to_numpy(buffer)[:] = arrays[0]
+        del arrays
+        block.close()
+        return vtkCommunicator.UnMarshalDataObject(buffer)
+    finally:
+        block.unlink()
+
+
+def unlink(header):
+    """Release a shared memory block which will not be rebuilt"""
+    with suppress(FileNotFoundError):
+        shared_memory.SharedMemory(name=header["block"]).unlink()
+
+
+def read_piece_shared(file_name, preferred_name, piece, number_of_pieces, arrays, time):
+    """Process pool entry point transferring the datasets through shared memory"""
+    datasets = read_piece(
+        file_name, preferred_name, piece, number_of_pieces, arrays, time
+    )
+    return [to_shared_memory(dataset) for dataset in datasets]
+
+
+def number_of_pieces_in(file_name, preferred_name):
+    """Number of pieces stored in a file when its reader reports it"""
+    reader = core.ReaderFactory.create(
+        file_name, *preferred_name, cache=None, ingested=False
+    )
+    if not hasattr(reader, "GetNumberOfPieces"):
+        return None
+    with io_lock(reader):
+        reader.UpdateInformation()
+    return reader.GetNumberOfPieces() or None
+
+
+def read_partitioned(
+    file_name,
+    *preferred_name,
+    number_of_pieces=None,
+    max_workers=None,
+    executor="process",
+    arrays=None,
+    time=None,
+):
+    """
+    Read a file as a set of pieces in parallel and gather them into a
+    vtkPartitionedDataSet.
+
+    Args:
+        file_name (str): File to read (i.e. .pvtu or partitioned .vtkhdf)
+        preferred_name (str): Reader names to prioritize
+        number_of_pieces (int): Number of pieces to request (default: number
+            of pieces stored in the file or number of workers)
+        max_workers (int): Size of the pool (default: number of cores)
+        executor (str|Executor): 'process', 'thread' or an existing executor.
+            Processes send their datasets back through shared memory.
+        arrays (list[str]): Only load those arrays
+        time (float): Time value to read
+    """
+    file_name = str(file_name)
+    max_workers = max_workers or os.cpu_count() or 1
+    number_of_pieces = (
+        number_of_pieces
+        or number_of_pieces_in(file_name, preferred_name)
+        or max_workers
+    )
+
+    if isinstance(executor, Executor):
+        pool = executor
+    elif executor == "process":
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        msg = f"Invalid executor: {executor}"
+        raise ValueError(msg)
+
+    use_shared_memory = isinstance(pool, ProcessPoolExecutor)
+    task = read_piece_shared if use_shared_memory else read_piece
+    try:
+        futures = [
+            pool.submit(
+                task, file_name, preferred_name, piece, number_of_pieces, arrays, time
+            )
+            for piece in range(number_of_pieces)
+        ]
+        results = []
+        error = None
+        for future in futures:
+            try:
+                results.extend(future.result())
+            except Exception as e:  # noqa: BLE001
+                error = error or e
+
+        output = vtkPartitionedDataSet()
+        try:
+            while results:
+                result = results.pop(0)
+                dataset = from_shared_memory(result) if use_shared_memory else result
+                output.SetPartition(output.GetNumberOfPartitions(), dataset)
+        finally:
+            # Blocks not rebuilt (a compose raised) would outlive the process
+            if use_shared_memory:
+                for result in results:
+                    unlink(result)
+        if error is not None:
+            raise error
+    finally:
+        if pool is not executor:
+            pool.shutdown()
+
+    return output
+
+
+__all__ = [
+    "read_partitioned",
+]
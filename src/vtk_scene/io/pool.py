@@ -0,0 +1,269 @@
+import threading
+import time
+from dataclasses import dataclass, field
+
+from vtkmodules.util.vtkAlgorithm import VTKPythonAlgorithmBase
+from vtkmodules.vtkCommonDataModel import vtkDataObject
+from vtkmodules.vtkCommonExecutionModel import vtkStreamingDemandDrivenPipeline
+
+from vtk_scene.io import core
+from vtk_scene.io.decorator import update_async
+from vtk_scene.io.prefetch import io_lock
+
+DEFAULT_TTL = 300  # seconds
+
+# Pipeline information forwarded from the shared reader to its sessions
+INFORMATION_KEYS = (
+    vtkStreamingDemandDrivenPipeline.TIME_STEPS,
+    vtkStreamingDemandDrivenPipeline.TIME_RANGE,
+    vtkStreamingDemandDrivenPipeline.WHOLE_EXTENT,
+    vtkDataObject.SPACING,
+    vtkDataObject.ORIGIN,
+)
+
+
+@dataclass
+class PoolEntry:
+    reader: object
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    sessions: int = 0
+    released: float = 0.0
+
+
+class SharedReader(VTKPythonAlgorithmBase):
+    """
+    Session handle on a pooled reader.
+
+    Each handle has its own output (a shallow copy of the shared reader
+    output) and its own time so sessions can look at different time steps
+    of the same file. Call close() (or use it as a context manager) when
+    the session is done with it.
+    """
+
+    update_async = update_async
+
+    def __init__(self, pool, key, entry):
+        super().__init__(nInputPorts=0, nOutputPorts=1, outputType="vtkDataObject")
+        self._pool = pool
+        self._key = key
+        self._entry = entry
+
+    @property
+    def reader(self):
+        """Reader shared with the other sessions (None once closed)"""
+        return None if self._entry is None else self._entry.reader
+
+    @property
+    def thread_safe(self):
+        return getattr(self.reader, "thread_safe", True)
+
+    @property
+    def ingest(self):
+        return getattr(self.reader, "ingest", None)
+
+    @property
+    def time_values(self):
+        return self._entry.reader.time_values
+
+    @property
+    def time_value(self):
+        return self().GetInformation().Get(vtkDataObject.DATA_TIME_STEP())
+
+    def GetFileName(self):
+        return self._key[0]
+
+    def close(self):
+        """Give the reader back to the pool"""
+        if self._entry is not None:
+            self._entry = None
+            self._pool.release(self._key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def _check(self):
+        if self._entry is None:
+            msg = f"Session on {self._key[0]} is closed"
+            raise ValueError(msg)
+
+    def RequestDataObject(self, _request, _in_info, out_info):
+        self._check()
+        reader = self._entry.reader
+        with self._entry.lock, io_lock(reader):
+            reader.UpdateDataObject()
+        shared = reader.GetOutputDataObject(0)
+        output = vtkDataObject.GetData(out_info)
+        if output is None or output.GetClassName() != shared.GetClassName():
+            out_info.GetInformationObject(0).Set(
+                vtkDataObject.DATA_OBJECT(), shared.NewInstance()
+            )
+        return 1
+
+    def RequestInformation(self, _request, _in_info, out_info):
+        self._check()
+        reader = self._entry.reader
+        with self._entry.lock, io_lock(reader):
+            reader.UpdateInformation()
+        shared_info = reader.GetOutputInformation(0)
+        info = out_info.GetInformationObject(0)
+        for key in INFORMATION_KEYS:
+            if shared_info.Has(key()):
+                info.CopyEntry(shared_info, key())
+        return 1
+
+    def RequestData(self, _request, _in_info, out_info):
+        self._check()
+        info = out_info.GetInformationObject(0)
+        time_value = None
+        if info.Has(vtkStreamingDemandDrivenPipeline.UPDATE_TIME_STEP()):
+            time_value = info.Get(vtkStreamingDemandDrivenPipeline.UPDATE_TIME_STEP())
+
+        reader = self._entry.reader
+        with self._entry.lock:
+            if time_value is None:
+                with io_lock(reader):
+                    reader.Update()
+            else:
+                reader.UpdateTimeStep(time_value)
+            output = vtkDataObject.GetData(out_info)
+            output.ShallowCopy(reader.GetOutputDataObject(0))
+
+        if time_value is not None:
+            output.GetInformation().Set(vtkDataObject.DATA_TIME_STEP(), time_value)
+        return 1
+
+
+class ReaderPool:
+    """
+    Process wide pool of readers shared across sessions.
+
+    Readers are keyed by resolved path and reader class, reference counted
+    by the SharedReader handles given out and closed once no session used
+    them for `ttl` seconds. Time steps read by one session are served to
+    the others from the reader cache.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        """Create a pool
+
+        Args:
+            ttl (float): Seconds an unused reader is kept before being closed
+                (None to keep them until clear is called)
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._timer = None
+        self.created = 0
+        self.reused = 0
+        self.closed = 0
+
+    @property
+    def stats(self):
+        """Return reader/session counters"""
+        with self._lock:
+            return {
+                "readers": len(self._entries),
+                "sessions": sum(e.sessions for e in self._entries.values()),
+                "created": self.created,
+                "reused": self.reused,
+                "closed": self.closed,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def acquire(self, file_name, *preferred_name):
+        """
+        Return a SharedReader session on the pooled reader of a file.
+        The set of preferred names will be used for prioritize reader resolution.
+        """
+        klass = core.ReaderFactory.klass(file_name, *preferred_name)
+        key = (core.resolve(file_name), klass.__name__)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = PoolEntry(core.ReaderFactory.create(file_name, *preferred_name))
+                self._entries[key] = entry
+                self.created += 1
+            else:
+                self.reused += 1
+            entry.sessions += 1
+
+        return SharedReader(self, key, entry)
+
+    def release(self, key):
+        """Decrement the sessions of a reader and schedule its collection"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.sessions = max(0, entry.sessions - 1)
+            if entry.sessions:
+                return
+            entry.released = time.monotonic()
+            if self._timer is None and self.ttl is not None:
+                self._timer = threading.Timer(self.ttl, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def collect(self, ttl=None):
+        """
+        Close the readers unused for more than ttl seconds (default: the
+        pool ttl, None keeping them forever). Return the number of readers
+        closed.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is None:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                key
+                for key, entry in self._entries.items()
+                if not entry.sessions and now - entry.released >= ttl
+            ]
+            entries = [self._entries.pop(key) for key in idle]
+            self.closed += len(entries)
+
+        for entry in entries:
+            close_reader(entry.reader)
+        return len(entries)
+
+    def clear(self):
+        """Close all the readers no session is using"""
+        return self.collect(ttl=0)
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self.collect()
+        with self._lock:
+            waiting = [e.released for e in self._entries.values() if not e.sessions]
+            if waiting and self._timer is None:
+                delay = max(0, min(waiting) + self.ttl - time.monotonic())
+                self._timer = threading.Timer(delay, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+
+def close_reader(reader):
+    """Stop background work and release the resources of a reader"""
+    disable_prefetch = getattr(reader, "disable_prefetch", None)
+    if disable_prefetch is not None:
+        disable_prefetch()
+    close = getattr(reader, "close", None)
+    if close is not None:
+        close()
+
+
+READER_POOL = ReaderPool()
+
+__all__ = [
+    "READER_POOL",
+    "ReaderPool",
+    "SharedReader",
+]
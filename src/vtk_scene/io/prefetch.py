@@ -0,0 +1,191 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from vtk_scene.io.cache import DataObjectCache, cache_key, reader_file_name
+from vtk_scene.io.selection import copy_selections
+
+# Readers relying on libraries that are not thread safe (HDF5, NetCDF)
+# must not execute concurrently.
+SERIAL_IO_LOCK = threading.RLock()
+
+
+def io_lock(reader):
+    """Return the lock to hold while the given reader is executing"""
+    if getattr(reader, "thread_safe", True):
+        return nullcontext()
+    return SERIAL_IO_LOCK
+
+
+def serialize_execution(reader, lock=None):
+    """
+    Hold the serial IO lock while reader executes, whatever triggers the
+    execution (UpdateTimeStep, Update, a downstream filter, another thread).
+    The executive fires StartEvent/EndEvent around RequestData in the
+    executing thread. Thread safe readers are left untouched.
+    """
+    if lock is None:
+        if getattr(reader, "thread_safe", True):
+            return
+        lock = SERIAL_IO_LOCK
+    reader.AddObserver("StartEvent", lambda *_: lock.acquire())
+    reader.AddObserver("EndEvent", lambda *_: lock.release())
+
+
+def shallow_copy(dobj):
+    """Return a new data object sharing the arrays of the provided one"""
+    dobj_c = dobj.NewInstance()
+    dobj_c.ShallowCopy(dobj)
+    return dobj_c
+
+
+def closest_index(values, value):
+    """Return the index of the closest entry of values"""
+    return min(range(len(values)), key=lambda i: abs(values[i] - value))
+
+
+class TimeStepPrefetcher:
+    """
+    Read upcoming time steps of a reader in background threads.
+
+    While a time step is being displayed, the next `lookahead` steps (following
+    the current playback direction) are read by a pool of worker readers and
+    stored in the reader cache so the next `UpdateTimeStep` becomes a cache hit.
+    """
+
+    def __init__(self, reader, lookahead=2, max_workers=2, cache=None):
+        """Create a prefetcher for a decorated reader
+
+        Args:
+            reader (vtkAlgorithm): Reader created by the ReaderFactory
+            lookahead (int): Number of steps to read ahead of the current one
+            max_workers (int): Number of threads (and worker readers) to use
+            cache (DataObjectCache): Where to store the steps read ahead
+                (default: a private cache)
+        """
+        self._reader = reader
+        self._time_values = tuple(reader.time_values or ())
+        self._lookahead = lookahead
+        self._direction = 1
+        self._last_index = None
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="vtk_scene_prefetch"
+        )
+
+        self.cache = DataObjectCache() if cache is None else cache
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def lookahead(self):
+        """Number of time steps read ahead of the current one"""
+        return self._lookahead
+
+    @lookahead.setter
+    def lookahead(self, value):
+        self._lookahead = max(0, int(value))
+
+    @property
+    def direction(self):
+        """Current playback direction (1: forward, -1: reverse)"""
+        return self._direction
+
+    @property
+    def stats(self):
+        """Return hit/miss counters along with the prefetch state"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "lookahead": self._lookahead,
+            "pending": len(self._pending),
+        }
+
+    def reset_stats(self):
+        """Reset hit/miss counters"""
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Return the data object for the given cache key if it has been
+        prefetched (waiting on it if a worker is still reading it), None otherwise.
+        """
+        with self._lock:
+            future = self._pending.get(key)
+
+        if future is not None and not future.cancelled():
+            future.exception()
+
+        dobj = self.cache.get(key)
+        if dobj is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return dobj
+
+    def schedule(self, time_value):
+        """
+        Record time_value as the active time and submit reads for the
+        following steps in the current playback direction.
+        """
+        if not self._time_values:
+            return
+
+        index = closest_index(self._time_values, time_value)
+        if self._last_index is not None and index != self._last_index:
+            self._direction = 1 if index > self._last_index else -1
+        self._last_index = index
+
+        for offset in range(1, self._lookahead + 1):
+            next_index = index + self._direction * offset
+            if next_index < 0 or next_index >= len(self._time_values):
+                break
+            next_time = self._time_values[next_index]
+            key = cache_key(self._reader, next_time)
+            if key is None:
+                break
+            with self._lock:
+                if key in self.cache or key in self._pending:
+                    continue
+                self._pending[key] = self._executor.submit(self._read, key, next_time)
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._pending.clear()
+
+    def _worker_reader(self):
+        reader = getattr(self._local, "reader", None)
+        if reader is None:
+            # Instantiate the Python class (not NewInstance which gives back
+            # the bare C++ class) so decorated and Python readers keep their
+            # behavior, including serialize_execution for non thread safe ones
+            reader = type(self._reader)(file_name=reader_file_name(self._reader))
+            # Caching is done by the prefetcher
+            reader.cache = None
+            self._local.reader = reader
+        copy_selections(self._reader, reader)
+        return reader
+
+    def _read(self, key, time_value):
+        try:
+            with io_lock(self._reader):
+                reader = self._worker_reader()
+                reader.UpdateTimeStep(time_value)
+                self.cache.add(key, shallow_copy(reader.GetOutputDataObject(0)))
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+
+__all__ = [
+    "SERIAL_IO_LOCK",
+    "TimeStepPrefetcher",
+    "serialize_execution",
+]
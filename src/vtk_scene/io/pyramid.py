@@ -0,0 +1,364 @@
+"""
+Build multi-resolution pyramids of image data (.vti) files.
+
+    python -m vtk_scene.io.pyramid data/volume.vti --method average
+
+Each level halves the resolution of the previous one until the largest
+dimension reaches --min-size. Levels are stored in the vtk-scene cache
+directory and read through ReaderFactory.create(file_name, "Pyramid").
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from vtkmodules.util.vtkAlgorithm import VTKPythonAlgorithmBase
+from vtkmodules.vtkCommonCore import vtkDataArraySelection
+from vtkmodules.vtkCommonDataModel import vtkDataObject
+from vtkmodules.vtkCommonExecutionModel import vtkStreamingDemandDrivenPipeline
+from vtkmodules.vtkImagingCore import vtkImageShrink3D
+from vtkmodules.vtkIOXML import vtkXMLImageDataReader, vtkXMLImageDataWriter
+
+from vtk_scene.io.cache import cache_directory, file_key
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("average", "stride")
+SELECTION_METHODS = ("GetPointDataArraySelection", "GetCellDataArraySelection")
+
+
+@dataclass(frozen=True)
+class PyramidLevel:
+    file_name: str
+    dimensions: tuple
+    spacing: tuple
+
+
+@dataclass(frozen=True)
+class Pyramid:
+    """Levels of a pyramid from the finest (the source file) to the coarsest"""
+
+    source: str
+    mtime: int
+    method: str = "average"
+    levels: tuple = field(default_factory=tuple)
+
+    def __len__(self):
+        return len(self.levels)
+
+    def level_for(self, resolution):
+        """
+        Return the coarsest level with at least `resolution` samples along
+        its largest dimension (0 when none of them is fine enough).
+        """
+        for index in range(len(self.levels) - 1, -1, -1):
+            if max(self.levels[index].dimensions) >= resolution:
+                return index
+        return 0
+
+
+def pyramid_directory(file_name):
+    """Return the directory holding the pyramid of a given source"""
+    path = str(Path(file_name).resolve())
+    return cache_directory() / "pyramid" / hashlib.sha1(path.encode()).hexdigest()
+
+
+def image_level(file_name, reader):
+    """Describe the image produced by a reader as a PyramidLevel"""
+    reader.UpdateInformation()
+    info = reader.GetOutputInformation(0)
+    extent = info.Get(vtkStreamingDemandDrivenPipeline.WHOLE_EXTENT())
+    return PyramidLevel(
+        str(file_name),
+        tuple(extent[2 * i + 1] - extent[2 * i] + 1 for i in range(3)),
+        tuple(info.Get(vtkDataObject.SPACING())),
+    )
+
+
+def single_level(file_name):
+    """Pyramid made of the source file only"""
+    path, mtime = file_key(file_name)
+    reader = vtkXMLImageDataReader(file_name=path)
+    return Pyramid(path, mtime, levels=(image_level(path, reader),))
+
+
+@lru_cache(maxsize=256)
+def _cached_load(path, mtime, _manifest_mtime):
+    manifest = pyramid_directory(path) / "pyramid.json"
+    try:
+        content = json.loads(manifest.read_text())
+    except (OSError, ValueError):
+        return None
+    if content.get("source") != path or content.get("mtime") != mtime:
+        return None
+    levels = tuple(
+        PyramidLevel(
+            level["file_name"], tuple(level["dimensions"]), tuple(level["spacing"])
+        )
+        for level in content["levels"]
+    )
+    if not all(Path(level.file_name).exists() for level in levels):
+        return None
+    return Pyramid(path, mtime, content["method"], levels)
+
+
+def load(file_name):
+    """Return the Pyramid of an up to date build for file_name or None"""
+    path, mtime = file_key(file_name)
+    manifest_mtime = file_key(pyramid_directory(path) / "pyramid.json")[1]
+    if not manifest_mtime:
+        return None
+    return _cached_load(path, mtime, manifest_mtime)
+
+
+def build(file_name, method="average", min_size=128, number_of_pieces=1):
+    """
+    Write the levels of a pyramid for an image data file.
+
+    Args:
+        file_name (str): .vti file to process
+        method (str): 'average' (box filter) or 'stride' (sub-sampling)
+        min_size (int): Stop once the largest dimension is below that size
+        number_of_pieces (int): Write each level in that many pieces (the
+            whole level is processed at once by default)
+
+    Returns:
+        Pyramid
+    """
+    if method not in METHODS:
+        msg = f"Invalid pyramid method {method}, expected one of {METHODS}"
+        raise ValueError(msg)
+
+    path, mtime = file_key(file_name)
+    directory = pyramid_directory(path)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    previous = path
+    levels = [image_level(path, vtkXMLImageDataReader(file_name=path))]
+    while max(levels[-1].dimensions) > min_size:
+        level_file = directory / f"level_{len(levels)}.vti"
+        reader = vtkXMLImageDataReader(file_name=previous)
+        shrink = vtkImageShrink3D(
+            shrink_factors=[2 if d > 1 else 1 for d in levels[-1].dimensions],
+            averaging=int(method == "average"),
+        )
+        reader >> shrink
+        shrink.Update()
+
+        # The shrink filter names its output scalars ImageScalars
+        level = shrink.GetOutput()
+        scalars = level.GetPointData().GetScalars()
+        source_scalars = reader.GetOutput().GetPointData().GetScalars()
+        if scalars is not None and source_scalars is not None:
+            scalars.SetName(source_scalars.GetName())
+
+        writer = vtkXMLImageDataWriter(
+            file_name=str(level_file), number_of_pieces=number_of_pieces
+        )
+        writer.SetInputData(level)
+        writer.Write()
+
+        levels.append(
+            image_level(level_file, vtkXMLImageDataReader(file_name=str(level_file)))
+        )
+        previous = str(level_file)
+
+    (directory / "pyramid.json").write_text(
+        json.dumps(
+            {
+                "source": path,
+                "mtime": mtime,
+                "method": method,
+                "levels": [
+                    {
+                        "file_name": level.file_name,
+                        "dimensions": level.dimensions,
+                        "spacing": level.spacing,
+                    }
+                    for level in levels
+                ],
+            }
+        )
+    )
+    return load(path)
+
+
+class PyramidReader(VTKPythonAlgorithmBase):
+    """
+    Reader serving the levels of an image data pyramid.
+
+    The coarsest level is served first so the first frame does not depend
+    on the size of the dataset. Finer levels are loaded on demand either
+    explicitly (level, refine) or from the resolution needed on screen
+    (set_screen_resolution). Without a pyramid built for the file, the
+    file itself is the only level.
+    """
+
+    def __init__(self, file_name=None, level=None):
+        super().__init__(nInputPorts=0, nOutputPorts=1, outputType="vtkImageData")
+        self._file_name = None
+        self._pyramid = None
+        self._readers = {}
+        self._level = level
+        self._selections = {}
+        self._populating = False
+        for method_name in SELECTION_METHODS:
+            selection = vtkDataArraySelection()
+            selection.AddObserver("ModifiedEvent", self._on_selection_modified)
+            self._selections[method_name] = selection
+        if file_name is not None:
+            self.SetFileName(file_name)
+
+    def SetFileName(self, file_name):
+        file_name = str(file_name)
+        if file_name != self._file_name:
+            self._file_name = file_name
+            self._pyramid = None
+            self._readers = {}
+            self.Modified()
+
+    def GetFileName(self):
+        return self._file_name
+
+    def GetPointDataArraySelection(self):
+        return self._selections["GetPointDataArraySelection"]
+
+    def GetCellDataArraySelection(self):
+        return self._selections["GetCellDataArraySelection"]
+
+    def _on_selection_modified(self, *_):
+        if not self._populating:
+            self.Modified()
+
+    @property
+    def pyramid(self):
+        """Pyramid of the current file"""
+        if self._pyramid is None:
+            self._pyramid = load(self._file_name) or single_level(self._file_name)
+        return self._pyramid
+
+    @property
+    def number_of_levels(self):
+        return len(self.pyramid)
+
+    @property
+    def level(self):
+        """Level served (0 is the finest, default to the coarsest)"""
+        if self._level is None:
+            return self.number_of_levels - 1
+        return min(self._level, self.number_of_levels - 1)
+
+    @level.setter
+    def level(self, value):
+        value = max(0, min(int(value), self.number_of_levels - 1))
+        if value != self.level:
+            self._level = value
+            self.Modified()
+
+    @property
+    def cache_variant(self):
+        """Distinguish levels in the time step cache"""
+        return self.level
+
+    def refine(self):
+        """Serve the next finer level. Return False when already the finest."""
+        if self.level == 0:
+            return False
+        self.level = self.level - 1
+        return True
+
+    def set_screen_resolution(self, pixels):
+        """Serve the coarsest level providing at least `pixels` samples across"""
+        self.level = self.pyramid.level_for(pixels)
+
+    def _reader_for(self, level):
+        reader = self._readers.get(level)
+        if reader is None:
+            reader = vtkXMLImageDataReader(
+                file_name=self.pyramid.levels[level].file_name
+            )
+            self._readers[level] = reader
+        for method_name, selection in self._selections.items():
+            getattr(reader, method_name)().CopySelections(selection)
+        return reader
+
+    def RequestInformation(self, _request, _in_info, out_info):
+        # Expose the arrays of the source file
+        source = self._reader_for(0)
+        source.UpdateInformation()
+        self._populating = True
+        for method_name, selection in self._selections.items():
+            arrays = getattr(source, method_name)()
+            for i in range(arrays.GetNumberOfArrays()):
+                selection.AddArray(arrays.GetArrayName(i))
+        self._populating = False
+
+        reader = self._reader_for(self.level)
+        reader.UpdateInformation()
+        level_info = reader.GetOutputInformation(0)
+        info = out_info.GetInformationObject(0)
+        for key in (vtkDataObject.SPACING(), vtkDataObject.ORIGIN()):
+            info.Set(key, level_info.Get(key), 3)
+        info.Set(
+            vtkStreamingDemandDrivenPipeline.WHOLE_EXTENT(),
+            level_info.Get(vtkStreamingDemandDrivenPipeline.WHOLE_EXTENT()),
+            6,
+        )
+        return 1
+
+    def RequestData(self, _request, _in_info, out_info):
+        reader = self._reader_for(self.level)
+        reader.Update()
+        output = vtkDataObject.GetData(out_info)
+        output.ShallowCopy(reader.GetOutput())
+        return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        "python -m vtk_scene.io.pyramid",
+        description="Build multi-resolution pyramids of image data files",
+    )
+    parser.add_argument("files", nargs="+", help=".vti files to process")
+    parser.add_argument("--method", choices=METHODS, default="average")
+    parser.add_argument(
+        "--min-size", type=int, default=128, help="Size of the coarsest level"
+    )
+    parser.add_argument(
+        "--pieces", type=int, default=1, help="Number of pieces per level"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    for file_name in args.files:
+        start = time.perf_counter()
+        pyramid = build(
+            file_name,
+            method=args.method,
+            min_size=args.min_size,
+            number_of_pieces=args.pieces,
+        )
+        logger.info(
+            "%s: %s in %.1fs",
+            file_name,
+            " > ".join(
+                "x".join(map(str, level.dimensions)) for level in pyramid.levels
+            ),
+            time.perf_counter() - start,
+        )
+
+
+__all__ = [
+    "Pyramid",
+    "PyramidReader",
+    "build",
+    "load",
+]
+
+if __name__ == "__main__":
+    main()
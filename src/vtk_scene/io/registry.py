@@ -0,0 +1,215 @@
+import importlib
+import importlib.metadata
+import threading
+import time
+from types import ModuleType
+
+from vtk_scene.io import decorator, formats
+
+ENTRY_POINT_GROUP = "vtk_scene.io.formats"
+
+
+def normalize_suffix(suffix):
+    """Return suffix with its leading dot and lower case (i.e. '.vtu')"""
+    suffix = suffix.lower()
+    return suffix if suffix.startswith(".") else f".{suffix}"
+
+
+def format_entry_points():
+    """Return the entry points registering formats without loading them"""
+    entry_points = importlib.metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=ENTRY_POINT_GROUP)
+    return entry_points.get(ENTRY_POINT_GROUP, [])
+
+
+class FormatRegistry:
+    """
+    Registry of the reader/writer format modules keyed by file suffix.
+
+    A format module exposes READERS, WRITERS, DEFAULT_READER, DEFAULT_WRITER
+    and optionally THREAD_SAFE and BLOCK_SELECTIONS. Modules are only
+    imported the first time their suffix is used and resolved classes are
+    memoized so a given VTK reader always maps to the same decorated class.
+
+    Third party packages can provide formats through the
+    'vtk_scene.io.formats' entry point group where the entry point name is
+    the suffix and its value the module to import.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._sources = None
+        self._modules = {}
+        self._readers = {}
+        self._writers = {}
+        self._decorated = {}
+        self._names = {}
+        self.timings = {}
+        self.hits = 0
+        self.misses = 0
+        self.lookup_time = 0.0
+
+    @property
+    def stats(self):
+        """Return memoization counters along with lookup and import timings"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "lookup_time": self.lookup_time,
+            "imported": len(self._modules),
+            "timings": dict(self.timings),
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.lookup_time = 0.0
+        self.timings.clear()
+
+    def register(self, suffix, module):
+        """Register a format module (or its import path) for a given suffix
+
+        Args:
+            suffix (str): File suffix such as '.vtu'
+            module (ModuleType|str): Module or import path to load on first use
+        """
+        suffix = normalize_suffix(suffix)
+        with self._lock:
+            self._ensure_sources()
+            self._sources[suffix] = module
+            self._forget(suffix)
+
+    def unregister(self, suffix):
+        """Remove the format registered for a given suffix"""
+        suffix = normalize_suffix(suffix)
+        with self._lock:
+            self._ensure_sources()
+            self._sources.pop(suffix, None)
+            self._forget(suffix)
+
+    def suffixes(self):
+        """List all the supported suffixes without importing any module"""
+        with self._lock:
+            self._ensure_sources()
+            return sorted(self._sources)
+
+    def module(self, suffix):
+        """Return the format module for a given suffix or None"""
+        suffix = normalize_suffix(suffix)
+        with self._lock:
+            if suffix in self._modules:
+                return self._modules[suffix]
+
+            self._ensure_sources()
+            source = self._sources.get(suffix)
+            start = time.perf_counter()
+            if source is None:
+                module = None
+            elif isinstance(source, ModuleType):
+                module = source
+            elif isinstance(source, str):
+                module = importlib.import_module(source)
+            else:
+                module = source.load()
+            self.timings[suffix] = time.perf_counter() - start
+            self._modules[suffix] = module
+            return module
+
+    def reader(self, suffix, *preferred_name):
+        """Return the decorated reader class for a suffix or None"""
+        return self._lookup(self._readers, "READERS", suffix, preferred_name)
+
+    def writer(self, suffix, *preferred_name):
+        """Return the writer class for a suffix or None"""
+        return self._lookup(self._writers, "WRITERS", suffix, preferred_name)
+
+    def reader_names(self):
+        """Set of all reader names (imports all the format modules once)"""
+        return self._all_names("READERS")
+
+    def writer_names(self):
+        """Set of all writer names (imports all the format modules once)"""
+        return self._all_names("WRITERS")
+
+    def clear(self):
+        """Drop memoized modules and classes, re-discovering entry points"""
+        with self._lock:
+            self._sources = None
+            self._modules.clear()
+            self._readers.clear()
+            self._writers.clear()
+            self._names.clear()
+
+    def _ensure_sources(self):
+        if self._sources is not None:
+            return
+        self._sources = {
+            f".{name}": f"{formats.__name__}.{name}"
+            for name in formats.list_available_modules()
+        }
+        for entry_point in format_entry_points():
+            self._sources.setdefault(normalize_suffix(entry_point.name), entry_point)
+
+    def _forget(self, suffix):
+        self._modules.pop(suffix, None)
+        self._names.clear()
+        for memo in (self._readers, self._writers):
+            for key in [k for k in memo if k[0] == suffix]:
+                del memo[key]
+
+    def _decorate(self, klass, m):
+        key = (
+            klass,
+            getattr(m, "THREAD_SAFE", True),
+            tuple(getattr(m, "BLOCK_SELECTIONS", ())),
+        )
+        if key not in self._decorated:
+            self._decorated[key] = decorator.add_time_properties(*key)
+        return self._decorated[key]
+
+    def _lookup(self, memo, attr_name, suffix, preferred_name):
+        start = time.perf_counter()
+        try:
+            return self._resolve(memo, attr_name, suffix, preferred_name)
+        finally:
+            self.lookup_time += time.perf_counter() - start
+
+    def _resolve(self, memo, attr_name, suffix, preferred_name):
+        suffix = normalize_suffix(suffix)
+        key = (suffix, preferred_name)
+        with self._lock:
+            if key in memo:
+                self.hits += 1
+                return memo[key]
+
+            self.misses += 1
+            m = self.module(suffix)
+            klasses = getattr(m, attr_name, None)
+            klass = None
+            if klasses:
+                default_name = getattr(m, f"DEFAULT_{attr_name[:-1]}")
+                names = [n for n in preferred_name if n in klasses] or [default_name]
+                klass = klasses[names[0]]
+                if attr_name == "READERS":
+                    klass = self._decorate(klass, m)
+
+            memo[key] = klass
+            return klass
+
+    def _all_names(self, attr_name):
+        with self._lock:
+            if attr_name not in self._names:
+                names = set()
+                for suffix in self.suffixes():
+                    names.update(getattr(self.module(suffix), attr_name, {}).keys())
+                self._names[attr_name] = names
+            return self._names[attr_name]
+
+
+REGISTRY = FormatRegistry()
+
+__all__ = [
+    "REGISTRY",
+    "FormatRegistry",
+]
@@ -0,0 +1,844 @@
+import hashlib
+import http.client
+import io
+import itertools
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+from vtkmodules.util.numpy_support import numpy_to_vtk, numpy_to_vtkIdTypeArray
+from vtkmodules.util.vtkAlgorithm import VTKPythonAlgorithmBase
+from vtkmodules.util.vtkConstants import VTK_UNSIGNED_CHAR
+from vtkmodules.vtkCommonCore import vtkDataArraySelection, vtkPoints
+from vtkmodules.vtkCommonDataModel import (
+    vtkCellArray,
+    vtkDataObject,
+    vtkImageData,
+    vtkPolyData,
+    vtkUnstructuredGrid,
+)
+from vtkmodules.vtkCommonExecutionModel import vtkStreamingDemandDrivenPipeline
+from vtkmodules.vtkFiltersCore import vtkAppendFilter, vtkAppendPolyData
+
+from vtk_scene.io.cache import cache_directory
+from vtk_scene.io.parallel import ID_TYPE
+from vtk_scene.io.prefetch import closest_index
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+DEFAULT_DISK_BUDGET = 1 << 32  # 4 GiB
+DEFAULT_BLOCK_SIZE = 1 << 20  # 1 MiB
+MAX_BLOCKS_PER_REQUEST = 16
+MEMORY_BLOCKS = 64
+
+DATA_TYPES = {
+    "ImageData": vtkImageData,
+    "UnstructuredGrid": vtkUnstructuredGrid,
+    "PolyData": vtkPolyData,
+}
+
+# VTKHDF topology group name and vtkPolyData setter
+POLY_TOPOLOGIES = (
+    ("Vertices", "SetVerts"),
+    ("Lines", "SetLines"),
+    ("Polygons", "SetPolys"),
+    ("Strips", "SetStrips"),
+)
+
+SELECTIONS = (
+    ("PointData", "GetPointDataArraySelection"),
+    ("CellData", "GetCellDataArraySelection"),
+)
+
+
+class DiskChunkCache:
+    """
+    Least recently used cache of file blocks stored on disk and bounded
+    by their total size. Blocks are grouped by namespace (one per remote
+    file version and block size).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_DISK_BUDGET, directory=None):
+        """Create a cache
+
+        Args:
+            max_bytes (int): Maximum number of bytes to keep on disk
+            directory (str): Where to store the blocks
+                (default: 'http' in the vtk-scene cache directory)
+        """
+        self._max_bytes = max_bytes
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._root = None
+        self._entries = OrderedDict()
+        self._nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def directory(self):
+        if self._directory is not None:
+            return Path(self._directory)
+        return cache_directory() / "http"
+
+    @property
+    def max_bytes(self):
+        """Maximum number of bytes to keep on disk"""
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        self._max_bytes = value
+        with self._lock:
+            self._index()
+            self._evict()
+
+    @property
+    def nbytes(self):
+        """Number of bytes currently stored on disk"""
+        return self._nbytes
+
+    @property
+    def stats(self):
+        """Return hit/miss/eviction counters along with the cache usage"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "nbytes": self._nbytes,
+            "max_bytes": self._max_bytes,
+        }
+
+    def contains(self, namespace, index):
+        """True when a block is available on disk"""
+        path = str(self.directory / namespace / str(index))
+        with self._lock:
+            return path in self._index()
+
+    def get(self, namespace, index):
+        """Return the content of a block or None"""
+        path = self.directory / namespace / str(index)
+        with self._lock:
+            entries = self._index()
+            if str(path) not in entries:
+                self.misses += 1
+                return None
+            entries.move_to_end(str(path))
+            self.hits += 1
+
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            # Removed by another process sharing the cache directory
+            with self._lock:
+                self._nbytes -= self._entries.pop(str(path), 0)
+            return None
+
+    def add(self, namespace, index, data):
+        """Store a block, evicting the least recently used ones"""
+        path = self.directory / namespace / str(index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+        with self._lock:
+            entries = self._index()
+            self._nbytes -= entries.pop(str(path), 0)
+            entries[str(path)] = len(data)
+            self._nbytes += len(data)
+            self._evict()
+
+    def clear(self):
+        """Remove all the blocks and reset counters"""
+        with self._lock:
+            for path in self._index():
+                Path(path).unlink(missing_ok=True)
+            self._entries.clear()
+            self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _index(self):
+        directory = self.directory
+        if self._root != directory:
+            # Pick up blocks stored by previous sessions (oldest first)
+            files = []
+            if directory.exists():
+                for path in directory.glob("*/*"):
+                    if path.suffix != ".tmp":
+                        stat = path.stat()
+                        files.append((stat.st_mtime_ns, str(path), stat.st_size))
+            files.sort()
+            self._entries = OrderedDict((path, size) for _, path, size in files)
+            self._nbytes = sum(self._entries.values())
+            self._root = directory
+        return self._entries
+
+    def _evict(self):
+        while self._nbytes > self._max_bytes and self._entries:
+            path, nbytes = self._entries.popitem(last=False)
+            Path(path).unlink(missing_ok=True)
+            self._nbytes -= nbytes
+            self.evictions += 1
+
+
+HTTP_CACHE = DiskChunkCache()
+
+
+class RemoteFile(io.RawIOBase):
+    """
+    Read only file object over http(s) fetching fixed size blocks with
+    range requests. Blocks are kept in a DiskChunkCache shared across
+    sessions, the last ones used are also kept in memory. Consecutive
+    missing blocks are fetched with a single request and independent
+    requests are issued concurrently, each thread reusing its connection.
+    Servers ignoring range requests are detected on their first answer and
+    the whole file is then downloaded at once.
+    """
+
+    def __init__(
+        self,
+        url,
+        block_size=DEFAULT_BLOCK_SIZE,
+        max_workers=8,
+        cache=HTTP_CACHE,
+        timeout=60,
+    ):
+        """Open a remote file
+
+        Args:
+            url (str): http(s) URL of the file
+            block_size (int): Number of bytes fetched per block
+            max_workers (int): Number of concurrent requests
+            cache (DiskChunkCache): Where to keep the fetched blocks
+            timeout (float): Connection timeout in seconds
+        """
+        super().__init__()
+        parts = urlsplit(url)
+        self._url = url
+        self._connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._netloc = parts.netloc
+        self._path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        self._timeout = timeout
+        self._block_size = block_size
+        self._cache = cache
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._blocks = OrderedDict()
+        self._position = 0
+        self._ranges = True
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="vtk_scene_http"
+        )
+
+        self.requests = 0
+        self.bytes_fetched = 0
+
+        response, _ = self._request("HEAD")
+        size = response.getheader("Content-Length")
+        body = None
+        if size is None:
+            # No size in the HEAD answer: ask for the first byte instead
+            response, body = self._request("GET", {"Range": "bytes=0-0"})
+            self.requests += 1
+            self.bytes_fetched += len(body)
+            if response.status == 206:
+                size = (response.getheader("Content-Range") or "").rpartition("/")[2]
+                body = None
+            else:
+                size = len(body)
+        try:
+            self._size = int(size)
+        except ValueError:
+            msg = f"Unknown size for {url}"
+            raise OSError(msg) from None
+
+        # Blocks are cut at multiples of the block size, which is part of
+        # the namespace so readers using another size do not share them
+        version = response.getheader("ETag") or response.getheader("Last-Modified")
+        self.namespace = hashlib.sha1(
+            f"{url}|{version}|{self._size}|{self._block_size}".encode()
+        ).hexdigest()
+        if body is not None:
+            self._ranges = False
+            self._store(0, body)
+
+    @property
+    def url(self):
+        return self._url
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def stats(self):
+        """Return the number of requests and bytes fetched from the server"""
+        return {
+            "requests": self.requests,
+            "bytes_fetched": self.bytes_fetched,
+            "size": self._size,
+        }
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._size
+        self._position = max(0, offset)
+        return self._position
+
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast("B")
+        size = min(len(view), self._size - self._position)
+        if size <= 0:
+            return 0
+
+        self.prefetch([(self._position, size)])
+        written = 0
+        while written < size:
+            position = self._position + written
+            index, start = divmod(position, self._block_size)
+            block = self._block(index)[start : start + size - written]
+            view[written : written + len(block)] = block
+            written += len(block)
+
+        self._position += written
+        return written
+
+    def prefetch(self, ranges):
+        """
+        Make sure the blocks covering the given (offset, size) byte ranges
+        are available locally, fetching the missing ones concurrently.
+        """
+        missing = set()
+        for offset, size in ranges:
+            if size <= 0:
+                continue
+            first = offset // self._block_size
+            last = min(offset + size, self._size) - 1
+            for index in range(first, last // self._block_size + 1):
+                if index not in self._blocks and not self._cache.contains(
+                    self.namespace, index
+                ):
+                    missing.add(index)
+
+        runs = []
+        for index in sorted(missing):
+            if (
+                runs
+                and runs[-1][1] == index - 1
+                and runs[-1][1] - runs[-1][0] + 1 < MAX_BLOCKS_PER_REQUEST
+            ):
+                runs[-1][1] = index
+            else:
+                runs.append([index, index])
+
+        if len(runs) == 1 or (runs and not self._ranges):
+            self._fetch(*runs[0])
+        elif runs:
+            for future in [self._executor.submit(self._fetch, *run) for run in runs]:
+                future.result()
+
+    def close(self):
+        if not self.closed:
+            self._executor.shutdown(wait=True)
+            for connection in self._connections:
+                connection.close()
+        super().close()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connection_class(self._netloc, timeout=self._timeout)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _request(self, method, headers=None):
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, self._path, headers=headers or {})
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                # Keep-alive connection closed by the server: retry once
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+                continue
+            if response.status >= 400:
+                msg = f"HTTP {response.status} {response.reason}: {self._url}"
+                raise OSError(msg)
+            return response, body
+        return None
+
+    def _fetch(self, first, last):
+        """Fetch the blocks [first, last] and return {index: block}"""
+        if not self._ranges:
+            response, body = self._request("GET")
+            first = 0
+        else:
+            start = first * self._block_size
+            end = min(self._size, (last + 1) * self._block_size) - 1
+            response, body = self._request("GET", {"Range": f"bytes={start}-{end}"})
+            if response.status != 206:
+                # Server ignoring ranges: the body is the whole file
+                self._ranges = False
+                first = 0
+
+        self.requests += 1
+        self.bytes_fetched += len(body)
+        return self._store(first, body)
+
+    def _store(self, first, body):
+        blocks = {}
+        for index, offset in enumerate(range(0, len(body), self._block_size), first):
+            block = body[offset : offset + self._block_size]
+            self._cache.add(self.namespace, index, block)
+            self._remember(index, block)
+            blocks[index] = block
+        return blocks
+
+    def _remember(self, index, block):
+        with self._lock:
+            self._blocks[index] = block
+            self._blocks.move_to_end(index)
+            while len(self._blocks) > MEMORY_BLOCKS:
+                self._blocks.popitem(last=False)
+
+    def _block(self, index):
+        with self._lock:
+            block = self._blocks.get(index)
+        if block is None:
+            block = self._cache.get(self.namespace, index)
+            if block is None:
+                return self._fetch(index, index)[index]
+            self._remember(index, block)
+        return block
+
+
+def dataset_ranges(dataset, start, stop):
+    """Byte ranges (offset, size) holding the rows [start, stop) of a h5py dataset"""
+    if stop <= start or dataset.size == 0:
+        return []
+
+    dsid = dataset.id
+    if dataset.chunks is None:
+        offset = dsid.get_offset()
+        if offset is None:
+            return []
+        row_size = dataset.dtype.itemsize * int(np.prod(dataset.shape[1:]))
+        return [(offset + start * row_size, (stop - start) * row_size)]
+
+    ranges = []
+    rows = dataset.chunks[0]
+    others = [
+        range(0, size, chunk)
+        for size, chunk in zip(dataset.shape[1:], dataset.chunks[1:])
+    ]
+    for row in range(start - start % rows, stop, rows):
+        for coord in itertools.product(*others):
+            info = dsid.get_chunk_info_by_coord((row, *coord))
+            if info.byte_offset is not None and info.size:
+                ranges.append((info.byte_offset, info.size))
+    return ranges
+
+
+class RemoteHDFReader(VTKPythonAlgorithmBase):
+    """
+    Reader for VTKHDF files (ImageData, UnstructuredGrid and PolyData)
+    served over http(s).
+
+    Only the byte ranges needed are fetched: the HDF5 metadata first, then
+    the selected arrays of the requested time step. Fetched blocks are
+    kept in an on-disk cache so reopening the same file (or time step)
+    does not hit the network again.
+
+    Reading relies on h5py (pip install 'vtk-scene[hdf]').
+    """
+
+    def __init__(
+        self,
+        file_name=None,
+        block_size=DEFAULT_BLOCK_SIZE,
+        max_workers=8,
+        cache=HTTP_CACHE,
+    ):
+        super().__init__(nInputPorts=0, nOutputPorts=1, outputType="vtkDataObject")
+        self._file_name = None
+        self._remote = None
+        self._h5 = None
+        self._remote_options = {
+            "block_size": block_size,
+            "max_workers": max_workers,
+            "cache": cache,
+        }
+        self._selections = {}
+        self._populating = False
+        for _, method_name in SELECTIONS:
+            selection = vtkDataArraySelection()
+            selection.AddObserver("ModifiedEvent", self._on_selection_modified)
+            self._selections[method_name] = selection
+        if file_name is not None:
+            self.SetFileName(file_name)
+
+    def SetFileName(self, file_name):
+        file_name = str(file_name)
+        if file_name != self._file_name:
+            self.close()
+            self._file_name = file_name
+            self.Modified()
+
+    def GetFileName(self):
+        return self._file_name
+
+    def GetPointDataArraySelection(self):
+        return self._selections["GetPointDataArraySelection"]
+
+    def GetCellDataArraySelection(self):
+        return self._selections["GetCellDataArraySelection"]
+
+    def _on_selection_modified(self, *_):
+        if not self._populating:
+            self.Modified()
+
+    @property
+    def remote(self):
+        """RemoteFile currently opened (None before the first update)"""
+        return self._remote
+
+    def close(self):
+        """Close the connections to the server"""
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
+        if self._remote is not None:
+            self._remote.close()
+            self._remote = None
+
+    def _root(self):
+        if self._h5 is None:
+            if h5py is None:
+                msg = (
+                    "Reading remote VTKHDF requires h5py: pip install 'vtk-scene[hdf]'"
+                )
+                raise ImportError(msg)
+
+            self._remote = RemoteFile(self._file_name, **self._remote_options)
+            self._h5 = h5py.File(self._remote, "r")
+        return self._h5["VTKHDF"]
+
+    def _type(self, root):
+        data_type = root.attrs["Type"]
+        if isinstance(data_type, bytes):
+            data_type = data_type.decode()
+        if data_type not in DATA_TYPES:
+            msg = f"Unsupported VTKHDF type {data_type}: {self._file_name}"
+            raise ValueError(msg)
+        return data_type
+
+    def _time_values(self, root):
+        if "Steps/Values" not in root:
+            return ()
+        return tuple(float(v) for v in root["Steps/Values"][:])
+
+    def _enabled(self, root, attribute, method_name):
+        if attribute not in root:
+            return []
+        selection = self._selections[method_name]
+        return [name for name in root[attribute] if selection.ArrayIsEnabled(name)]
+
+    def RequestDataObject(self, _request, _in_info, out_info):
+        klass = DATA_TYPES[self._type(self._root())]
+        current = out_info.GetInformationObject(0).Get(vtkDataObject.DATA_OBJECT())
+        if current is None or not current.IsA(klass.__name__):
+            out_info.GetInformationObject(0).Set(vtkDataObject.DATA_OBJECT(), klass())
+        return 1
+
+    def RequestInformation(self, _request, _in_info, out_info):
+        root = self._root()
+        self._populating = True
+        for attribute, method_name in SELECTIONS:
+            if attribute in root:
+                for name in root[attribute]:
+                    self._selections[method_name].AddArray(name)
+        self._populating = False
+
+        sddp = vtkStreamingDemandDrivenPipeline
+        info = out_info.GetInformationObject(0)
+        info.Remove(sddp.TIME_STEPS())
+        info.Remove(sddp.TIME_RANGE())
+        time_values = self._time_values(root)
+        if time_values:
+            info.Set(sddp.TIME_STEPS(), time_values, len(time_values))
+            info.Set(sddp.TIME_RANGE(), [time_values[0], time_values[-1]], 2)
+
+        if self._type(root) == "ImageData":
+            info.Set(
+                sddp.WHOLE_EXTENT(), [int(v) for v in root.attrs["WholeExtent"]], 6
+            )
+        return 1
+
+    def RequestData(self, _request, _in_info, out_info):
+        root = self._root()
+        info = out_info.GetInformationObject(0)
+        time_values = self._time_values(root)
+        step = 0
+        if time_values and info.Has(
+            vtkStreamingDemandDrivenPipeline.UPDATE_TIME_STEP()
+        ):
+            step = closest_index(
+                time_values,
+                info.Get(vtkStreamingDemandDrivenPipeline.UPDATE_TIME_STEP()),
+            )
+
+        if self._type(root) == "ImageData":
+            dataset = self._read_image(root, step)
+        else:
+            dataset = self._read_step(root, step)
+
+        output = vtkDataObject.GetData(out_info)
+        output.ShallowCopy(dataset)
+        if time_values:
+            output.GetInformation().Set(
+                vtkDataObject.DATA_TIME_STEP(), time_values[step]
+            )
+        return 1
+
+    def _read(self, reads):
+        """Fetch all the needed byte ranges concurrently then slice the datasets"""
+        ranges = []
+        for dataset, start, stop in reads.values():
+            ranges.extend(dataset_ranges(dataset, start, stop))
+        self._remote.prefetch(ranges)
+        return {
+            key: dataset[start:stop] for key, (dataset, start, stop) in reads.items()
+        }
+
+    def _offset(self, root, name, step, default=0):
+        path = f"Steps/{name}"
+        if path not in root:
+            return default
+        return root[path][step]
+
+    def _read_image(self, root, step):
+        extent = [int(v) for v in root.attrs["WholeExtent"]]
+        image = vtkImageData()
+        image.SetExtent(extent)
+        image.SetOrigin(root.attrs["Origin"])
+        image.SetSpacing(root.attrs["Spacing"])
+        if "Direction" in root.attrs:
+            image.SetDirectionMatrix(*root.attrs["Direction"])
+
+        dims = [extent[2 * i + 1] - extent[2 * i] + 1 for i in range(3)]
+        sizes = {
+            "PointData": (dims[2], int(np.prod(dims))),
+            "CellData": (
+                max(1, dims[2] - 1),
+                int(np.prod([max(1, d - 1) for d in dims])),
+            ),
+        }
+
+        reads = {}
+        for attribute, method_name in SELECTIONS:
+            rows, _ = sizes[attribute]
+            for name in self._enabled(root, attribute, method_name):
+                dataset = root[attribute][name]
+                if "Steps" in root and dataset.shape[0] != rows:
+                    # Time steps stacked on an extra leading dimension
+                    reads[attribute, name] = (dataset, step, step + 1)
+                else:
+                    start = int(self._offset(root, f"{attribute}Offsets/{name}", step))
+                    reads[attribute, name] = (dataset, start, start + rows)
+
+        for (attribute, name), values in self._read(reads).items():
+            _, count = sizes[attribute]
+            tuples = values.reshape(count, -1)
+            array = numpy_to_vtk(tuples.ravel() if tuples.shape[1] == 1 else tuples)
+            array.SetName(name)
+            getattr(image, f"Get{attribute}")().AddArray(array)
+
+        return image
+
+    def _read_step(self, root, step):
+        data_type = self._type(root)
+        groups = (
+            [root]
+            if data_type == "UnstructuredGrid"
+            else [root[name] for name, _ in POLY_TOPOLOGIES]
+        )
+
+        part = int(self._offset(root, "PartOffsets", step))
+        number_of_parts = int(
+            self._offset(root, "NumberOfParts", step, root["NumberOfPoints"].shape[0])
+        )
+        point_offset = int(self._offset(root, "PointOffsets", step))
+        cell_offsets = np.atleast_1d(
+            self._offset(root, "CellOffsets", step, np.zeros(len(groups), dtype=int))
+        )
+        connectivity_offsets = np.atleast_1d(
+            self._offset(
+                root, "ConnectivityIdOffsets", step, np.zeros(len(groups), dtype=int)
+            )
+        )
+
+        parts = slice(part, part + number_of_parts)
+        number_of_points = root["NumberOfPoints"][parts]
+        reads = {
+            "points": (
+                root["Points"],
+                point_offset,
+                point_offset + int(number_of_points.sum()),
+            )
+        }
+        number_of_cells = []
+        for t, group in enumerate(groups):
+            cells = group["NumberOfCells"][parts]
+            ids = group["NumberOfConnectivityIds"][parts]
+            number_of_cells.append((cells, ids))
+
+            # Each part stores one more offset than its number of cells
+            start = int(cell_offsets[t]) + part
+            reads["offsets", t] = (
+                group["Offsets"],
+                start,
+                start + int(cells.sum()) + number_of_parts,
+            )
+            start = int(connectivity_offsets[t])
+            reads["connectivity", t] = (
+                group["Connectivity"],
+                start,
+                start + int(ids.sum()),
+            )
+            if "Types" in group:
+                start = int(cell_offsets[t])
+                reads["types", t] = (group["Types"], start, start + int(cells.sum()))
+
+        counts = {
+            "PointData": int(number_of_points.sum()),
+            "CellData": int(sum(cells.sum() for cells, _ in number_of_cells)),
+        }
+        names = {
+            attribute: self._enabled(root, attribute, method_name)
+            for attribute, method_name in SELECTIONS
+        }
+        for attribute, _ in SELECTIONS:
+            for name in names[attribute]:
+                start = int(self._offset(root, f"{attribute}Offsets/{name}", step))
+                reads[attribute, name] = (
+                    root[attribute][name],
+                    start,
+                    start + counts[attribute],
+                )
+
+        data = self._read(reads)
+
+        # Build one dataset per part
+        klass = DATA_TYPES[data_type]
+        datasets = []
+        starts = dict.fromkeys(
+            itertools.product(("offsets", "connectivity", "types"), range(len(groups))),
+            0,
+        )
+        starts.update(points=0, PointData=0, CellData=0)
+        for p in range(number_of_parts):
+            dataset = klass()
+            size = int(number_of_points[p])
+            points = vtkPoints()
+            points.SetData(
+                numpy_to_vtk(
+                    np.ascontiguousarray(data["points"][starts["points"] :][:size])
+                )
+            )
+            dataset.SetPoints(points)
+
+            part_cells = 0
+            for t in range(len(groups)):
+                cells, ids = (
+                    int(number_of_cells[t][0][p]),
+                    int(number_of_cells[t][1][p]),
+                )
+                offsets = data["offsets", t][starts["offsets", t] :][: cells + 1]
+                connectivity = data["connectivity", t][starts["connectivity", t] :][
+                    :ids
+                ]
+                cell_array = vtkCellArray()
+                cell_array.SetData(
+                    numpy_to_vtkIdTypeArray(offsets.astype(ID_TYPE)),
+                    numpy_to_vtkIdTypeArray(connectivity.astype(ID_TYPE)),
+                )
+                if data_type == "UnstructuredGrid":
+                    types = data["types", t][starts["types", t] :][:cells]
+                    dataset.SetCells(
+                        numpy_to_vtk(
+                            np.ascontiguousarray(types), array_type=VTK_UNSIGNED_CHAR
+                        ),
+                        cell_array,
+                    )
+                else:
+                    getattr(dataset, POLY_TOPOLOGIES[t][1])(cell_array)
+                starts["offsets", t] += cells + 1
+                starts["connectivity", t] += ids
+                starts["types", t] += cells
+                part_cells += cells
+
+            for attribute, count in (("PointData", size), ("CellData", part_cells)):
+                for name in names[attribute]:
+                    values = data[attribute, name][starts[attribute] :][:count]
+                    array = numpy_to_vtk(np.ascontiguousarray(values))
+                    array.SetName(name)
+                    getattr(dataset, f"Get{attribute}")().AddArray(array)
+                starts[attribute] += count
+            starts["points"] += size
+            datasets.append(dataset)
+
+        if len(datasets) == 1:
+            return datasets[0]
+
+        append = (
+            vtkAppendFilter()
+            if data_type == "UnstructuredGrid"
+            else vtkAppendPolyData()
+        )
+        for dataset in datasets:
+            append.AddInputData(dataset)
+        append.Update()
+        return append.GetOutputDataObject(0)
+
+
+__all__ = [
+    "HTTP_CACHE",
+    "DiskChunkCache",
+    "RemoteFile",
+    "RemoteHDFReader",
+]
@@ -0,0 +1,89 @@
+# Reader methods returning a vtkDataArraySelection of arrays
+ARRAY_SELECTION_METHODS = (
+    "GetPointDataArraySelection",
+    "GetCellDataArraySelection",
+    "GetFieldDataArraySelection",
+    "GetNodeBlockFieldSelection",
+    "GetElementBlockFieldSelection",
+    "GetSideSetFieldSelection",
+    "GetNodeSetFieldSelection",
+)
+
+# Reader methods returning a vtkDataArraySelection of blocks
+BLOCK_SELECTION_METHODS = (
+    "GetElementBlockSelection",
+    "GetSideSetSelection",
+    "GetNodeSetSelection",
+)
+
+# Reader methods returning a vtkDataArraySelection that affect the output
+SELECTION_METHODS = ARRAY_SELECTION_METHODS + BLOCK_SELECTION_METHODS
+
+
+def selections(reader, methods=SELECTION_METHODS):
+    """Yield (method name, vtkDataArraySelection) available on a reader"""
+    for method_name in methods:
+        method = getattr(reader, method_name, None)
+        if method is not None:
+            yield method_name, method()
+
+
+def enabled_names(selection):
+    """Return the names enabled on a vtkDataArraySelection"""
+    return tuple(
+        selection.GetArrayName(i)
+        for i in range(selection.GetNumberOfArrays())
+        if selection.GetArraySetting(i)
+    )
+
+
+def selection_key(reader):
+    """Return a hashable description of the arrays/blocks enabled on a reader"""
+    return tuple(enabled_names(selection) for _, selection in selections(reader))
+
+
+def copy_selections(source, destination):
+    """Apply the array/block selections of source reader onto destination"""
+    for method_name, selection in selections(source):
+        getattr(destination, method_name)().CopySelections(selection)
+
+
+def apply_selection(selection, names):
+    """Only enable the given names on a vtkDataArraySelection"""
+    names = set(names)
+    for i in range(selection.GetNumberOfArrays()):
+        name = selection.GetArrayName(i)
+        enabled = name in names
+        if bool(selection.GetArraySetting(i)) != enabled:
+            if enabled:
+                selection.EnableArray(name)
+            else:
+                selection.DisableArray(name)
+
+
+def select_arrays(reader, arrays):
+    """
+    Restrict the arrays loaded by a reader to the provided names.
+    The reader information needs to be up to date for the selections
+    to be populated.
+    """
+    for _, selection in selections(reader, ARRAY_SELECTION_METHODS):
+        apply_selection(selection, arrays)
+
+
+def select_blocks(reader, blocks):
+    """
+    Restrict the blocks loaded by a reader to the provided names using the
+    block selections of its format (see BLOCK_SELECTIONS in formats modules).
+    """
+    methods = getattr(reader, "block_selections", BLOCK_SELECTION_METHODS)
+    for _, selection in selections(reader, methods):
+        apply_selection(selection, blocks)
+
+
+__all__ = [
+    "copy_selections",
+    "select_arrays",
+    "select_blocks",
+    "selection_key",
+]
@@ -0,0 +1,305 @@
+import bisect
+import glob
+import hashlib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from vtkmodules.util.vtkAlgorithm import VTKPythonAlgorithmBase
+from vtkmodules.vtkCommonCore import vtkDataArraySelection
+from vtkmodules.vtkCommonDataModel import vtkDataObject
+from vtkmodules.vtkCommonExecutionModel import vtkStreamingDemandDrivenPipeline
+
+from vtk_scene.io.cache import cache_directory
+from vtk_scene.io.core import ReaderFactory
+
+HEADER_SIZE = 1 << 16
+TIME_VALUE_TAG = re.compile(rb"<DataArray[^>]*Name=\"TimeValue\"[^>]*>", re.DOTALL)
+TIME_VALUE_RANGE = re.compile(rb"RangeMin=\"([^\"]+)\"")
+TIME_VALUE_ASCII = re.compile(rb"format=\"ascii\"[^>]*>\s*([-+0-9.eE]+)")
+FILE_INDEX = re.compile(r"(\d+)(?!.*\d)")
+SELECTION_METHODS = ("GetPointDataArraySelection", "GetCellDataArraySelection")
+
+
+def natural_key(path):
+    """Sort key ordering out_2.vtu before out_10.vtu"""
+    return [int(v) if v.isdigit() else v for v in re.split(r"(\d+)", str(path))]
+
+
+def scan_header_time(file_name):
+    """
+    Extract the TimeValue stored in the header of a VTK XML file without
+    reading the file content. Return None when not available.
+    """
+    with Path(file_name).open("rb") as file:
+        header = file.read(HEADER_SIZE)
+
+    tag = TIME_VALUE_TAG.search(header)
+    if tag is None:
+        return None
+
+    match = TIME_VALUE_RANGE.search(header, tag.start(), tag.end())
+    if match is None:
+        match = TIME_VALUE_ASCII.search(header, tag.start(), tag.end() + 256)
+    if match is None:
+        return None
+
+    return float(match.group(1))
+
+
+def file_index(file_name):
+    """Return the last number found in a file name or None"""
+    match = FILE_INDEX.search(Path(file_name).name)
+    return None if match is None else int(match.group(1))
+
+
+class TimeIndex:
+    """
+    Map a set of files to time values.
+
+    The time values are extracted from the file headers in parallel and
+    cached on disk keyed by the file modification times so only new or
+    modified files get scanned again.
+    """
+
+    def __init__(self, source, max_workers=8, use_disk_cache=True):
+        """Create a time index for a glob pattern or a `.series` manifest
+
+        Args:
+            source (str): glob pattern or path to a `.series` file
+            max_workers (int): Number of threads used for scanning headers
+            use_disk_cache (bool): Persist the index between sessions
+        """
+        self._source = str(Path(source).resolve())
+        self._max_workers = max_workers
+        self._use_disk_cache = use_disk_cache
+        self._files = None
+        self._time_values = None
+
+    @property
+    def source(self):
+        return self._source
+
+    @property
+    def files(self):
+        """List of files sorted by time"""
+        if self._files is None:
+            self.build()
+        return self._files
+
+    @property
+    def time_values(self):
+        """List of time values matching files"""
+        if self._time_values is None:
+            self.build()
+        return self._time_values
+
+    def __len__(self):
+        return len(self.files)
+
+    def index_for(self, time_value):
+        """Return the index of the last file with a time lower or equal to time_value"""
+        return max(0, bisect.bisect_right(self.time_values, time_value) - 1)
+
+    def build(self):
+        """(Re)build the index"""
+        if Path(self._source).suffix == ".series":
+            entries = self._read_manifest()
+        else:
+            files = glob.glob(self._source)  # noqa: PTH207
+            entries = self._scan(sorted(files, key=natural_key))
+
+        entries.sort(key=lambda entry: entry[1])
+        self._files = [entry[0] for entry in entries]
+        self._time_values = [entry[1] for entry in entries]
+
+    def _read_manifest(self):
+        manifest = Path(self._source)
+        content = json.loads(manifest.read_text())
+        return [
+            (str(manifest.parent / entry["name"]), float(entry["time"]))
+            for entry in content.get("files", [])
+        ]
+
+    def _scan(self, files):
+        cache_file = self._cache_file()
+        cached = {}
+        if cache_file is not None and cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text())
+            except ValueError:
+                cached = {}
+
+        states = {}
+        to_scan = []
+        for file_name in files:
+            stat = Path(file_name).stat()
+            states[file_name] = [stat.st_mtime_ns, stat.st_size]
+            entry = cached.get(file_name)
+            if entry is None or entry[:2] != states[file_name]:
+                to_scan.append(file_name)
+
+        if to_scan:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+                for file_name, time_value in zip(
+                    to_scan, pool.map(scan_header_time, to_scan)
+                ):
+                    cached[file_name] = [*states[file_name], time_value]
+
+        header_times = [cached[file_name][2] for file_name in files]
+        if None in header_times or len(set(header_times)) != len(header_times):
+            # Fallback to the number embedded in the file name or its position
+            indices = [file_index(file_name) for file_name in files]
+            if None in indices or len(set(indices)) != len(indices):
+                indices = range(len(files))
+            header_times = [float(i) for i in indices]
+
+        if cache_file is not None and to_scan:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(
+                json.dumps({file_name: cached[file_name] for file_name in files})
+            )
+
+        return list(zip(files, header_times))
+
+    def _cache_file(self):
+        if not self._use_disk_cache:
+            return None
+        digest = hashlib.sha1(self._source.encode()).hexdigest()
+        return cache_directory() / "series" / f"{digest}.json"
+
+
+class FileSeriesReader(VTKPythonAlgorithmBase):
+    """
+    Reader exposing a sequence of files (glob pattern or `.series` manifest)
+    as a single temporal source.
+    """
+
+    def __init__(self, file_name=None, max_workers=8, use_disk_cache=True):
+        super().__init__(nInputPorts=0, nOutputPorts=1, outputType="vtkDataObject")
+        self._file_name = None
+        self._index = None
+        self._reader = None
+        self._index_options = {
+            "max_workers": max_workers,
+            "use_disk_cache": use_disk_cache,
+        }
+        self._selections = {}
+        self._populating = False
+        for method_name in SELECTION_METHODS:
+            selection = vtkDataArraySelection()
+            selection.AddObserver("ModifiedEvent", self._on_selection_modified)
+            self._selections[method_name] = selection
+        if file_name is not None:
+            self.SetFileName(file_name)
+
+    def SetFileName(self, file_name):
+        file_name = str(file_name)
+        if file_name != self._file_name:
+            self._file_name = file_name
+            self._index = TimeIndex(file_name, **self._index_options)
+            self._reader = None
+            self.Modified()
+
+    def GetFileName(self):
+        return self._file_name
+
+    def GetPointDataArraySelection(self):
+        return self._selections["GetPointDataArraySelection"]
+
+    def GetCellDataArraySelection(self):
+        return self._selections["GetCellDataArraySelection"]
+
+    def _on_selection_modified(self, *_):
+        if not self._populating:
+            self.Modified()
+
+    @property
+    def index(self):
+        """TimeIndex of the files handled by the reader"""
+        return self._index
+
+    def cache_file_name(self, time_value):
+        """Return the file read for a given time (keys cached outputs)"""
+        if self._index is None or not self._index.files:
+            return None
+        return self._index.files[self._index.index_for(time_value)]
+
+    def _reader_for(self, file_name):
+        if self._reader is None:
+            self._reader = ReaderFactory.create(file_name, cache=None, ingested=False)
+        elif self._reader.GetFileName() != file_name:
+            self._reader.SetFileName(file_name)
+        return self._reader
+
+    def RequestDataObject(self, _request, _in_info, out_info):
+        files = self._index.files
+        if not files:
+            return 0
+
+        reader = self._reader_for(files[0])
+        reader.UpdateInformation()
+        output = reader.GetOutputDataObject(0)
+        current = out_info.GetInformationObject(0).Get(vtkDataObject.DATA_OBJECT())
+        if current is None or current.GetClassName() != output.GetClassName():
+            out_info.GetInformationObject(0).Set(
+                vtkDataObject.DATA_OBJECT(), output.NewInstance()
+            )
+        return 1
+
+    def RequestInformation(self, _request, _in_info, out_info):
+        time_values = self._index.time_values
+        if self._index.files:
+            # Expose the arrays of the first file
+            reader = self._reader_for(self._index.files[0])
+            reader.UpdateInformation()
+            self._populating = True
+            for method_name, selection in self._selections.items():
+                source = getattr(reader, method_name)()
+                for i in range(source.GetNumberOfArrays()):
+                    selection.AddArray(source.GetArrayName(i))
+            self._populating = False
+
+        info = out_info.GetInformationObject(0)
+        info.Remove(vtkStreamingDemandDrivenPipeline.TIME_STEPS())
+        info.Remove(vtkStreamingDemandDrivenPipeline.TIME_RANGE())
+        if time_values:
+            info.Set(
+                vtkStreamingDemandDrivenPipeline.TIME_STEPS(),
+                time_values,
+                len(time_values),
+            )
+            info.Set(
+                vtkStreamingDemandDrivenPipeline.TIME_RANGE(),
+                [time_values[0], time_values[-1]],
+                2,
+            )
+        return 1
+
+    def RequestData(self, _request, _in_info, out_info):
+        info = out_info.GetInformationObject(0)
+        time_values = self._index.time_values
+        time_value = time_values[0] if time_values else 0.0
+        if info.Has(vtkStreamingDemandDrivenPipeline.UPDATE_TIME_STEP()):
+            time_value = info.Get(vtkStreamingDemandDrivenPipeline.UPDATE_TIME_STEP())
+
+        if not time_values:
+            return 0
+
+        index = self._index.index_for(time_value)
+        reader = self._reader_for(self._index.files[index])
+        for method_name, selection in self._selections.items():
+            getattr(reader, method_name)().CopySelections(selection)
+        reader.Update()
+
+        output = vtkDataObject.GetData(out_info)
+        output.ShallowCopy(reader.GetOutputDataObject(0))
+        output.GetInformation().Set(vtkDataObject.DATA_TIME_STEP(), time_values[index])
+        return 1
+
+
+__all__ = [
+    "FileSeriesReader",
+    "TimeIndex",
+]
@@ -0,0 +1,385 @@
+import queue
+import threading
+from pathlib import Path
+
+import numpy as np
+from vtkmodules.util.numpy_support import vtk_to_numpy
+from vtkmodules.vtkCommonCore import vtkDataArray
+from vtkmodules.vtkCommonDataModel import (
+    vtkDataObject,
+    vtkDataSet,
+    vtkPolyData,
+    vtkUnstructuredGrid,
+)
+from vtkmodules.vtkFiltersCore import vtkAppendFilter
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+VTKHDF_VERSION = (2, 2)
+ROOT = "VTKHDF"
+STEPS = f"{ROOT}/Steps"
+
+# VTKHDF topology group name and vtkPolyData accessor
+POLY_TOPOLOGIES = (
+    ("Vertices", "GetVerts"),
+    ("Lines", "GetLines"),
+    ("Polygons", "GetPolys"),
+    ("Strips", "GetStrips"),
+)
+
+ATTRIBUTES = (
+    ("PointData", "GetPointData"),
+    ("CellData", "GetCellData"),
+)
+
+
+def to_numpy(vtk_array, number_of_components=1):
+    """Return a numpy view of a VTK array (empty when the array is None)"""
+    if vtk_array is None:
+        return np.zeros((0, number_of_components) if number_of_components > 1 else 0)
+    return vtk_to_numpy(vtk_array)
+
+
+def cell_arrays(cells):
+    """Return (offsets, connectivity) numpy arrays of a vtkCellArray"""
+    offsets = to_numpy(cells.GetOffsetsArray())
+    if offsets.size == 0:
+        offsets = np.zeros(1, dtype=np.int64)
+    return offsets, to_numpy(cells.GetConnectivityArray())
+
+
+def extract(dataset):
+    """
+    Describe a dataset as the numpy arrays stored in a VTKHDF file.
+    Datasets other than vtkPolyData are converted to vtkUnstructuredGrid.
+
+    Returns:
+        (type, points, topologies, fields) where topologies is a list of
+        (group, types, offsets, connectivity) and fields a dict keyed by
+        (attribute, name).
+    """
+    if not isinstance(dataset, (vtkPolyData, vtkUnstructuredGrid)):
+        append = vtkAppendFilter()
+        append.AddInputData(dataset)
+        append.Update()
+        dataset = append.GetOutput()
+
+    points = to_numpy(
+        dataset.GetPoints().GetData() if dataset.GetPoints() else None, 3
+    ).reshape(-1, 3)
+
+    if isinstance(dataset, vtkPolyData):
+        kind = "PolyData"
+        topologies = [
+            (f"{ROOT}/{name}", None, *cell_arrays(getattr(dataset, method_name)()))
+            for name, method_name in POLY_TOPOLOGIES
+        ]
+    else:
+        kind = "UnstructuredGrid"
+        types = to_numpy(dataset.GetCellTypesArray()).astype(np.uint8, copy=False)
+        topologies = [(ROOT, types, *cell_arrays(dataset.GetCells()))]
+
+    fields = {}
+    for attribute, method_name in ATTRIBUTES:
+        arrays = getattr(dataset, method_name)()
+        for i in range(arrays.GetNumberOfArrays()):
+            array = arrays.GetAbstractArray(i)
+            if isinstance(array, vtkDataArray) and array.GetName():
+                fields[attribute, array.GetName()] = to_numpy(array)
+
+    return kind, points, topologies, fields
+
+
+def same(a, b):
+    """True when both arrays hold the same values"""
+    return b is not None and a.shape == b.shape and np.array_equal(a, b)
+
+
+class TimeSeriesWriter:
+    """
+    Append time steps to a VTKHDF file while a simulation is running.
+
+    Each appended dataset is deep copied and handed to a background thread
+    which compares it with the previous step and only writes what changed:
+    points, topology and field arrays identical to the previous step are
+    referenced through the Steps offsets instead of being written again.
+    The queue between the caller and the writing thread is bounded so a
+    slow disk will eventually throttle the producer instead of growing
+    memory without limit.
+
+    Writing relies on h5py (pip install 'vtk-scene[hdf]').
+
+    Usage:
+        with TimeSeriesWriter("out.vtkhdf") as writer:
+            for t in range(10):
+                simulate(dataset)
+                writer.append(dataset, t)
+    """
+
+    def __init__(self, file_name, compression=None, chunk_size=None, queue_size=2):
+        """Create a writer
+
+        Args:
+            file_name (str): Path of the VTKHDF file to create
+            compression (int|str): gzip level or h5py compression filter
+                name (i.e. 'lzf'), None to disable compression
+            chunk_size (int): Number of rows per HDF5 chunk (default: h5py guess)
+            queue_size (int): Number of time steps waiting to be written
+                before append blocks
+        """
+        if h5py is None:
+            msg = "TimeSeriesWriter requires h5py: pip install 'vtk-scene[hdf]'"
+            raise ImportError(msg)
+
+        self._file_name = str(Path(file_name).resolve())
+        self._file = h5py.File(self._file_name, "w")
+        self._string_dtype = h5py.string_dtype
+        self._compression = {}
+        if isinstance(compression, int):
+            self._compression = {
+                "compression": "gzip",
+                "compression_opts": compression,
+                "shuffle": True,
+            }
+        elif compression is not None:
+            self._compression = {"compression": compression, "shuffle": True}
+        self._chunk_size = chunk_size
+
+        self._kind = None
+        self._previous = None
+        self._offsets = None
+        self._number_of_steps = 0
+
+        self.reused = {"points": 0, "topology": 0, "arrays": 0}
+        self.written = {"points": 0, "topology": 0, "arrays": 0}
+
+        self._error = None
+        self._closed = False
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._thread = threading.Thread(
+            target=self._run, name="vtk_scene_stream", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def file_name(self):
+        return self._file_name
+
+    @property
+    def number_of_steps(self):
+        """Number of time steps written to disk so far"""
+        return self._number_of_steps
+
+    @property
+    def stats(self):
+        """Return written/reused counters along with the queue state"""
+        return {
+            "steps": self._number_of_steps,
+            "pending": self._queue.qsize(),
+            "written": dict(self.written),
+            "reused": dict(self.reused),
+        }
+
+    def append(self, input, time_value=None):
+        """
+        Queue a time step to be written. Blocks only when queue_size steps
+        are already waiting.
+
+        Args:
+            input (vtkDataSet|vtkAlgorithm): Dataset (or its producer) to write
+            time_value (float): Time of the step (default: DATA_TIME_STEP of
+                the dataset or the step index)
+        """
+        self._check()
+        dataset = input.GetOutputDataObject(0) if input.IsA("vtkAlgorithm") else input
+        if not isinstance(dataset, vtkDataSet):
+            msg = f"Invalid type for input: {dataset.GetClassName()}"
+            raise TypeError(msg)
+
+        if time_value is None:
+            info = dataset.GetInformation()
+            time_value = (
+                info.Get(vtkDataObject.DATA_TIME_STEP())
+                if info.Has(vtkDataObject.DATA_TIME_STEP())
+                else None
+            )
+
+        # The caller is free to modify its dataset as soon as we return
+        snapshot = dataset.NewInstance()
+        snapshot.DeepCopy(dataset)
+        self._queue.put((time_value, snapshot))
+
+    def flush(self):
+        """Wait for all the queued time steps to be written"""
+        self._queue.join()
+        self._check()
+
+    def close(self):
+        """Write the queued time steps and close the file"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def _check(self):
+        if self._closed:
+            msg = f"Writer for {self._file_name} is closed"
+            raise ValueError(msg)
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    self._write_step(*item)
+            except Exception as e:  # noqa: BLE001
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _append(self, path, values):
+        """Append rows to a resizable dataset and return the index of the first one"""
+        values = np.asarray(values)
+        dataset = self._file.get(path)
+        if dataset is None:
+            row_shape = values.shape[1:]
+            chunks = True
+            if self._chunk_size:
+                chunks = (self._chunk_size, *row_shape)
+            dataset = self._file.create_dataset(
+                path,
+                shape=(0, *row_shape),
+                maxshape=(None, *row_shape),
+                dtype=values.dtype,
+                chunks=chunks,
+                **self._compression,
+            )
+        offset = dataset.shape[0]
+        if values.shape[0]:
+            dataset.resize(offset + values.shape[0], axis=0)
+            dataset[offset:] = values
+        return offset
+
+    def _create(self, kind):
+        root = self._file.require_group(ROOT)
+        root.attrs["Version"] = VTKHDF_VERSION
+        root.attrs.create(
+            "Type", kind.encode(), dtype=self._string_dtype("ascii", len(kind))
+        )
+        self._file.require_group(STEPS).attrs["NSteps"] = 0
+        self._kind = kind
+
+    def _write_step(self, time_value, dataset):
+        kind, points, topologies, fields = extract(dataset)
+        if self._kind is None:
+            self._create(kind)
+        elif kind != self._kind:
+            msg = f"Can not append {kind} to {self._kind} in {self._file_name}"
+            raise ValueError(msg)
+
+        previous = self._previous or {"points": None, "topologies": (), "fields": {}}
+        offsets = self._offsets or {"fields": {}}
+
+        # Topology (a new part is also needed when the number of points changes)
+        new_topology = (
+            previous["points"] is None
+            or len(points) != len(previous["points"])
+            or any(
+                not same(offs, prev[2])
+                or not same(conn, prev[3])
+                or (types is not None and not same(types, prev[1]))
+                for (_, types, offs, conn), prev in zip(
+                    topologies, previous["topologies"]
+                )
+            )
+        )
+        if new_topology:
+            part = self._append(f"{ROOT}/NumberOfPoints", [len(points)])
+            cell_offsets = []
+            connectivity_offsets = []
+            for group, types, offs, conn in topologies:
+                self._append(f"{group}/NumberOfCells", [len(offs) - 1])
+                self._append(f"{group}/NumberOfConnectivityIds", [len(conn)])
+                # Each part stores one more offset than its number of cells
+                cell_offsets.append(self._append(f"{group}/Offsets", offs) - part)
+                connectivity_offsets.append(self._append(f"{group}/Connectivity", conn))
+                if types is not None:
+                    self._append(f"{group}/Types", types)
+            offsets["topology"] = (part, cell_offsets, connectivity_offsets)
+            self.written["topology"] += 1
+        else:
+            self.reused["topology"] += 1
+
+        # Points
+        if new_topology or not same(points, previous["points"]):
+            offsets["points"] = self._append(f"{ROOT}/Points", points)
+            self.written["points"] += 1
+        else:
+            self.reused["points"] += 1
+
+        # Fields (the first step defines the set of arrays)
+        if self._previous is None:
+            names = list(fields)
+        else:
+            names = list(offsets["fields"])
+            missing = [key[1] for key in names if key not in fields]
+            if missing:
+                msg = f"Arrays missing from time step {time_value}: {missing}"
+                raise ValueError(msg)
+        for key in names:
+            values = fields[key]
+            if key in offsets["fields"] and same(values, previous["fields"].get(key)):
+                self.reused["arrays"] += 1
+            else:
+                offsets["fields"][key] = self._append(
+                    f"{ROOT}/{key[0]}/{key[1]}", values
+                )
+                self.written["arrays"] += 1
+
+        # Time step description
+        if time_value is None:
+            time_value = float(self._number_of_steps)
+        part, cell_offsets, connectivity_offsets = offsets["topology"]
+        self._append(f"{STEPS}/Values", [time_value])
+        self._append(f"{STEPS}/PartOffsets", [part])
+        self._append(f"{STEPS}/NumberOfParts", [1])
+        self._append(f"{STEPS}/PointOffsets", [offsets["points"]])
+        self._append(f"{STEPS}/CellOffsets", [cell_offsets])
+        self._append(f"{STEPS}/ConnectivityIdOffsets", [connectivity_offsets])
+        for (attribute, name), offset in offsets["fields"].items():
+            self._append(f"{STEPS}/{attribute}Offsets/{name}", [offset])
+
+        self._number_of_steps += 1
+        self._file[STEPS].attrs["NSteps"] = self._number_of_steps
+        self._file.flush()
+
+        # Keep the dataset alive as the arrays above are views of its memory
+        self._previous = {
+            "dataset": dataset,
+            "points": points,
+            "topologies": topologies,
+            "fields": fields,
+        }
+        self._offsets = offsets
+
+
+__all__ = [
+    "TimeSeriesWriter",
+]
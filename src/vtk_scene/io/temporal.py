@@ -0,0 +1,203 @@
+"""
+Field ranges over all the time steps of a file.
+
+Scanning every time step is slow, so the scan happens in a background
+thread with a dedicated reader (only loading the scanned array) while the
+caller keeps going with what it has. Results are persisted in a sidecar
+JSON file keyed by the modification time of the source so the next session
+gets them right away. Ingested files answer from their index directly.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from vtk_scene.io import core
+from vtk_scene.io.cache import cache_directory, file_key, reader_file_name
+from vtk_scene.utils import FieldLocation, get_range, merge_range
+
+logger = logging.getLogger(__name__)
+
+
+def sidecar_file(file_name):
+    """Return the JSON file holding the temporal ranges of a source"""
+    path = str(Path(file_name).resolve())
+    return (
+        cache_directory() / "ranges" / hashlib.sha1(path.encode()).hexdigest()
+    ).with_suffix(".json")
+
+
+def field_key(name, location, component=-1):
+    return f"{location}/{name}/{component}"
+
+
+def read_sidecar(file_name, mtime):
+    """Return the ranges stored for a source (empty if outdated or missing)"""
+    try:
+        content = json.loads(sidecar_file(file_name).read_text())
+    except (OSError, ValueError):
+        return {}
+    if content.get("mtime") != mtime:
+        return {}
+    return content.get("ranges", {})
+
+
+def write_sidecar(file_name, mtime, ranges):
+    path = sidecar_file(file_name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"source": str(file_name), "mtime": mtime, "ranges": ranges})
+        )
+        tmp.replace(path)
+    except OSError:
+        logger.warning("Could not save the temporal ranges of %s", file_name)
+
+
+def scan(file_name, name, location, component=-1):
+    """
+    Return the range of a field over all the time steps of a file by
+    reading each of them (None when the field is never found).
+    """
+    reader = core.ReaderFactory.create(
+        file_name, arrays=[name], cache=None, ingested=False
+    )
+    field_location = FieldLocation.get(location)
+    time_values = reader.time_values or (None,)
+    full_range = None
+    for time_value in time_values:
+        if time_value is None:
+            reader.Update()
+        else:
+            reader.UpdateTimeStep(time_value)
+        array = field_location.get_array(reader.GetOutputDataObject(0), name)
+        if array is not None:
+            full_range = merge_range(full_range, get_range(array, component))
+    return full_range
+
+
+class TemporalRanges:
+    """
+    Field ranges over time keyed by source file (and its modification time),
+    computed in background and persisted in sidecar files.
+    """
+
+    def __init__(self, max_workers=1, persist=True):
+        """Create a service
+
+        Args:
+            max_workers (int): Number of files scanned concurrently
+            persist (bool): Read and write the sidecar files
+        """
+        self._max_workers = max_workers
+        self._persist = persist
+        self._lock = threading.Lock()
+        self._executor = None
+        self._ranges = {}
+        self._pending = {}
+        self.scans = 0
+
+    @property
+    def stats(self):
+        """Return the number of scans along with the service state"""
+        return {
+            "scans": self.scans,
+            "pending": len(self._pending),
+            "files": len(self._ranges),
+        }
+
+    def _file_ranges(self, path, mtime):
+        with self._lock:
+            ranges = self._ranges.get((path, mtime))
+        if ranges is None:
+            ranges = read_sidecar(path, mtime) if self._persist else {}
+            with self._lock:
+                ranges = self._ranges.setdefault((path, mtime), ranges)
+        return ranges
+
+    def get(self, source, name, location, component=-1, wait=False):
+        """
+        Return the range of a field over all the time steps of a source.
+
+        When unknown, a background scan is started and None is returned
+        (unless wait is True) so the caller can use a temporary range.
+        Sources and filters, whose output is not the content of a file, get
+        None as well.
+
+        Args:
+            source (vtkAlgorithm|str): Reader (or file name) of the data
+            name (str): Field name
+            location (str): 'point_data', 'cell_data' or 'field_data'
+            component (int): Component to use, -1 for the magnitude
+            wait (bool): Block until the scan is over
+        """
+        ingest = getattr(source, "ingest", None)
+        if ingest is not None:
+            value = ingest.range(name, FieldLocation.get(location), None, component)
+            if value is not None:
+                return value
+
+        file_name = source if isinstance(source, str) else reader_file_name(source)
+        if not file_name:
+            return None
+        path, mtime = file_key(file_name)
+        ranges = self._file_ranges(path, mtime)
+        key = field_key(name, location, component)
+        if key in ranges:
+            value = ranges[key]
+            return None if value is None else tuple(value)
+
+        with self._lock:
+            future = self._pending.get((path, mtime, key))
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix="vtk_scene_temporal",
+                    )
+                future = self._executor.submit(
+                    self._scan, path, mtime, name, location, component
+                )
+                self._pending[path, mtime, key] = future
+
+        if wait:
+            value = future.result()
+            return None if value is None else tuple(value)
+        return None
+
+    def _scan(self, path, mtime, name, location, component):
+        key = field_key(name, location, component)
+        try:
+            value = scan(path, name, location, component)
+        except Exception:
+            logger.exception("Could not scan %s over time in %s", key, path)
+            value = None
+        value = None if value is None else [float(v) for v in value]
+
+        ranges = self._file_ranges(path, mtime)
+        with self._lock:
+            ranges[key] = value
+            self.scans += 1
+            self._pending.pop((path, mtime, key), None)
+            content = dict(ranges)
+        if self._persist:
+            write_sidecar(path, mtime, content)
+        return value
+
+    def clear(self):
+        """Forget the ranges kept in memory (sidecar files are kept)"""
+        with self._lock:
+            self._ranges.clear()
+            self.scans = 0
+
+
+TEMPORAL_RANGES = TemporalRanges()
+
+__all__ = [
+    "TEMPORAL_RANGES",
+    "TemporalRanges",
+]
@@ -1,6 +1,8 @@
-from vtk_scene.lut.core import PRESETS, LookupTable
+from vtk_scene.lut.core import LookupTable
+from vtk_scene.lut.presets import PRESETS, PresetStore
 
 __all__ = [
     "PRESETS",
     "LookupTable",
+    "PresetStore",
 ]
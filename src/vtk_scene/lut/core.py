@@ -1,15 +1,57 @@
-import json
-from pathlib import Path
+from contextlib import contextmanager
 
+import numpy as np
 from vtkmodules.vtkRenderingCore import vtkColorTransferFunction
 
 from vtk_scene.core import AbstractSceneObject
-from vtk_scene.utils import ColorMode
+from vtk_scene.lut.presets import PRESETS
+from vtk_scene.lut.tables import (
+    COLOR_TABLE_CACHE,
+    DEFAULT_TABLE_SIZE,
+    baked_lookup_table,
+    map_values,
+    update_lookup_table,
+)
+from vtk_scene.ranges import CHUNK_SIZE, compute_histogram, compute_quantiles
+from vtk_scene.utils import ColorMode, get_range, merge_range
 
-PRESETS = {
-    item.get("Name"): item
-    for item in json.loads(Path(__file__).with_name("presets.json").read_text())
-}
+# How the range follows the data when the time changes (None: manual)
+#   per_step:         range of the current time step
+#   grow:             union of the ranges of the time steps seen so far
+#   global_over_time: range over all the time steps (grow until known)
+RANGE_POLICIES = ("per_step", "grow", "global_over_time")
+
+# Priority of the observer muting intermediate ModifiedEvents
+MUTE_PRIORITY = 1e9
+
+
+def rescaled(nodes, min_value, max_value):
+    """Return a copy of the nodes with x mapped onto [min_value, max_value]"""
+    nodes = np.array(nodes, dtype=np.float64)
+    x = nodes[:, 0]
+    delta = x[-1] - x[0]
+    if delta < 0.000000001 or max_value - min_value < 0.000000001:
+        return nodes
+    nodes[:, 0] = (max_value - min_value) * (x - x[0]) / delta + min_value
+    return nodes
+
+
+@contextmanager
+def single_modification(vtk_object):
+    """
+    Mute the ModifiedEvent of a VTK object within the block and invoke it
+    once at the end, so observers see one modification for many changes.
+    """
+
+    def mute(*_):
+        vtk_object.GetCommand(tag).SetAbortFlag(1)
+
+    tag = vtk_object.AddObserver("ModifiedEvent", mute, MUTE_PRIORITY)
+    try:
+        yield vtk_object
+    finally:
+        vtk_object.RemoveObserver(tag)
+        vtk_object.Modified()
 
 
 class LookupTable(vtkColorTransferFunction, AbstractSceneObject):
@@ -19,19 +61,27 @@ class LookupTable(vtkColorTransferFunction, AbstractSceneObject):
         AbstractSceneObject.__init__(self, "luts", field_name)
         self._color_mode = color_mode or ColorMode.FieldMagnitude
         self._scalar_range = [0, 1]
+        self._nodes = None
+        self._nodes_mtime = 0
+        self._preset_name = None
+        self._baked = None
+        self._baked_size = DEFAULT_TABLE_SIZE
+        self._baked_mtime = 0
+        self._range_policy = None
+        self._grown_range = None
         self.apply_preset(preset_name)
 
         # Apply settings
         self._color_mode.apply(self)
 
     def apply_preset(self, preset_name):
-        preset = PRESETS.get(preset_name)
+        preset = PRESETS.preset(preset_name)
         if preset is None:
             msg = f"Invalid preset name: {preset_name}"
             raise ValueError(msg)
 
-        srgb = preset["RGBPoints"]
-        color_space = preset["ColorSpace"]
+        self._preset_name = preset_name
+        color_space = preset.color_space
 
         if color_space == "Diverging":
             self.SetColorSpaceToDiverging()
@@ -44,37 +94,229 @@ class LookupTable(vtkColorTransferFunction, AbstractSceneObject):
         elif color_space == "CIELAB":
             self.SetColorSpaceToLabCIEDE2000()
 
-        if "NanColor" in preset:
-            self.SetNanColor(preset["NanColor"])
+        if preset.nan_color is not None:
+            self.SetNanColor(preset.nan_color)
+
+        # Always RGB points, rescaled to the current data range
+        self.set_nodes(rescaled(preset.nodes, *self._scalar_range))
+
+    @property
+    def nodes(self):
+        """
+        Return a read-only (n, 6) array of the nodes (x, r, g, b, midpoint,
+        sharpness). The array is kept until the function is modified, nodes
+        written by set_nodes are kept as is so only modifications made
+        through the VTK API are read back.
+        """
+        if self._nodes is None or self._nodes_mtime != self.GetMTime():
+            nodes = np.empty((self.GetSize(), 6))
+            node = [0, 0, 0, 0, 0, 0]
+            for i in range(nodes.shape[0]):
+                self.GetNodeValue(i, node)
+                nodes[i] = node
+            self._remember_nodes(nodes)
+        return self._nodes
+
+    def set_nodes(self, nodes):
+        """
+        Replace all the nodes at once from a (n, 4) (x, r, g, b) or (n, 6)
+        array. The (x, r, g, b) columns are given to VTK as a single buffer
+        and observers only see one modification.
+        """
+        nodes = np.asarray(nodes, dtype=np.float64)
+        if nodes.shape[1] == 4:
+            defaults = np.tile((0.5, 0.0), (nodes.shape[0], 1))
+            nodes = np.hstack((nodes, defaults))
+
+        with single_modification(self):
+            if nodes.shape[0] == 0:
+                self.RemoveAllPoints()
+            else:
+                self.FillFromDataPointer(nodes.shape[0], nodes[:, :4].ravel().tolist())
+            # FillFromDataPointer uses the default midpoint and sharpness
+            custom = np.flatnonzero((nodes[:, 4] != 0.5) | (nodes[:, 5] != 0.0))
+            for i in custom.tolist():
+                self.SetNodeValue(i, nodes[i].tolist())
+        self._remember_nodes(nodes)
+        self._update_baked()
+
+    def _remember_nodes(self, nodes):
+        nodes.flags.writeable = False
+        self._nodes = nodes
+        self._nodes_mtime = self.GetMTime()
+
+    @property
+    def preset_name(self):
+        """Name of the last applied preset"""
+        return self._preset_name
+
+    def color_table(self, size=DEFAULT_TABLE_SIZE):
+        """
+        Return the shared, read-only (size + 1, 4) uint8 RGBA table sampling
+        this function over its range (last row being the NaN color).
+        """
+        return COLOR_TABLE_CACHE.get(self, size)
+
+    def baked(self, size=DEFAULT_TABLE_SIZE):
+        """
+        Return a vtkLookupTable mapping values through the baked color table.
+        It is kept in sync by apply_preset, rescale and color_mode changes.
+        """
+        if self._baked is None or self._baked_size != size:
+            self._baked_size = size
+            self._baked = baked_lookup_table(self, size)
+            self._baked_mtime = self.GetMTime()
+        elif self._baked_mtime != self.GetMTime():
+            self._update_baked()
+        return self._baked
 
-        # Always RGB points
-        self.RemoveAllPoints()
-        for i in range(0, len(srgb), 4):
-            self.AddRGBPoint(srgb[i], srgb[i + 1], srgb[i + 2], srgb[i + 3])
+    def _update_baked(self):
+        if self._baked is not None:
+            update_lookup_table(
+                self._baked, self, COLOR_TABLE_CACHE.get(self, self._baked_size)
+            )
+            self._baked_mtime = self.GetMTime()
 
-        # Rescale to current data range
-        self.rescale(*self._scalar_range)
+    def map_array(
+        self,
+        values,
+        component_or_magnitude=None,
+        size=DEFAULT_TABLE_SIZE,
+        chunk_size=CHUNK_SIZE,
+        parallel=True,
+    ):
+        """
+        Map values to colors without rendering using the baked color table.
+
+        Args:
+            values (vtkDataArray|np.ndarray|VTKCompositeDataArray): Values,
+                VTK arrays are used without copy
+            component_or_magnitude (int|ColorMode): Component to map, -1 for
+                the magnitude. Defaults to the current color mode.
+            size (int): Resolution of the baked color table
+            chunk_size (int): Number of values mapped by a single task
+            parallel (bool): Map the chunks in the shared thread pool
+
+        Returns:
+            (n, 4) uint8 RGBA numpy array
+        """
+        mode = component_or_magnitude
+        if mode is None:
+            mode = self._color_mode
+        if isinstance(mode, ColorMode):
+            direct = mode == ColorMode.RGB
+            component = mode.vector_component
+        else:
+            direct = False
+            component = int(mode)
+        return map_values(
+            values,
+            self.color_table(size),
+            self.GetRange(),
+            component,
+            direct=direct,
+            chunk_size=chunk_size,
+            parallel=parallel,
+        )
 
     def rescale(self, min_value, max_value):
-        prev_min, prev_max = self.GetRange()
+        nodes = self.nodes
+        if nodes.shape[0] == 0:
+            return
 
-        prev_delta = prev_max - prev_min
+        prev_delta = nodes[-1, 0] - nodes[0, 0]
         next_delta = max_value - min_value
 
         if prev_delta < 0.000000001 or next_delta < 0.000000001:
             return
 
         self._scalar_range = [min_value, max_value]
-        node = [0, 0, 0, 0, 0, 0]
-        next_nodes = []
-        for i in range(self.GetSize()):
-            self.GetNodeValue(i, node)
-            node[0] = next_delta * (node[0] - prev_min) / prev_delta + min_value
-            next_nodes.append(list(node))
+        self.set_nodes(rescaled(nodes, min_value, max_value))
+
+    @property
+    def range_policy(self):
+        """How the range is updated when the time changes (see RANGE_POLICIES)"""
+        return self._range_policy
+
+    @range_policy.setter
+    def range_policy(self, policy):
+        if policy is not None and policy not in RANGE_POLICIES:
+            msg = f"Invalid range policy: {policy} (expected one of {RANGE_POLICIES})"
+            raise ValueError(msg)
+        self._range_policy = policy
+        self._grown_range = None
+
+    def update_range(self, array=None, global_range=None, value_range=None):
+        """
+        Rescale following the range policy for a new time step.
+
+        Args:
+            array (vtkDataArray|np.ndarray|VTKCompositeDataArray): Values of
+                the current time step
+            global_range ((float, float)): Range over all the time steps when
+                already known (global_over_time policy)
+            value_range ((float, float)): Range of the current time step when
+                already known (i.e. FieldIndex.range), array is then ignored
+
+        Returns:
+            True when the lookup table has been rescaled
+        """
+        policy = self._range_policy
+        if policy is None:
+            return False
+
+        if policy == "global_over_time" and global_range is not None:
+            value_range = tuple(global_range)
+        else:
+            if value_range is None and array is not None:
+                value_range = get_range(array, self._color_mode.vector_component)
+            if value_range is None:
+                return False
+            value_range = tuple(value_range)
+            if policy != "per_step":
+                value_range = merge_range(self._grown_range, value_range)
+            self._grown_range = value_range
+
+        if list(value_range) == list(self._scalar_range):
+            return False
+        self.rescale(*value_range)
+        return True
+
+    def rescale_to_quantiles(
+        self, array, low=0.01, high=0.99, method="sketch", sample=None, bins=None
+    ):
+        """
+        Rescale to the [low, high] quantiles of an array (i.e. its 1-99%
+        range) so a few outliers do not squeeze the color map.
+
+        Args:
+            array (vtkDataArray|np.ndarray|VTKCompositeDataArray): Values
+            low (float): Lower quantile
+            high (float): Upper quantile
+            method (str): 'sketch' or 'histogram' (see compute_quantiles)
+            sample (float): Only process that fraction of the values
+            bins (int): Also compute the histogram of the new range
+
+        Returns:
+            Histogram over the new range when bins is provided, None otherwise
+        """
+        component = self._color_mode.vector_component
+        value_range = compute_quantiles(
+            array, (low, high), component=component, method=method, sample=sample
+        )
+        if value_range is None:
+            return None
 
-        self.RemoveAllPoints()
-        for n in next_nodes:
-            self.AddRGBPoint(*n)
+        self.rescale(*value_range)
+        if bins is None:
+            return None
+        return compute_histogram(
+            array,
+            bins=bins,
+            component=component,
+            value_range=value_range,
+            sample=sample,
+        )
 
     @property
     def color_mode(self):
@@ -84,6 +326,7 @@ class LookupTable(vtkColorTransferFunction, AbstractSceneObject):
     def color_mode(self, v: ColorMode):
         self._color_mode = v
         self._color_mode.apply(self)
+        self._update_baked()
 
     @property
     def scalar_range(self):
@@ -0,0 +1,162 @@
+"""
+Lazy store of color map presets (ParaView JSON format).
+
+Only the preset names and the location of their definition are gathered
+when the store is first used. A preset is parsed on its first use and kept
+as a read-only numpy array of nodes ready to be applied to a LookupTable.
+
+Additional presets are loaded from the directories listed in the
+VTK_SCENE_PRESETS environment variable (os.pathsep separated) or added with
+PRESETS.add_directory(path). A preset with an existing name replaces it.
+"""
+
+import json
+import os
+import re
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+BUILTIN_PRESETS = Path(__file__).with_name("presets.json")
+PRESET_DIRECTORIES_ENV = "VTK_SCENE_PRESETS"
+
+# JSON strings and braces, enough to find the boundaries of top level objects
+TOKENS = re.compile(rb'"(?:\\.|[^"\\])*"|[{}]')
+NAME = re.compile(rb'"Name"\s*:\s*("(?:\\.|[^"\\])*")')
+
+
+@dataclass(frozen=True, eq=False)
+class Preset:
+    name: str
+    color_space: str
+    nodes: np.ndarray  # (n, 4): x, r, g, b
+    nan_color: tuple = None
+
+
+def index_file(file_name):
+    """Return {name: (file_name, start, end)} for the presets of a JSON file"""
+    content = Path(file_name).read_bytes()
+    index = {}
+    depth = 0
+    start = None
+    for match in TOKENS.finditer(content):
+        token = match.group()
+        if token == b"{":
+            depth += 1
+            if depth == 1:
+                start = match.start()
+        elif token == b"}":
+            depth -= 1
+            if depth == 0 and start is not None:
+                name = NAME.search(content, start, match.end())
+                if name is not None:
+                    index[json.loads(name.group(1))] = (
+                        str(file_name),
+                        start,
+                        match.end(),
+                    )
+                start = None
+    return index
+
+
+def read_definition(file_name, start, end):
+    with Path(file_name).open("rb") as file:
+        file.seek(start)
+        return json.loads(file.read(end - start))
+
+
+class PresetStore(Mapping):
+    """
+    Mapping of preset name to its (ParaView JSON) definition, indexed on
+    first access and parsed one preset at a time.
+    """
+
+    def __init__(self, files=(BUILTIN_PRESETS,), use_environment=True):
+        """Create a store
+
+        Args:
+            files (list[str]): JSON files holding the base presets
+            use_environment (bool): Also load the directories listed in
+                VTK_SCENE_PRESETS
+        """
+        self._files = [Path(f) for f in files]
+        self._directories = []
+        if use_environment:
+            self._directories.extend(
+                Path(p)
+                for p in os.environ.get(PRESET_DIRECTORIES_ENV, "").split(os.pathsep)
+                if p
+            )
+        self._lock = threading.Lock()
+        self._index = None
+        self._definitions = {}
+        self._presets = {}
+
+    def add_directory(self, directory):
+        """Load the presets of the *.json files of a directory"""
+        with self._lock:
+            self._directories.append(Path(directory))
+            self._index = None
+
+    def _get_index(self):
+        with self._lock:
+            if self._index is None:
+                index = {}
+                files = list(self._files)
+                for directory in self._directories:
+                    files.extend(sorted(directory.glob("*.json")))
+                for file_name in files:
+                    index.update(index_file(file_name))
+                self._index = index
+                self._definitions = {}
+                self._presets = {}
+            return self._index
+
+    def __getitem__(self, name):
+        definition = self._definitions.get(name)
+        if definition is None:
+            location = self._get_index().get(name)
+            if location is None:
+                raise KeyError(name)
+            definition = self._definitions[name] = read_definition(*location)
+        return definition
+
+    def __iter__(self):
+        return iter(self._get_index())
+
+    def __len__(self):
+        return len(self._get_index())
+
+    def __contains__(self, name):
+        return name in self._get_index()
+
+    def preset(self, name):
+        """Return the Preset of a given name (None if unknown)"""
+        preset = self._presets.get(name)
+        if preset is None:
+            definition = self.get(name)
+            if definition is None or "RGBPoints" not in definition:
+                return None
+            nodes = np.asarray(definition["RGBPoints"], dtype=np.float64)
+            nodes = nodes.reshape(-1, 4)
+            nodes.flags.writeable = False
+            nan_color = definition.get("NanColor")
+            preset = self._presets[name] = Preset(
+                name,
+                definition.get("ColorSpace", "RGB"),
+                nodes,
+                None if nan_color is None else tuple(nan_color),
+            )
+        return preset
+
+
+PRESETS = PresetStore()
+
+__all__ = [
+    "PRESETS",
+    "Preset",
+    "PresetStore",
+]
@@ -0,0 +1,228 @@
+"""
+Baked RGBA color tables shared across lookup tables.
+
+A LookupTable is a piecewise function evaluated for every mapped value.
+Baking samples it once into a fixed resolution uint8 RGBA table which is
+then shared by every LookupTable with the same preset, nodes, range, color
+space, NaN color and color mode (many views coloring by the same field).
+
+Baked tables also map large arrays to RGBA without rendering, chunk by
+chunk in the shared range thread pool (NumPy releases the GIL).
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from vtkmodules.util.numpy_support import numpy_to_vtk
+from vtkmodules.vtkCommonCore import vtkLookupTable
+
+from vtk_scene.ranges import CHUNK_SIZE, chunk_values, partitions, run
+
+DEFAULT_TABLE_SIZE = 256
+
+
+def bake(lut, size=DEFAULT_TABLE_SIZE):
+    """
+    Return a (size + 1, 4) uint8 array sampling lut at the center of size
+    bins over its range, the last row holding the NaN color.
+    """
+    min_value, max_value = lut.GetRange()
+    step = (max_value - min_value) / size
+    alpha = lut.GetAlpha()
+    table = np.empty((size + 1, 4))
+    for i in range(size):
+        table[i, :3] = lut.GetColor(min_value + (i + 0.5) * step)
+    table[size, :3] = lut.GetNanColor()
+    table[:, 3] = alpha
+    table = np.rint(np.clip(table, 0, 1) * 255).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+
+def table_key(lut, size=DEFAULT_TABLE_SIZE):
+    """Return the key identifying the baked table of a LookupTable"""
+    color_mode = getattr(lut, "color_mode", None)
+    return (
+        getattr(lut, "preset_name", None),
+        lut.nodes.tobytes(),
+        lut.GetColorSpace(),
+        tuple(lut.GetNanColor()),
+        lut.GetAlpha(),
+        None if color_mode is None else color_mode.name,
+        size,
+    )
+
+
+class ColorTableCache:
+    """
+    Least recently used cache of baked color tables.
+
+    The key covers everything the colors depend on, so rescaling a lookup
+    table or applying another preset moves it to another entry.
+    """
+
+    def __init__(self, max_entries=128):
+        """Create a cache
+
+        Args:
+            max_entries (int): Number of tables kept
+        """
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """Return hit/miss counters along with the cache state"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, lut, size=DEFAULT_TABLE_SIZE):
+        """Return the (size + 1, 4) uint8 baked table of a LookupTable"""
+        key = table_key(lut, size)
+        with self._lock:
+            table = self._entries.get(key)
+            if table is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+
+        table = bake(lut, size)
+        with self._lock:
+            self._entries[key] = table
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return table
+
+    def invalidate(self, preset_name=None):
+        """Remove the tables of a given preset or all of them if None"""
+        with self._lock:
+            for key in list(self._entries):
+                if preset_name is None or key[0] == preset_name:
+                    del self._entries[key]
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        self.invalidate()
+        self.hits = 0
+        self.misses = 0
+
+
+COLOR_TABLE_CACHE = ColorTableCache()
+
+
+def update_lookup_table(vtk_lut, lut, table):
+    """Make a vtkLookupTable map values like lut using its baked table"""
+    size = table.shape[0] - 1
+    colors = numpy_to_vtk(table[:size], deep=True)
+    vtk_lut.SetNumberOfTableValues(size)
+    vtk_lut.SetTable(colors)
+    vtk_lut.SetTableRange(lut.GetRange())
+    vtk_lut.SetNanColor(*(table[size] / 255.0))
+    vtk_lut.SetVectorMode(lut.GetVectorMode())
+    vtk_lut.SetVectorComponent(lut.GetVectorComponent())
+    vtk_lut.SetVectorSize(lut.GetVectorSize())
+    return vtk_lut
+
+
+def baked_lookup_table(lut, size=DEFAULT_TABLE_SIZE, cache=COLOR_TABLE_CACHE):
+    """Return a new vtkLookupTable using the baked table of lut"""
+    return update_lookup_table(vtkLookupTable(), lut, cache.get(lut, size))
+
+
+def map_chunk(task, table, value_range, component):
+    """Write the colors of a chunk of values into its output slice"""
+    values, out = task
+    data = chunk_values(values, component)
+    if values.ndim == 2 and values.shape[1] > 1 and component < 0:
+        data = np.sqrt(data)
+    size = table.shape[0] - 1
+    min_value, max_value = value_range
+    scale = size / (max_value - min_value) if max_value > min_value else 0.0
+    with np.errstate(invalid="ignore"):
+        index = (data.astype(np.float64, copy=False) - min_value) * scale
+        np.clip(index, 0, size - 1, out=index)
+    index = np.where(np.isnan(index), size, index).astype(np.intp)
+    np.take(table, index, axis=0, out=out)
+
+
+def direct_chunk(task):
+    """Write a chunk of direct (RGB/RGBA) colors into its output slice"""
+    values, out = task
+    if values.dtype != np.uint8:
+        values = np.rint(np.clip(values, 0, 1) * 255).astype(np.uint8)
+    out[:, : values.shape[1]] = values[:, :4]
+    if values.shape[1] < 4:
+        out[:, 3] = 255
+
+
+def map_values(
+    array,
+    table,
+    value_range,
+    component=-1,
+    direct=False,
+    chunk_size=CHUNK_SIZE,
+    parallel=True,
+):
+    """
+    Return the (n, 4) uint8 RGBA colors of an array.
+
+    Args:
+        array (vtkDataArray|np.ndarray|VTKCompositeDataArray): Values, VTK
+            arrays are used without copy (partitions are concatenated)
+        table (np.ndarray): Baked (size + 1, 4) table, last row for NaN
+        value_range ((float, float)): Range covered by the table
+        component (int): Component to map, -1 for the magnitude
+        direct (bool): Use the values as RGB(A) colors instead
+        chunk_size (int): Number of values mapped by a single task
+        parallel (bool): Map the chunks in the shared thread pool
+    """
+    entries = []
+    for entry in partitions(array):
+        values = entry.reshape(entry.shape[0], -1) if entry.ndim > 2 else entry
+        width = values.shape[1] if values.ndim == 2 else 1
+        if component >= width > 1:
+            msg = f"Invalid component {component} for {width} components"
+            raise ValueError(msg)
+        if direct and width not in (3, 4):
+            msg = f"Direct colors need 3 or 4 components, not {width}"
+            raise ValueError(msg)
+        entries.append(values)
+
+    colors = np.empty((sum(v.shape[0] for v in entries), 4), dtype=np.uint8)
+    tasks = []
+    offset = 0
+    for values in entries:
+        width = values.shape[1] if values.ndim == 2 else 1
+        rows = max(1, chunk_size // width)
+        for start in range(0, values.shape[0], rows):
+            chunk = values[start : start + rows]
+            tasks.append((chunk, colors[offset + start : offset + start + len(chunk)]))
+        offset += values.shape[0]
+
+    if direct:
+        list(run(direct_chunk, tasks, parallel=parallel))
+    else:
+        list(run(map_chunk, tasks, table, value_range, component, parallel=parallel))
+    return colors
+
+
+__all__ = [
+    "COLOR_TABLE_CACHE",
+    "ColorTableCache",
+    "bake",
+    "baked_lookup_table",
+    "map_values",
+]
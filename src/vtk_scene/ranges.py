@@ -0,0 +1,460 @@
+"""
+Range engine computing component and magnitude ranges of (large) arrays.
+
+Arrays are split into chunks reduced by a shared thread pool (NumPy
+releases the GIL while reducing) so neither the magnitude nor the
+non-finite value masks ever exist at the full array size. The partitions
+of composite arrays are chunked together and reduced in a single pass.
+
+Histograms and quantiles (i.e. 1-99% color ranges robust to outliers)
+follow the same chunked, threaded pattern with optional sampling.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+from vtkmodules.numpy_interface.dataset_adapter import VTKCompositeDataArray
+from vtkmodules.util.numpy_support import vtk_to_numpy
+from vtkmodules.vtkCommonCore import vtkDataArray
+
+CHUNK_SIZE = 1 << 20  # values per task
+
+# How NaN/inf values are handled
+#   skip_nan:  ignore NaN, keep inf (vtkDataArray.GetRange behavior)
+#   finite:    ignore NaN and inf (vtkDataArray.GetFiniteRange behavior)
+#   propagate: NaN/inf end up in the range
+#   raise:     ValueError when a NaN/inf value is found
+NONFINITE_POLICIES = ("skip_nan", "finite", "propagate", "raise")
+VTK_RANGES = {"skip_nan": "GetRange", "finite": "GetFiniteRange"}
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def executor():
+    """Return the thread pool shared by range computations"""
+    global _EXECUTOR  # noqa: PLW0603
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1),
+                thread_name_prefix="vtk_scene_range",
+            )
+        return _EXECUTOR
+
+
+def as_numpy(array):
+    """Return array as a numpy array (None for missing composite entries)"""
+    if isinstance(array, vtkDataArray):
+        return vtk_to_numpy(array)
+    if isinstance(array, np.ndarray):
+        return array
+    return None
+
+
+def partitions(array):
+    """Return the non empty numpy arrays making an array"""
+    if isinstance(array, VTKCompositeDataArray):
+        entries = [as_numpy(entry) for entry in array.Arrays]
+    else:
+        entries = [as_numpy(array)]
+    return [entry for entry in entries if entry is not None and entry.size]
+
+
+def chunk_values(values, component):
+    """Return the 1D values (squared magnitude when component < 0) to reduce"""
+    if values.ndim == 1 or values.shape[1] == 1:
+        return values.reshape(-1)
+    if component >= 0:
+        return values[:, component]
+    values = values.astype(np.float64, copy=False)
+    return np.einsum("ij,ij->i", values, values)
+
+
+def chunk_range(values, component, policy):
+    """Return the range of a chunk (None when empty)"""
+    data = chunk_values(values, component)
+    if data.dtype.kind == "f":
+        if policy == "raise":
+            if not np.isfinite(data).all():
+                msg = "Array holds NaN or infinite values"
+                raise ValueError(msg)
+        elif policy != "propagate":
+            valid = np.isfinite(data) if policy == "finite" else ~np.isnan(data)
+            if not valid.all():
+                data = data[valid]
+    if data.size == 0:
+        return None
+    return (data.min(), data.max())
+
+
+def chunks(array, component, chunk_size):
+    """
+    Split the partitions of an array into chunks of about chunk_size values.
+    Return (chunks, magnitude) where magnitude tells whether the component
+    leads to magnitude computations.
+    """
+    tasks = []
+    magnitude = False
+    for entry in partitions(array):
+        values = entry.reshape(entry.shape[0], -1) if entry.ndim > 2 else entry
+        width = values.shape[1] if values.ndim == 2 else 1
+        if component >= width > 1:
+            msg = f"Invalid component {component} for {width} components"
+            raise ValueError(msg)
+        magnitude = magnitude or (component < 0 and width > 1)
+        rows = max(1, chunk_size // width)
+        tasks.extend(
+            values[start : start + rows] for start in range(0, values.shape[0], rows)
+        )
+    return tasks, magnitude
+
+
+def run(fn, tasks, *args, parallel=True):
+    """Return the results of fn(task, *args) for each task"""
+    if parallel and len(tasks) > 1:
+        return executor().map(fn, tasks, *([arg] * len(tasks) for arg in args))
+    return (fn(task, *args) for task in tasks)
+
+
+def compute_range(
+    array, component=-1, nonfinite="skip_nan", chunk_size=CHUNK_SIZE, parallel=True
+):
+    """
+    Return the (min, max) range of an array.
+
+    Args:
+        array (vtkDataArray|np.ndarray|VTKCompositeDataArray): Values
+        component (int): Component to use, -1 for the magnitude
+        nonfinite (str): NaN/inf handling (see NONFINITE_POLICIES)
+        chunk_size (int): Number of values reduced by a single task
+        parallel (bool): Reduce the chunks in the shared thread pool
+
+    Returns:
+        (float, float) or None when the array holds no (valid) value
+    """
+    if nonfinite not in NONFINITE_POLICIES:
+        msg = f"Invalid nonfinite policy {nonfinite}, expected one of {NONFINITE_POLICIES}"
+        raise ValueError(msg)
+
+    if isinstance(array, vtkDataArray) and nonfinite in VTK_RANGES:
+        # VTK computes (and caches) those ranges with its own SMP backend
+        if array.GetNumberOfTuples() == 0:
+            return None
+        return tuple(getattr(array, VTK_RANGES[nonfinite])(component))
+
+    tasks, magnitude = chunks(array, component, chunk_size)
+    results = run(chunk_range, tasks, component, nonfinite, parallel=parallel)
+
+    # np.minimum/np.maximum propagate NaN (only kept by the propagate policy)
+    full_range = None
+    for result in results:
+        if result is None:
+            continue
+        if full_range is None:
+            full_range = result
+        else:
+            full_range = (
+                np.minimum(full_range[0], result[0]),
+                np.maximum(full_range[1], result[1]),
+            )
+
+    if full_range is None:
+        return None
+    if magnitude:
+        return (float(np.sqrt(full_range[0])), float(np.sqrt(full_range[1])))
+    return (float(full_range[0]), float(full_range[1]))
+
+
+# -----------------------------------------------------------------------------
+# Histograms and quantiles
+# -----------------------------------------------------------------------------
+
+
+@dataclass(frozen=True, eq=False)
+class Histogram:
+    """Counts of the finite values of an array within bins delimited by edges"""
+
+    counts: np.ndarray
+    edges: np.ndarray
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def quantile(self, q):
+        """
+        Return the value below which a fraction q of the values fall
+        (interpolating linearly within bins). q can be a sequence.
+        """
+        if not self.total:
+            return None
+        cumulative = np.concatenate(([0], np.cumsum(self.counts))) / self.total
+        values = np.interp(q, cumulative, self.edges)
+        return float(values) if np.ndim(values) == 0 else tuple(map(float, values))
+
+    def quantile_range(self, low=0.01, high=0.99):
+        """Return the (low, high) quantiles, i.e. the 1-99% range"""
+        if not self.total:
+            return None
+        return self.quantile((low, high))
+
+
+def sample_step(sample):
+    """Return the row stride matching a sampled fraction (None for all)"""
+    if sample is None:
+        return 1
+    if not 0 < sample <= 1:
+        msg = f"Invalid sample fraction {sample}, expected a value in (0, 1]"
+        raise ValueError(msg)
+    return max(1, round(1 / sample))
+
+
+def chunk_samples(values, component, step):
+    """Return the finite (magnitude or component) values of a chunk"""
+    data = chunk_values(values[::step], component)
+    if component < 0 and values.ndim == 2 and values.shape[1] > 1:
+        data = np.sqrt(data)
+    if data.dtype.kind == "f":
+        data = data[np.isfinite(data)]
+    return data
+
+
+def chunk_histogram(values, component, step, bins, value_range):
+    data = chunk_samples(values, component, step)
+    return np.histogram(data, bins=bins, range=value_range)[0]
+
+
+def chunk_sketch(values, component, step, size):
+    """Return (quantile points, weight of each point) summarizing a chunk"""
+    data = chunk_samples(values, component, step)
+    if data.size == 0:
+        return None
+    points = np.quantile(data, np.linspace(0, 1, min(size, data.size)))
+    return points, data.size / points.size
+
+
+def compute_histogram(
+    array,
+    bins=256,
+    component=-1,
+    value_range=None,
+    sample=None,
+    chunk_size=CHUNK_SIZE,
+    parallel=True,
+):
+    """
+    Return the Histogram of the finite values of an array.
+
+    Args:
+        array (vtkDataArray|np.ndarray|VTKCompositeDataArray): Values
+        bins (int): Number of bins
+        component (int): Component to use, -1 for the magnitude
+        value_range ((float, float)): Range covered by the bins (default: the
+            finite range of the array, taken from RANGE_CACHE when known)
+        sample (float): Only process that fraction of the values
+        chunk_size (int): Number of values processed by a single task
+        parallel (bool): Process the chunks in the shared thread pool
+    """
+    step = sample_step(sample)
+    if value_range is None:
+        value_range = RANGE_CACHE.get_range(array, component, nonfinite="finite")
+    if value_range is None:
+        return Histogram(np.zeros(bins, dtype=np.int64), np.linspace(0, 1, bins + 1))
+    if value_range[0] == value_range[1]:
+        value_range = (value_range[0] - 0.5, value_range[1] + 0.5)
+
+    tasks, _ = chunks(array, component, chunk_size)
+    counts = np.zeros(bins, dtype=np.int64)
+    for chunk_counts in run(
+        chunk_histogram, tasks, component, step, bins, value_range, parallel=parallel
+    ):
+        counts += chunk_counts
+    return Histogram(counts, np.linspace(*value_range, bins + 1))
+
+
+def compute_quantiles(
+    array,
+    quantiles=(0.01, 0.99),
+    component=-1,
+    method="sketch",
+    bins=1024,
+    sample=None,
+    chunk_size=CHUNK_SIZE,
+    parallel=True,
+):
+    """
+    Return the quantiles of the finite values of an array.
+
+    The 'sketch' method summarizes each chunk by `bins` evenly spaced
+    quantiles which are merged into weighted points, so it neither needs
+    the range of the array nor suffers from extreme outliers. The
+    'histogram' method interpolates within a fixed-bin histogram over the
+    finite range, accurate to a bin width. Both read the values once and
+    keep a memory footprint independent of the array size.
+
+    Returns:
+        tuple of floats (None when the array holds no finite value)
+    """
+    if method == "histogram":
+        histogram = compute_histogram(
+            array,
+            bins=bins,
+            component=component,
+            sample=sample,
+            chunk_size=chunk_size,
+            parallel=parallel,
+        )
+        return histogram.quantile(tuple(quantiles)) if histogram.total else None
+
+    if method != "sketch":
+        msg = f"Invalid quantile method {method}, expected 'histogram' or 'sketch'"
+        raise ValueError(msg)
+
+    step = sample_step(sample)
+    tasks, _ = chunks(array, component, chunk_size)
+    sketches = [
+        sketch
+        for sketch in run(chunk_sketch, tasks, component, step, bins, parallel=parallel)
+        if sketch is not None
+    ]
+    if not sketches:
+        return None
+
+    points = np.concatenate([points for points, _ in sketches])
+    weights = np.concatenate([np.full(p.size, w) for p, w in sketches])
+    order = np.argsort(points, kind="stable")
+    points = points[order]
+    cumulative = np.cumsum(weights[order]) - 0.5 * weights[order]
+    cumulative /= weights.sum()
+    return tuple(float(v) for v in np.interp(quantiles, cumulative, points))
+
+
+# -----------------------------------------------------------------------------
+# Range cache
+# -----------------------------------------------------------------------------
+
+
+def vtk_object(array):
+    """Return the VTK array behind an array (None for plain numpy arrays)"""
+    if isinstance(array, vtkDataArray):
+        return array
+    return getattr(array, "VTKObject", None)
+
+
+def address(vtk_object):
+    """
+    Return the address of the C++ object behind a VTK wrapper. Unlike id()
+    it does not change when the Python wrapper is collected and recreated.
+    An address can be reused once the object is deleted, so it is always
+    paired with the MTime (which only grows) in cache keys.
+    """
+    return vtk_object.__this__
+
+
+def array_key(array):
+    """
+    Return ((address, MTime), ...) for the VTK arrays making an array or
+    None when some values are not held by VTK arrays (no MTime to rely on).
+    """
+    entries = array.Arrays if isinstance(array, VTKCompositeDataArray) else [array]
+    key = []
+    for entry in entries:
+        if as_numpy(entry) is None:
+            continue  # missing partition
+        vtk_array = vtk_object(entry)
+        if vtk_array is None:
+            return None
+        key.append((address(vtk_array), vtk_array.GetMTime()))
+    return tuple(key)
+
+
+class RangeCache:
+    """
+    Least recently used cache of array ranges keyed by the address and
+    MTime of the arrays along with the component and NaN/inf policy.
+
+    Modifying an array through VTK bumps its MTime and therefore misses the
+    cache. Arrays edited in place through numpy must be invalidated (or
+    have Modified() called on them).
+    """
+
+    def __init__(self, max_entries=1024):
+        """Create a cache
+
+        Args:
+            max_entries (int): Number of ranges kept
+        """
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """Return hit/miss counters along with the cache state"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_range(self, array, component=-1, nonfinite="skip_nan"):
+        """Return compute_range(array, component, nonfinite) reusing known ranges"""
+        key = array_key(array)
+        if key is None:
+            return compute_range(array, component, nonfinite=nonfinite)
+
+        key = (key, component, nonfinite)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute_range(array, component, nonfinite=nonfinite)
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, array=None):
+        """Remove the ranges of a given array or all of them if None"""
+        with self._lock:
+            if array is None:
+                self._entries.clear()
+                return
+            addresses = {entry for entry, _ in array_key(array) or ()}
+            for key in list(self._entries):
+                if any(entry in addresses for entry, _ in key[0]):
+                    del self._entries[key]
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        self.invalidate()
+        self.hits = 0
+        self.misses = 0
+
+
+RANGE_CACHE = RangeCache()
+
+__all__ = [
+    "NONFINITE_POLICIES",
+    "RANGE_CACHE",
+    "Histogram",
+    "RangeCache",
+    "compute_histogram",
+    "compute_quantiles",
+    "compute_range",
+]
@@ -24,6 +24,9 @@ class AbstractRepresentation(ABC, AbstractSceneObject):
     def views(self):
         return self._views
 
+    def update_color_range(self):
+        """Rescale the lookup table in use following its range policy"""
+
     @abstractmethod
     def add_view(self, view): ...
 
@@ -1,31 +1,94 @@
 import logging
+import math
 
 from vtkmodules.vtkCommonExecutionModel import (
     vtkStreamingDemandDrivenPipeline as vtkSDDP,
 )
-from vtkmodules.vtkFiltersGeometry import vtkDataSetSurfaceFilter
+from vtkmodules.vtkFiltersGeometry import (
+    vtkDataSetSurfaceFilter,
+    vtkImageDataGeometryFilter,
+    vtkRectilinearGridGeometryFilter,
+    vtkStructuredGridGeometryFilter,
+)
 from vtkmodules.vtkRenderingCore import (
     vtkActor,
     vtkCompositePolyDataMapper,
 )
 
+from vtk_scene.bounds import leaves
+from vtk_scene.fields import field_index
+from vtk_scene.io.cache import DataObjectCache
+from vtk_scene.io.temporal import TEMPORAL_RANGES
 from vtk_scene.lut import LookupTable
 from vtk_scene.representations.core import AbstractRepresentation
-from vtk_scene.utils import FieldLocation, get_range
+from vtk_scene.utils import FieldLocation
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SURFACE_BUDGET = 512 * 1024 * 1024  # bytes
+
+# Geometry filters producing the surface of 2D structured datasets directly
+STRUCTURED_GEOMETRY_FILTERS = (
+    ("vtkImageData", vtkImageDataGeometryFilter),
+    ("vtkStructuredGrid", vtkStructuredGridGeometryFilter),
+    ("vtkRectilinearGrid", vtkRectilinearGridGeometryFilter),
+)
+
+
+def surface_path(dobj):
+    """
+    Return how the surface of a data object gets extracted:
+        polydata:      already a surface, given to the mapper as is
+        structured_2d: 2D structured dataset, specialized geometry filter
+        surface:       vtkDataSetSurfaceFilter (which has its own fast path
+                       for 3D structured datasets)
+    """
+    if dobj is None:
+        return "surface"
+    if dobj.IsA("vtkPolyData"):
+        return "polydata"
+    if dobj.IsA("vtkDataSet"):
+        # GetDataDimension only exists on the structured types
+        if (
+            any(dobj.IsA(name) for name, _ in STRUCTURED_GEOMETRY_FILTERS)
+            and dobj.GetDataDimension() <= 2
+        ):
+            return "structured_2d"
+        return "surface"
+    datasets = list(leaves(dobj))
+    if datasets and all(ds.IsA("vtkPolyData") for ds in datasets):
+        return "polydata"
+    return "surface"
+
+
 # logging.basicConfig(level=logging.CRITICAL)
 # logger.setLevel(logging.DEBUG)
 
 
 class GeometryRepresentation(AbstractRepresentation):
-    def __init__(self, input, name=None, **_):
+    def __init__(self, input, name=None, bake_colors=False, **_):
         super().__init__(name)
 
         # internal
         self._input = input
 
+        # Map scalars through the shared baked color table of the LUT
+        self.bake_colors = bake_colors
+        self.color_field = None
+
+        # Surfaces extracted for each time step (see enable_surface_cache)
+        self.surface_cache = None
+        self._cached_extractor = None
+
+        # Extractor MTime after its last input change and version of its
+        # settings (bumped when modified in between)
+        self._extractor_mtimes = {}
+        self._extractor_versions = {}
+
+        # How the surface of the current input is extracted (see surface_path)
+        self.surface_path = None
+        self._extractors = {}
+
         self.time_value = float("nan")
         self.input_mtime = 0
 
@@ -40,7 +103,7 @@ class GeometryRepresentation(AbstractRepresentation):
         self.actor = vtkActor(mapper=self.mapper)
 
         if self._input.IsA("vtkDataObject"):
-            self.geometry.input_data = self._input
+            self._set_mapper_input(self._input)
 
         self.update()
 
@@ -62,8 +125,10 @@ class GeometryRepresentation(AbstractRepresentation):
     def input(self, new_input):
         if self._input != new_input:
             self._input = new_input
+            if self.surface_cache is not None:
+                self.surface_cache.clear()
             if self._input.IsA("vtkDataObject"):
-                self.geometry.input_data = self._input
+                self._set_mapper_input(self._input)
 
     def time_values(self):
         if self._input.IsA("vtkAlgorithm"):
@@ -75,35 +140,136 @@ class GeometryRepresentation(AbstractRepresentation):
 
     def update(self):
         if self._input.IsA("vtkAlgorithm"):
-            import math
-
             if math.isnan(self.time_value):
                 self._input.Update()
             else:
                 self._input.UpdateTimeStep(self.time_value)
             mtime = self._input.GetOutputDataObject(0).GetMTime()
-            if mtime > self.input_mtime:
+            if mtime > self.input_mtime or self._extractor_modified():
                 self.input_mtime = mtime
                 dobj = self._input.GetOutputDataObject(0)
                 dobj_c = dobj.NewInstance()
                 dobj_c.ShallowCopy(dobj)
-                self.geometry.input_data = dobj_c
+                self._set_mapper_input(dobj_c)
 
             return self._input.GetOutputDataObject(0)
 
         return self._input
 
+    def _extractor(self, dobj):
+        """Return the filter extracting the surface of dobj"""
+        if self.surface_path != "structured_2d":
+            return self.geometry
+        for name, klass in STRUCTURED_GEOMETRY_FILTERS:
+            if dobj.IsA(name):
+                if name not in self._extractors:
+                    self._extractors[name] = klass()
+                return self._extractors[name]
+        return self.geometry
+
+    def _set_extractor_input(self, extractor, dobj):
+        name = extractor.GetClassName()
+        mtime = self._extractor_mtimes.get(name)
+        if mtime is not None and extractor.GetMTime() != mtime:
+            self._extractor_versions[name] = self._extractor_versions.get(name, 0) + 1
+        extractor.input_data = dobj
+        self._extractor_mtimes[name] = extractor.GetMTime()
+
+    def _extractor_modified(self):
+        """True when the extractor of the cached surface has been modified"""
+        extractor = self._cached_extractor
+        return extractor is not None and extractor.GetMTime() != (
+            self._extractor_mtimes.get(extractor.GetClassName())
+        )
+
+    def _set_mapper_input(self, dobj):
+        self._cached_extractor = None
+        self._set_extractor_input(self.geometry, dobj)
+        if self.ingest is not None:
+            # Surfaces have already been extracted at ingest time
+            self.surface_path = "ingested"
+            self.mapper.SetInputDataObject(dobj)
+            return
+
+        path = surface_path(dobj)
+        if path != self.surface_path:
+            logger.debug("surface extraction: %s => %s", self.surface_path, path)
+        self.surface_path = path
+        if path == "polydata":
+            self.mapper.SetInputDataObject(dobj)
+            return
+
+        extractor = self._extractor(dobj)
+        self._set_extractor_input(extractor, dobj)
+        if self.surface_cache is not None and self._input.IsA("vtkAlgorithm"):
+            self._cached_extractor = extractor
+            self.mapper.SetInputDataObject(self._cached_surface(extractor))
+        else:
+            self.mapper.SetInputConnection(extractor.output_port)
+
+    def enable_surface_cache(self, memory_budget=DEFAULT_SURFACE_BUDGET):
+        """
+        Keep the surface extracted for each time step (least recently used
+        ones are dropped past memory_budget bytes) so replaying a time
+        series only swaps the mapper input.
+        """
+        if self.surface_cache is None:
+            self.surface_cache = DataObjectCache(memory_budget)
+            # Go through the cache on next update even for the current input
+            self.input_mtime = 0
+        else:
+            self.surface_cache.memory_budget = memory_budget
+
+    def disable_surface_cache(self):
+        """Release the cached surfaces and extract them on every update"""
+        self.surface_cache = None
+
+    def _surface_key(self, extractor):
+        # Any modification upstream (i.e. filter parameters) changes the key.
+        # The extractor MTime changes with every new input so the version of
+        # its settings is used instead (see _set_extractor_input).
+        executive = self._input.GetExecutive()
+        name = extractor.GetClassName()
+        return (
+            executive.GetPipelineMTime(),
+            name,
+            self._extractor_versions.get(name, 0),
+            None if math.isnan(self.time_value) else self.time_value,
+        )
+
+    def _cached_surface(self, extractor):
+        key = self._surface_key(extractor)
+        surface = self.surface_cache.get(key)
+        if surface is None:
+            extractor.Update()
+            output = extractor.GetOutputDataObject(0)
+            surface = output.NewInstance()
+            surface.ShallowCopy(output)
+            self.surface_cache.add(key, surface)
+        return surface
+
     @property
     def input_data(self):
         return self.geometry.input
 
+    @property
+    def ingest(self):
+        """IngestIndex of the input reader when reading an ingested cache"""
+        return getattr(self._input, "ingest", None)
+
     @property
     def available_fields(self):
-        dataset = self.update()
+        dataset = self.input_data
+        if dataset is None:
+            dataset = self.update()
+        index = field_index(dataset)
         return {
-            FieldLocation.PointData: FieldLocation.PointData.field_names(dataset),
-            FieldLocation.CellData: FieldLocation.CellData.field_names(dataset),
-            FieldLocation.FieldData: FieldLocation.FieldData.field_names(dataset),
+            location: index.field_names(location.value)
+            for location in (
+                FieldLocation.PointData,
+                FieldLocation.CellData,
+                FieldLocation.FieldData,
+            )
         }
 
     def color_by(
@@ -123,6 +289,7 @@ class GeometryRepresentation(AbstractRepresentation):
             map_scalar,
         )
         if not field_name:
+            self.color_field = None
             self.mapper.SetScalarVisibility(0)
             return
 
@@ -138,14 +305,33 @@ class GeometryRepresentation(AbstractRepresentation):
         if reset_range:
             logger.debug("color_by: reset_range")
             self.update()
+            time_value = None if math.isnan(self.time_value) else self.time_value
+            ingested_range = (
+                None
+                if self.ingest is None
+                else self.ingest.range(
+                    field_name,
+                    field_location,
+                    time_value,
+                    lut.color_mode.vector_component,
+                )
+            )
             dataset = self.input_data
             if field_location is None:
                 field_location = FieldLocation.find(dataset, field_name)
-            array = field_location.get_array(dataset, field_name)
 
-            if array is not None:
-                logger.debug("color_by => rescale %s=%s", field_name, get_range(array))
-                lut.rescale(*get_range(array))
+            if ingested_range is not None:
+                logger.debug("color_by => rescale %s=%s", field_name, ingested_range)
+                lut.rescale(*ingested_range)
+            else:
+                array_range = field_index(dataset).range(
+                    field_name,
+                    field_location.value,
+                    lut.color_mode.vector_component,
+                )
+                logger.debug("color_by => rescale %s=%s", field_name, array_range)
+                if array_range is not None:
+                    lut.rescale(*array_range)
 
         if map_scalar:
             logger.debug("color_by => SetColorModeToMapScalars")
@@ -155,7 +341,7 @@ class GeometryRepresentation(AbstractRepresentation):
             self.mapper.SetColorModeToDirectScalars()
 
         self.mapper.SelectColorArray(field_name)
-        self.mapper.SetLookupTable(lut)
+        self.mapper.SetLookupTable(lut.baked() if self.bake_colors else lut)
 
         if field_location is None:
             self.update()
@@ -167,3 +353,30 @@ class GeometryRepresentation(AbstractRepresentation):
 
         logger.debug("color_by => %s", field_location)
         field_location.select(self.mapper)
+        self.color_field = (field_name, field_location)
+
+    def update_color_range(self):
+        """Rescale the lookup table of the colored field following its policy"""
+        if self.color_field is None:
+            return
+        field_name, field_location = self.color_field
+        lut = self.scene.luts[field_name]
+        if lut is None or lut.range_policy is None:
+            return
+
+        global_range = None
+        if lut.range_policy == "global_over_time" and self._input.IsA("vtkAlgorithm"):
+            global_range = TEMPORAL_RANGES.get(
+                self._input,
+                field_name,
+                field_location.value,
+                lut.color_mode.vector_component,
+            )
+        lut.update_range(
+            global_range=global_range,
+            value_range=field_index(self.input_data).range(
+                field_name,
+                field_location.value,
+                lut.color_mode.vector_component,
+            ),
+        )
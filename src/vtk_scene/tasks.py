@@ -0,0 +1,71 @@
+import asyncio
+from functools import partial
+
+
+class CoalescingRunner:
+    """
+    Run blocking calls (VTK pipeline execution) in an executor from an
+    asyncio loop, one at a time.
+
+    A call submitted while another one is executing waits for its turn, but
+    only the most recent waiting call is kept: the superseded ones raise
+    asyncio.CancelledError to their caller. Cancelling the awaiting task
+    drops the call if it has not started yet.
+    """
+
+    def __init__(self, executor=None):
+        """Create a runner
+
+        Args:
+            executor (Executor): Where to execute the calls
+                (default: the loop default executor)
+        """
+        self.executor = executor
+        self.superseded = 0
+        self._next = None
+        self._task = None
+
+    @property
+    def busy(self):
+        """True while a call is executing or waiting"""
+        return self._task is not None
+
+    async def submit(self, fn, *args, **kwargs):
+        """Execute fn(*args, **kwargs) in the executor and return its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self._next is not None and self._next[1].cancel():
+            self.superseded += 1
+        self._next = (partial(fn, *args, **kwargs), future)
+
+        if self._task is None:
+            self._task = loop.create_task(self._drain())
+
+        return await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._next is not None:
+                fn, future = self._next
+                self._next = None
+                if future.done():
+                    continue
+                try:
+                    result = await loop.run_in_executor(self.executor, fn)
+                except Exception as e:  # noqa: BLE001
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._task = None
+            if self._next is not None:
+                self._next[1].cancel()
+                self._next = None
+
+
+__all__ = [
+    "CoalescingRunner",
+]
@@ -5,11 +5,15 @@ from enum import Enum, auto
 import numpy as np
 from vtkmodules.numpy_interface.dataset_adapter import VTKCompositeDataArray
 from vtkmodules.vtkCommonCore import vtkDataArray
-from vtkmodules.vtkCommonDataModel import (
-    vtkDataSet,
-    vtkPartitionedDataSet,
-    vtkPartitionedDataSetCollection,
+
+from vtk_scene.bounds import (
+    BOUNDS_CACHE,
+    combine,
+    compute_partition_bounds,
+    leaves,
 )
+from vtk_scene.fields import FieldEntry, field_index
+from vtk_scene.ranges import RANGE_CACHE, compute_range
 
 
 @dataclass
@@ -67,6 +71,10 @@ class ColorMode(Enum):
 
     @classmethod
     def options(cls, array):
+        """
+        Return the color modes available for an array (vtkDataArray, numpy
+        array, VTKCompositeDataArray or FieldEntry of a field index).
+        """
         results = [
             cls.FieldMagnitude,
         ]
@@ -78,20 +86,23 @@ class ColorMode(Enum):
                     array = entry
                     break
 
-        if isinstance(array, np.ndarray):
-            number_of_components = array.shape[-1]
+        if isinstance(array, FieldEntry):
+            number_of_components = array.number_of_components
+            dtype = array.dtype
+        elif isinstance(array, np.ndarray):
+            number_of_components = array.shape[-1] if array.ndim > 1 else 1
             dtype = array.dtype
-            if dtype in (np.uint8, np.int8) and number_of_components in (3, 4):
-                results.append(cls.RGB)
-            results.extend(cls.components(array.number_of_components))
-
         elif hasattr(array, "IsA") and array.IsA("vtkDataArray"):
-            if array.number_of_components == 3 or (
-                array.number_of_components == 4 and array.GetDataTypeSize() == 1
-            ):
-                results.append(cls.RGB)
+            number_of_components = array.GetNumberOfComponents()
+            dtype = np.dtype(np.uint8 if array.GetDataTypeSize() == 1 else np.float64)
+        else:
+            return results
 
-            results.extend(cls.components(array.number_of_components))
+        if number_of_components == 3 or (
+            number_of_components == 4 and dtype.itemsize == 1
+        ):
+            results.append(cls.RGB)
+        results.extend(cls.components(number_of_components))
 
         return results
 
@@ -136,12 +147,10 @@ class FieldLocation(Enum):
         if lookup_order is None:
             lookup_order = [cls.PointData, cls.CellData, cls.FieldData]
 
-        for location in lookup_order:
-            available_fields = getattr(dataset, location.value).keys()
-            if field_name in available_fields:
-                return location
-
-        return cls.UnAvailable
+        location = field_index(dataset).find(
+            field_name, [location.value for location in lookup_order]
+        )
+        return cls.UnAvailable if location is None else cls.get(location)
 
     def get_array(self, ds, field_name):
         if self.value:
@@ -149,8 +158,8 @@ class FieldLocation(Enum):
         return None
 
     def field_names(self, ds):
-        if self.value:
-            return list(getattr(ds, self.value).keys())
+        if self.value and ds is not None:
+            return field_index(ds).field_names(self.value)
         return []
 
 
@@ -196,54 +205,33 @@ EMPTY_BOUNDS = (
 )
 
 
-def get_bounds(ds):
-    if ds is None:
-        return EMPTY_BOUNDS
-
-    if isinstance(ds, vtkDataSet):
-        return ds.bounds
-    if isinstance(ds, vtkPartitionedDataSet):
-        size = ds.GetNumberOfPartitions()
-        bounds = None
-        for i in range(size):
-            pds = ds.GetPartition(i)
-            bounds = merge_bounds(bounds, get_bounds(pds))
-        return bounds
-    if isinstance(ds, vtkPartitionedDataSetCollection):
-        size = ds.GetNumberOfPartitionedDataSets()
-        bounds = None
-        for i in range(size):
-            pds = ds.GetPartitionedDataSet(i)
-            bounds = merge_bounds(bounds, get_bounds(pds))
-        return bounds
-    return EMPTY_BOUNDS
+def get_bounds(ds, cache=BOUNDS_CACHE):
+    """
+    Return the bounds of a dataset or composite dataset (multiblock,
+    partitioned, AMR). Bounds are kept in the provided cache until the
+    data object or one of its partitions is modified.
+    """
+    if cache is None:
+        bounds = combine(compute_partition_bounds(list(leaves(ds))))
+    else:
+        bounds = cache.get_bounds(ds)
+    return EMPTY_BOUNDS if bounds is None else bounds
 
 
 # -----------------------------------------------------------------------------
 
 
-def get_range(array, component=-1):
-    """VTK array range helper"""
-    if isinstance(array, vtkDataArray):
-        return array.GetRange(component)
-    if isinstance(array, VTKCompositeDataArray):
-        full_range = None
-        for entry in array.Arrays:
-            full_range = merge_range(full_range, entry.GetRange(component))
-        return full_range
-    if isinstance(array, np.ndarray):
-        shape = array.shape
-        if len(shape) == 1:
-            min_value = array.min()
-            max_value = array.max()
-            return (min_value, max_value)
-        if component >= 0:
-            component_array = array[component]
-            min_value = component_array.min()
-            max_value = component_array.max()
-            return (min_value, max_value)
-        msg = "Don't know how to compute np.array magnitude"
-        raise ValueError(msg)
-
-    msg = f"Don't know what to do with {type(array)}"
-    raise ValueError(msg)
+def get_range(array, component=-1, nonfinite="skip_nan", cache=RANGE_CACHE):
+    """
+    Return the range of a vtkDataArray, numpy array or VTKCompositeDataArray
+    for a given component (-1 for the magnitude), None when it has no values.
+    See vtk_scene.ranges.compute_range for the NaN/inf policies.
+    Ranges of VTK arrays are kept in the provided cache (None to disable)
+    until the arrays are modified.
+    """
+    if not isinstance(array, (vtkDataArray, VTKCompositeDataArray, np.ndarray)):
+        msg = f"Don't know what to do with {type(array)}"
+        raise TypeError(msg)
+    if cache is None:
+        return compute_range(array, component, nonfinite=nonfinite)
+    return cache.get_range(array, component, nonfinite=nonfinite)
@@ -1,3 +1,6 @@
+import math
+import threading
+
 import vtkmodules.vtkRenderingOpenGL2  # noqa: F401
 from vtkmodules.vtkInteractionStyle import vtkInteractorStyleSwitch  # noqa: F401
 from vtkmodules.vtkInteractionWidgets import vtkOrientationMarkerWidget
@@ -11,6 +14,27 @@ from vtkmodules.vtkRenderingCore import (
 from vtk_scene import representations
 from vtk_scene.core import AbstractSceneObject
 from vtk_scene.representations.core import RepresentationGroup
+from vtk_scene.tasks import CoalescingRunner
+
+_PIPELINE_LOCKS_LOCK = threading.Lock()
+
+
+def pipeline_lock(algorithm):
+    """
+    Return the lock serializing the executions of the pipeline feeding an
+    algorithm. It is shared by every algorithm downstream of the same source
+    (following the first input) so views sharing it update one at a time.
+    """
+    source = algorithm
+    while (
+        source.GetNumberOfInputPorts() > 0 and source.GetNumberOfInputConnections(0) > 0
+    ):
+        source = source.GetInputAlgorithm(0, 0)
+    with _PIPELINE_LOCKS_LOCK:
+        lock = getattr(source, "_pipeline_lock", None)
+        if lock is None:
+            lock = source._pipeline_lock = threading.RLock()
+    return lock
 
 
 class RenderView(AbstractSceneObject):
@@ -45,6 +69,8 @@ class RenderView(AbstractSceneObject):
         self.orientation_marker_widget.InteractiveOff()
 
         self.time_value = float("nan")
+        self._runner = CoalescingRunner()
+
         # parent
         if name is None:
             name = self._next_name()
@@ -84,3 +110,33 @@ class RenderView(AbstractSceneObject):
         for rep in self.representations.values():
             rep.time_value = self.time_value
             rep.update()
+
+        # Only once all the inputs are up to date (LUTs may be shared)
+        for rep in self.representations.values():
+            rep.update_color_range()
+
+    def _update_inputs(self, time_value):
+        for rep in list(self.representations.values()):
+            source = getattr(rep, "input", None)
+            if source is None or not source.IsA("vtkAlgorithm"):
+                continue
+            with pipeline_lock(source):
+                if math.isnan(time_value):
+                    source.Update()
+                else:
+                    source.UpdateTimeStep(time_value)
+
+    async def update_async(self, time_value=None):
+        """
+        Awaitable update: the representation inputs (readers, filters) are
+        executed in a background thread, then the view is updated on the
+        calling loop so rendering never sees a pipeline mid-execution.
+        Views sharing a source execute it one at a time (see pipeline_lock).
+
+        When called again while busy, only the latest request is executed
+        and the superseded ones raise asyncio.CancelledError.
+        """
+        if time_value is None:
+            time_value = self.time_value
+        await self._runner.submit(self._update_inputs, time_value)
+        self.update(time_value)
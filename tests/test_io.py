@@ -0,0 +1,581 @@
+import asyncio
+import json
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+from vtkmodules.vtkCommonCore import vtkDoubleArray
+from vtkmodules.vtkCommonDataModel import vtkUnstructuredGrid
+from vtkmodules.vtkCommonExecutionModel import vtkStreamingDemandDrivenPipeline
+from vtkmodules.vtkFiltersGeneral import vtkDataSetTriangleFilter, vtkTimeSourceExample
+from vtkmodules.vtkFiltersGeometry import vtkDataSetSurfaceFilter
+from vtkmodules.vtkImagingCore import vtkRTAnalyticSource
+from vtkmodules.vtkIOHDF import vtkHDFWriter
+from vtkmodules.vtkIOParallelXML import vtkXMLPUnstructuredGridWriter
+from vtkmodules.vtkIOXML import (
+    vtkXMLImageDataWriter,
+    vtkXMLPolyDataWriter,
+    vtkXMLUnstructuredGridReader,
+    vtkXMLUnstructuredGridWriter,
+)
+
+from vtk_scene import FieldLocation
+from vtk_scene.io import (
+    DataObjectCache,
+    ReaderFactory,
+    ReaderPool,
+    TemporalRanges,
+    WriterFactory,
+    ingest,
+    parallel,
+    pyramid,
+)
+from vtk_scene.io.prefetch import SERIAL_IO_LOCK
+from vtk_scene.io.registry import FormatRegistry
+from vtk_scene.io.remote import DiskChunkCache, RemoteFile, RemoteHDFReader
+from vtk_scene.io.selection import selection_key
+from vtk_scene.utils import get_bounds, merge_range
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Static file server honoring single range requests"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        ranges = self.headers.get("Range")
+        if ranges is None:
+            return super().do_GET()
+
+        content = Path(self.translate_path(self.path)).read_bytes()
+        start, end = (int(v) for v in ranges.split("=")[1].split("-"))
+        body = content[start : end + 1]
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return None
+
+    def log_message(self, *_):
+        pass
+
+
+class PlainRequestHandler(SimpleHTTPRequestHandler):
+    """Static file server ignoring range requests and sizes in HEAD answers"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *_):
+        pass
+
+
+def serve(handler_class, directory):
+    handler = partial(handler_class, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    yield from serve(RangeRequestHandler, tmp_path)
+
+
+@pytest.fixture
+def plain_http_server(tmp_path):
+    yield from serve(PlainRequestHandler, tmp_path)
+
+
+@pytest.fixture
+def temporal_file(tmp_path):
+    file_name = tmp_path / "temporal.vtkhdf"
+    source = vtkTimeSourceExample(x_amplitude=1, analytic=0)
+    writer = vtkHDFWriter(file_name=str(file_name), write_all_time_steps=1)
+    source >> writer
+    writer.Write()
+    return file_name
+
+
+@pytest.fixture
+def file_series(tmp_path, monkeypatch):
+    monkeypatch.setenv("VTK_SCENE_CACHE_DIR", str(tmp_path / "cache"))
+    source = vtkTimeSourceExample(x_amplitude=1, analytic=0)
+    for i, time_value in enumerate((0.0, 0.25, 0.5, 0.75)):
+        source.UpdateTimeStep(time_value)
+        dataset = source.GetOutputDataObject(0)
+        time_array = vtkDoubleArray(name="TimeValue")
+        time_array.InsertNextValue(time_value)
+        dataset.field_data.AddArray(time_array)
+        vtkXMLUnstructuredGridWriter(
+            file_name=str(tmp_path / f"out_{i}.vtu"), input_data=dataset
+        ).Write()
+    return tmp_path
+
+
+def test_registry():
+    assert ReaderFactory.klass("a.vtu") is ReaderFactory.klass("b.vtu")
+    assert WriterFactory.klass("a.vtp") is vtkXMLPolyDataWriter
+    assert {".vtu", ".vtkhdf", ".series"} <= set(ReaderFactory.suffix())
+    assert "VTK XML" in ReaderFactory.names()
+
+    registry = FormatRegistry()
+    module = ModuleType("custom_format")
+    module.DEFAULT_READER = "Custom"
+    module.DEFAULT_WRITER = None
+    module.READERS = {"Custom": vtkXMLUnstructuredGridReader}
+    module.WRITERS = {}
+    registry.register("custom", module)
+
+    klass = registry.reader(".custom")
+    assert issubclass(klass, vtkXMLUnstructuredGridReader)
+    assert registry.reader("custom") is klass
+    assert registry.writer(".custom") is None
+    assert registry.stats["hits"] == 1
+
+    registry.unregister(".custom")
+    assert registry.reader(".custom") is None
+
+
+def test_prefetch(temporal_file):
+    reader = ReaderFactory.create(temporal_file, prefetch=2)
+    reference = ReaderFactory.create(temporal_file, cache=None)
+    time_values = reader.time_values
+
+    for time_value in (*time_values, *reversed(time_values)):
+        reader.UpdateTimeStep(time_value)
+        reference.UpdateTimeStep(time_value)
+        assert reader.time_value == pytest.approx(time_value)
+        assert reader.GetOutputDataObject(0).GetPoint(
+            0
+        ) == reference.GetOutputDataObject(0).GetPoint(0)
+
+    stats = reader.prefetcher.stats
+    assert stats["hits"] + stats["misses"] == 2 * len(time_values)
+    assert stats["hits"] > 0
+    assert reader.prefetcher.direction == -1
+
+    # Workers read with an instance of the same (Python) class
+    worker_reader = reader.prefetcher._worker_reader()
+    assert type(worker_reader) is type(reader)
+    assert selection_key(worker_reader) == selection_key(reader)
+
+    reader.disable_prefetch()
+    assert reader.prefetcher is None
+
+
+def test_serialized_execution(temporal_file):
+    reader = ReaderFactory.create(temporal_file, cache=None)
+    assert not reader.thread_safe
+    surface = vtkDataSetSurfaceFilter()
+    reader >> surface
+
+    # Executions triggered downstream wait for the serial IO lock too
+    with SERIAL_IO_LOCK:
+        thread = threading.Thread(target=surface.Update)
+        thread.start()
+        thread.join(0.5)
+        assert thread.is_alive()
+    thread.join()
+    assert surface.GetOutput().GetNumberOfPoints() > 0
+
+
+def test_time_step_cache(temporal_file):
+    cache = DataObjectCache()
+    reader = ReaderFactory.create(temporal_file, cache=cache)
+    time_values = reader.time_values
+
+    for time_value in (*time_values, *time_values):
+        reader.UpdateTimeStep(time_value)
+        assert reader.time_value == pytest.approx(time_value)
+
+    assert cache.stats["misses"] == len(time_values)
+    assert cache.stats["hits"] == len(time_values)
+    assert len(cache) == len(time_values)
+
+    # Changing the array selection is a different entry
+    reader.GetPointDataArraySelection().DisableArray("Point X")
+    reader.UpdateTimeStep(time_values[0])
+    assert reader.GetOutputDataObject(0).point_data.GetArray("Point X") is None
+    assert len(cache) == len(time_values) + 1
+
+    # Evict least recently used entries to fit the budget
+    cache.memory_budget = cache.nbytes // 2
+    assert cache.nbytes <= cache.memory_budget
+    assert cache.stats["evictions"] > 0
+
+    cache.invalidate(temporal_file)
+    assert len(cache) == 0
+
+
+def test_file_series(file_series):
+    pattern = file_series / "out_*.vtu"
+    reader = ReaderFactory.create(pattern)
+    time_values = reader.time_values
+    assert len(time_values) == 4
+    assert list(time_values) == sorted(time_values)
+    assert len(list((file_series / "cache" / "series").iterdir())) == 1
+
+    for time_value in time_values:
+        reader.UpdateTimeStep(time_value)
+        assert reader.time_value == pytest.approx(time_value)
+
+    manifest = file_series / "out.vtu.series"
+    manifest.write_text(
+        json.dumps(
+            {
+                "file-series-version": "1.0",
+                "files": [
+                    {"name": "out_0.vtu", "time": 10},
+                    {"name": "out_3.vtu", "time": 20},
+                ],
+            }
+        )
+    )
+    reader = ReaderFactory.create(manifest)
+    assert reader.time_values == (10, 20)
+    reader.UpdateTimeStep(15)
+    assert reader.time_value == 10
+
+
+def test_file_series_cache(file_series):
+    cache = DataObjectCache()
+    reader = ReaderFactory.create(file_series / "out_*.vtu", cache=cache)
+    first, second = reader.time_values[:2]
+    reader.UpdateTimeStep(first)
+    points = reader.GetOutputDataObject(0).GetNumberOfPoints()
+    reader.UpdateTimeStep(second)
+    assert len(cache) == 2
+
+    # Replacing a file of the series is not served from the cache
+    member = file_series / "out_0.vtu"
+    dataset = vtkUnstructuredGrid()
+    dataset.field_data.ShallowCopy(reader.GetOutputDataObject(0).field_data)
+    vtkXMLUnstructuredGridWriter(file_name=str(member), input_data=dataset).Write()
+    os.utime(member, ns=(1, 1))
+    reader.UpdateTimeStep(first)
+    assert reader.GetOutputDataObject(0).GetNumberOfPoints() != points
+    assert len(cache) == 3
+
+
+def test_inspect(temporal_file, file_series):
+    metadata = ReaderFactory.inspect(temporal_file)
+    assert metadata is ReaderFactory.inspect(temporal_file)
+    assert metadata.data_type == "vtkUnstructuredGrid"
+    assert len(metadata.time_values) == 10
+    assert "Point X" in metadata.field_names(FieldLocation.PointData)
+    assert "Cell X" in metadata.field_names(FieldLocation.CellData)
+
+    metadata = ReaderFactory.inspect(file_series / "out_0.vtu")
+    array = metadata.get("Point Value")
+    assert array.location == FieldLocation.PointData
+    assert array.components == 1
+    assert array.dtype == "float64"
+
+    metadata = ReaderFactory.inspect(file_series / "out_*.vtu")
+    assert len(metadata.time_values) == 4
+
+
+def test_selective_read(temporal_file, file_series):
+    time_value = ReaderFactory.create(temporal_file).time_values[3]
+    dataset = ReaderFactory.read(
+        temporal_file, arrays=["Point X", "Cell Y"], time=time_value
+    )
+    assert dataset.GetInformation().Get(dataset.DATA_TIME_STEP()) == time_value
+    assert list(dataset.point_data.keys()) == ["Point X"]
+    assert list(dataset.cell_data.keys()) == ["Cell Y"]
+
+    dataset = ReaderFactory.read(file_series / "out_*.vtu", arrays=["Point Y"])
+    assert list(dataset.point_data.keys()) == ["Point Y"]
+    assert list(dataset.cell_data.keys()) == []
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_read_partitioned(tmp_path, executor):
+    file_name = tmp_path / "pieces.pvtu"
+    source = vtkRTAnalyticSource(whole_extent=(0, 10, 0, 10, 0, 10))
+    writer = vtkXMLPUnstructuredGridWriter(
+        file_name=str(file_name), number_of_pieces=3, start_piece=0, end_piece=2
+    )
+    source >> vtkDataSetTriangleFilter() >> writer
+    writer.Write()
+
+    partitioned = ReaderFactory.read_partitioned(
+        file_name, executor=executor, max_workers=2, arrays=["RTData"]
+    )
+    serial = ReaderFactory.read(file_name)
+    assert partitioned.GetNumberOfPartitions() == 3
+    assert partitioned.GetNumberOfCells() == serial.GetNumberOfCells()
+    assert get_bounds(partitioned) == serial.GetBounds()
+    assert partitioned.GetPartition(0).point_data["RTData"] is not None
+    scalars = partitioned.GetPartition(0).GetPointData().GetScalars()
+    assert scalars is not None
+    assert scalars.GetName() == "RTData"
+
+    # The shared memory is released with the arrays using it
+    del partitioned, scalars
+    assert not parallel.SHARED_ARRAYS
+
+
+def test_async(temporal_file):
+    reader = ReaderFactory.create(temporal_file, cache=None)
+    time_values = reader.time_values
+
+    async def scrub():
+        requests = [asyncio.ensure_future(reader.update_async(t)) for t in time_values]
+        return await asyncio.gather(*requests, return_exceptions=True)
+
+    results = asyncio.run(scrub())
+
+    # Requests made before the first one started are superseded by the last
+    assert all(isinstance(r, asyncio.CancelledError) for r in results[:-1])
+    assert results[-1] is reader.GetOutputDataObject(0)
+    assert (
+        reader.GetOutputInformation(0).Get(
+            vtkStreamingDemandDrivenPipeline.UPDATE_TIME_STEP()
+        )
+        == time_values[-1]
+    )
+
+    dataset = asyncio.run(ReaderFactory.read_async(temporal_file, time=time_values[1]))
+    assert dataset.GetNumberOfPoints() > 0
+
+
+def test_stream(tmp_path):
+    pytest.importorskip("h5py")
+    file_name = tmp_path / "stream.vtkhdf"
+    source = vtkTimeSourceExample(x_amplitude=1, analytic=0)
+    source.UpdateInformation()
+    time_values = source.GetOutputInformation(0).Get(
+        vtkStreamingDemandDrivenPipeline.TIME_STEPS()
+    )[:4]
+
+    with WriterFactory.stream(file_name, compression=4, queue_size=1) as writer:
+        for time_value in time_values:
+            source.UpdateTimeStep(time_value)
+            writer.append(source, time_value)
+
+    # The topology does not change over time
+    assert writer.stats["steps"] == len(time_values)
+    assert writer.stats["written"]["topology"] == 1
+    assert writer.stats["reused"]["topology"] == len(time_values) - 1
+
+    reader = ReaderFactory.create(file_name, cache=None)
+    assert reader.time_values == pytest.approx(time_values)
+    for time_value in time_values:
+        reader.UpdateTimeStep(time_value)
+        source.UpdateTimeStep(time_value)
+        expected = source.GetOutputDataObject(0)
+        dataset = reader.GetOutputDataObject(0)
+        assert dataset.GetNumberOfCells() == expected.GetNumberOfCells()
+        assert dataset.GetPoint(1) == expected.GetPoint(1)
+        assert (
+            dataset.GetPointData().GetArray("Point X").GetRange()
+            == expected.GetPointData().GetArray("Point X").GetRange()
+        )
+
+
+def test_ingest(temporal_file, tmp_path, monkeypatch):
+    monkeypatch.setenv("VTK_SCENE_CACHE_DIR", str(tmp_path / "cache"))
+    assert ingest.find(temporal_file) is None
+
+    index = ingest.ingest(temporal_file)
+    source = ReaderFactory.create(temporal_file, cache=None, ingested=False)
+    assert index.time_values == pytest.approx(source.time_values)
+
+    reader = ReaderFactory.create(temporal_file, cache=None)
+    assert reader.ingest == index
+    assert reader.time_values == pytest.approx(source.time_values)
+
+    time_value = source.time_values[2]
+    reader.UpdateTimeStep(time_value)
+    source.UpdateTimeStep(time_value)
+    surface = reader.GetOutputDataObject(0)
+    dataset = source.GetOutputDataObject(0)
+    assert surface.IsA("vtkPolyData")
+    assert index.bounds_at(time_value) == pytest.approx(dataset.GetBounds())
+    assert index.range("Point X", FieldLocation.PointData, time_value) == (
+        pytest.approx(dataset.GetPointData().GetArray("Point X").GetRange())
+    )
+
+    # A cache holding some of the arrays only serves requests for those
+    index = ingest.ingest(temporal_file, arrays=["Point X"])
+    assert index.arrays == ("Point X",)
+    assert ReaderFactory.create(temporal_file, cache=None).ingest is None
+    reader = ReaderFactory.create(temporal_file, arrays=["Point X"], cache=None)
+    assert reader.ingest == index
+
+    # Modifying the source invalidates the cache
+    temporal_file.touch()
+    assert ReaderFactory.create(temporal_file, cache=None).ingest is None
+
+
+def test_reader_pool(temporal_file, monkeypatch):
+    pool = ReaderPool(ttl=None)
+    monkeypatch.setattr("vtk_scene.io.core.READER_POOL", pool)
+    time_values = ReaderFactory.create(temporal_file, cache=None).time_values
+
+    first = ReaderFactory.acquire(temporal_file)
+    second = ReaderFactory.acquire(temporal_file)
+    assert first.reader is second.reader
+    assert first.time_values == pytest.approx(time_values)
+    assert pool.stats["readers"] == 1
+    assert pool.stats["sessions"] == 2
+
+    # Each session keeps its own time
+    first.UpdateTimeStep(time_values[1])
+    second.UpdateTimeStep(time_values[4])
+    assert first.time_value == pytest.approx(time_values[1])
+    assert second.time_value == pytest.approx(time_values[4])
+    assert first.GetOutputDataObject(0) is not second.GetOutputDataObject(0)
+
+    first.close()
+    assert pool.clear() == 0
+    with second:
+        pass
+    assert pool.clear() == 1
+    assert pool.stats == {
+        "readers": 0,
+        "sessions": 0,
+        "created": 1,
+        "reused": 1,
+        "closed": 1,
+    }
+    assert first.reader is None
+
+
+def test_pyramid(tmp_path, monkeypatch):
+    monkeypatch.setenv("VTK_SCENE_CACHE_DIR", str(tmp_path / "cache"))
+    file_name = tmp_path / "volume.vti"
+    source = vtkRTAnalyticSource(whole_extent=(0, 63, 0, 63, 0, 63))
+    writer = vtkXMLImageDataWriter(file_name=str(file_name))
+    source >> writer
+    writer.Write()
+    source_range = source.GetOutput().GetPointData().GetArray("RTData").GetRange()
+
+    # Without pyramid, the file is the only level
+    reader = ReaderFactory.create(file_name, "Pyramid", cache=None)
+    assert reader.number_of_levels == 1
+
+    levels = pyramid.build(file_name, min_size=16)
+    assert [level.dimensions for level in levels.levels] == [
+        (64, 64, 64),
+        (32, 32, 32),
+        (16, 16, 16),
+    ]
+    for level in levels.levels:
+        image = ReaderFactory.read(level.file_name)
+        assert image.GetDimensions() == level.dimensions
+        assert image.GetSpacing() == pytest.approx(level.spacing)
+        level_range = image.GetPointData().GetArray("RTData").GetRange()
+        assert source_range[0] <= level_range[0] <= level_range[1] <= source_range[1]
+
+    reader = ReaderFactory.create(file_name, "Pyramid", arrays=["RTData"], cache=None)
+    assert reader.level == 2
+    reader.Update()
+    assert reader.GetOutputDataObject(0).GetDimensions() == (16, 16, 16)
+
+    assert reader.refine()
+    reader.Update()
+    assert reader.GetOutputDataObject(0).GetDimensions() == (32, 32, 32)
+
+    reader.set_screen_resolution(40)
+    reader.Update()
+    image = reader.GetOutputDataObject(0)
+    assert reader.level == 0
+    assert image.GetDimensions() == (64, 64, 64)
+    assert image.GetPointData().GetArray("RTData") is not None
+    assert not reader.refine()
+
+    # Modifying the source invalidates the pyramid
+    file_name.touch()
+    assert pyramid.load(file_name) is None
+
+
+def test_remote(temporal_file, http_server, tmp_path, monkeypatch):
+    pytest.importorskip("h5py")
+    monkeypatch.setenv("VTK_SCENE_CACHE_DIR", str(tmp_path / "cache"))
+    url = f"{http_server}/{temporal_file.name}"
+    local = ReaderFactory.create(temporal_file, cache=None)
+    time_value = local.time_values[3]
+    local.UpdateTimeStep(time_value)
+    expected = local.GetOutputDataObject(0)
+
+    reader = ReaderFactory.create(url, arrays=["Point X"], time=time_value, cache=None)
+    assert ReaderFactory.can_read(url)
+    assert reader.time_values == pytest.approx(local.time_values)
+    dataset = reader.GetOutputDataObject(0)
+    assert dataset.GetNumberOfCells() == expected.GetNumberOfCells()
+    assert dataset.GetPoint(2) == expected.GetPoint(2)
+    assert list(dataset.point_data.keys()) == ["Point X"]
+    assert (
+        dataset.GetPointData().GetArray("Point X").GetRange()
+        == expected.GetPointData().GetArray("Point X").GetRange()
+    )
+    reader.close()
+
+    # Only the needed blocks are fetched, then served from the disk cache.
+    # Blocks of the default size cached above are not reused with 1 KiB ones.
+    for expected_requests in (None, 0):
+        reader = RemoteHDFReader(url, block_size=1024)
+        reader.UpdateInformation()
+        reader.GetPointDataArraySelection().DisableAllArrays()
+        reader.GetCellDataArraySelection().DisableAllArrays()
+        reader.UpdateTimeStep(time_value)
+        assert reader.GetOutputDataObject(0).GetNumberOfPoints() > 0
+        stats = reader.remote.stats
+        assert stats["bytes_fetched"] < reader.remote.size
+        if expected_requests is not None:
+            assert stats["requests"] == expected_requests
+        reader.close()
+
+
+def test_remote_without_ranges(temporal_file, plain_http_server, tmp_path):
+    content = temporal_file.read_bytes()
+    remote = RemoteFile(
+        f"{plain_http_server}/{temporal_file.name}",
+        block_size=1024,
+        cache=DiskChunkCache(directory=tmp_path / "blocks"),
+    )
+    assert remote.size == len(content)
+    assert remote.read() == content
+    remote.seek(2000)
+    assert remote.read(10) == content[2000:2010]
+
+    # The size probe got the whole file, nothing else is requested
+    assert remote.stats["requests"] == 1
+    remote.close()
+
+
+def test_temporal_ranges(temporal_file, tmp_path, monkeypatch):
+    monkeypatch.setenv("VTK_SCENE_CACHE_DIR", str(tmp_path / "cache"))
+    source = ReaderFactory.create(temporal_file, cache=None)
+    expected = None
+    for time_value in source.time_values:
+        source.UpdateTimeStep(time_value)
+        step = source.GetOutputDataObject(0).GetPointData().GetArray("Point X")
+        expected = merge_range(expected, step.GetRange())
+
+    ranges = TemporalRanges()
+    first = ranges.get(source, "Point X", "point_data")
+    value = ranges.get(source, "Point X", "point_data", wait=True)
+    assert first in (None, value)
+    assert value == pytest.approx(expected)
+    assert ranges.stats["scans"] == 1
+
+    # Sidecar file reused by a new session, until the file is modified
+    ranges = TemporalRanges()
+    assert ranges.get(str(temporal_file), "Point X", "point_data") == value
+    assert ranges.stats["scans"] == 0
+    temporal_file.touch()
+    assert ranges.get(str(temporal_file), "Point X", "point_data") is None
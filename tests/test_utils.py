@@ -0,0 +1,455 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+from vtkmodules.numpy_interface import dataset_adapter as dsa
+from vtkmodules.util.numpy_support import numpy_to_vtk
+from vtkmodules.vtkCommonDataModel import (
+    vtkMultiBlockDataSet,
+    vtkPartitionedDataSet,
+    vtkPartitionedDataSetCollection,
+    vtkPolyData,
+)
+from vtkmodules.vtkCommonExecutionModel import vtkStreamingDemandDrivenPipeline
+from vtkmodules.vtkFiltersCore import vtkThreshold
+from vtkmodules.vtkFiltersGeneral import vtkDataSetTriangleFilter, vtkTimeSourceExample
+from vtkmodules.vtkImagingCore import vtkRTAnalyticSource
+
+from vtk_scene import ColorMode, FieldLocation, RenderView, SceneManager
+from vtk_scene.bounds import BoundsCache
+from vtk_scene.fields import field_index
+from vtk_scene.lut import LookupTable, PresetStore
+from vtk_scene.lut.tables import COLOR_TABLE_CACHE
+from vtk_scene.ranges import (
+    RangeCache,
+    compute_histogram,
+    compute_quantiles,
+    compute_range,
+)
+from vtk_scene.representations import GeometryRepresentation
+from vtk_scene.utils import EMPTY_BOUNDS, get_bounds, get_range, merge_range
+from vtk_scene.views.render_view import pipeline_lock
+
+
+def test_get_range_numpy():
+    values = np.array([[3.0, 4.0, 0.0], [0.0, -1.0, 0.0], [6.0, 8.0, 0.0]])
+    assert get_range(values, 0) == (0.0, 6.0)
+    assert get_range(values, 1) == (-1.0, 8.0)
+    assert get_range(values) == (1.0, 10.0)
+    assert get_range(np.arange(10)) == (0.0, 9.0)
+    assert get_range(np.zeros(0)) is None
+    with pytest.raises(TypeError):
+        get_range([1.0, 2.0])
+
+    # Chunked and threaded reductions give the same result
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(10000, 3))
+    magnitude = np.linalg.norm(vectors, axis=1)
+    assert get_range(vectors) == pytest.approx((magnitude.min(), magnitude.max()))
+    assert compute_range(vectors, chunk_size=999) == get_range(vectors)
+
+    # Same range as VTK
+    vtk_vectors = numpy_to_vtk(vectors)
+    assert get_range(vtk_vectors) == pytest.approx(vtk_vectors.GetRange(-1))
+    assert get_range(vtk_vectors, 2) == pytest.approx(vtk_vectors.GetRange(2))
+
+
+def test_get_range_nonfinite():
+    values = np.array([1.0, np.nan, -np.inf, 5.0])
+    assert get_range(values) == (-np.inf, 5.0)
+    assert get_range(values, nonfinite="finite") == (1.0, 5.0)
+    assert np.isnan(get_range(values, nonfinite="propagate")[0])
+    with pytest.raises(ValueError, match="NaN"):
+        get_range(values, nonfinite="raise")
+    with pytest.raises(ValueError, match="policy"):
+        get_range(values, nonfinite="unknown")
+
+
+def test_get_range_composite():
+    partitioned = vtkPartitionedDataSet()
+    for i, extent in enumerate(((0, 10, 0, 10, 0, 10), (-20, -10, 0, 4, 0, 4))):
+        source = vtkRTAnalyticSource(whole_extent=extent)
+        source.Update()
+        partitioned.SetPartition(i, source.GetOutput())
+
+    array = dsa.WrapDataObject(partitioned).PointData["RTData"]
+    expected = None
+    for i in range(2):
+        part_array = partitioned.GetPartition(i).GetPointData().GetArray(0)
+        expected = merge_range(expected, part_array.GetRange())
+    assert get_range(array) == pytest.approx(expected)
+
+
+def test_range_cache():
+    cache = RangeCache()
+    array = numpy_to_vtk(np.arange(12, dtype=np.float64).reshape(4, 3), deep=1)
+
+    assert get_range(array, 0, cache=cache) == (0.0, 9.0)
+    assert get_range(array, 0, cache=cache) == (0.0, 9.0)
+    assert get_range(array, cache=cache) == pytest.approx(
+        (np.sqrt(0 + 1 + 4), np.sqrt(81 + 100 + 121))
+    )
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 2
+
+    # Modified arrays are computed again
+    array.SetComponent(0, 0, -5)
+    array.Modified()
+    assert get_range(array, 0, cache=cache) == (-5.0, 9.0)
+    assert cache.stats["misses"] == 3
+
+    # Plain numpy arrays have no MTime and are never cached
+    get_range(np.arange(5), cache=cache)
+    assert len(cache) == 3
+
+    cache.invalidate(array)
+    assert len(cache) == 0
+
+    # Keys follow the VTK arrays, not their Python wrappers
+    polydata = vtkPolyData()
+    polydata.GetPointData().AddArray(array)
+    get_range(array, 0, cache=cache)
+    del array
+    hits = cache.stats["hits"]
+    get_range(polydata.GetPointData().GetArray(0), 0, cache=cache)
+    assert cache.stats["hits"] == hits + 1
+
+
+def test_quantiles():
+    values = np.concatenate((np.linspace(0, 1, 100001), [1e6, -1e6, np.nan]))
+
+    histogram = compute_histogram(values, bins=100, value_range=(0, 1))
+    assert histogram.total == 100001
+    assert histogram.quantile_range(0.1, 0.9) == pytest.approx((0.1, 0.9), abs=1e-3)
+
+    sampled = compute_histogram(values, bins=10, value_range=(0, 1), sample=0.1)
+    assert sampled.total == pytest.approx(10001, abs=2)
+
+    low, high = compute_quantiles(values, (0.01, 0.99), chunk_size=1000)
+    assert low == pytest.approx(0.01, abs=0.01)
+    assert high == pytest.approx(0.99, abs=0.01)
+
+    # Outliers stretch the bins of the histogram method
+    low, high = compute_quantiles(values[:-3], (0.01, 0.99), method="histogram")
+    assert low == pytest.approx(0.01, abs=0.01)
+    assert high == pytest.approx(0.99, abs=0.01)
+
+    lut = LookupTable("quantiles")
+    histogram = lut.rescale_to_quantiles(values, 0.05, 0.95, bins=64)
+    assert lut.scalar_range == pytest.approx((0.05, 0.95), abs=0.01)
+    assert histogram.counts.size == 64
+    assert histogram.edges[0] == lut.scalar_range[0]
+
+
+def test_bounds():
+    cache = BoundsCache()
+    multiblock = vtkMultiBlockDataSet()
+    for i, extent in enumerate(((0, 10, 0, 10, 0, 10), (-20, -10, 0, 4, 0, 4))):
+        source = vtkRTAnalyticSource(whole_extent=extent)
+        source.Update()
+        multiblock.SetBlock(i, source.GetOutput())
+    multiblock.SetBlock(2, vtkPolyData())
+
+    partitions = cache.partition_bounds(multiblock)
+    assert partitions.shape == (2, 6)
+    assert get_bounds(multiblock, cache=cache) == (-20, 10, 0, 10, 0, 10)
+    assert cache.stats["hits"] == 1
+
+    # Modifying a partition invalidates the entry
+    multiblock.GetBlock(1).SetOrigin(-100, 0, 0)
+    assert get_bounds(multiblock, cache=cache)[0] == -120
+
+    # Entries follow the data objects, not their Python wrappers
+    parent = vtkMultiBlockDataSet()
+    parent.SetBlock(0, multiblock)
+    del multiblock
+    hits = cache.stats["hits"]
+    assert get_bounds(parent.GetBlock(0), cache=cache)[0] == -120
+    assert cache.stats["hits"] == hits + 1
+    cache.invalidate(parent.GetBlock(0))
+    assert len(cache) == 0
+    assert get_bounds(None) == EMPTY_BOUNDS
+
+
+def test_field_index():
+    partitioned = vtkPartitionedDataSet()
+    for i in range(2):
+        source = vtkRTAnalyticSource(whole_extent=(0, 4, 0, 4, 0, 4))
+        source.Update()
+        partitioned.SetPartition(i, source.GetOutput())
+    vectors = numpy_to_vtk(np.ones((125, 3)), deep=1)
+    vectors.SetName("Vectors")
+    partitioned.GetPartition(1).GetPointData().AddArray(vectors)
+
+    index = field_index(partitioned)
+    assert index is field_index(partitioned)
+    assert index.field_names("point_data") == ["RTData", "Vectors"]
+    assert not index.entry("RTData").partial
+    assert index.entry("Vectors").partial
+    assert index.entry("Vectors").number_of_components == 3
+    assert index.range("Vectors", component=0) == (1.0, 1.0)
+    assert FieldLocation.find(partitioned, "Vectors") == FieldLocation.PointData
+    assert FieldLocation.find(partitioned, "Unknown") == FieldLocation.UnAvailable
+    assert ColorMode.FieldComponent3 in ColorMode.options(index.entry("Vectors"))
+
+    # Adding an array to a partition rebuilds the index
+    partitioned.GetPartition(0).GetCellData().AddArray(vectors)
+    assert FieldLocation.CellData.field_names(partitioned) == ["Vectors"]
+
+    # Ranges stay available once the Python wrapper is collected
+    index = field_index(partitioned)
+    parent = vtkPartitionedDataSetCollection()
+    parent.SetPartitionedDataSet(0, partitioned)
+    del partitioned
+    assert index.range("RTData") is not None
+    assert index.range("Vectors", "cell_data") == (pytest.approx(3**0.5),) * 2
+
+
+def test_lut_rescale():
+    lut = LookupTable("bulk", preset_name="Cool to Warm")
+    size = lut.GetSize()
+    lut.rescale(-10, 30)
+    assert lut.GetRange() == pytest.approx((-10, 30))
+    assert lut.GetSize() == size
+    assert lut.nodes[:, 0].min() == pytest.approx(-10)
+
+    modified = []
+    lut.AddObserver("ModifiedEvent", lambda *_: modified.append(1))
+    scene = SceneManager.active_scene
+    assert scene.luts.rescale({"bulk": (0, 1), "missing": (0, 2)}) == ["bulk"]
+    assert lut.GetRange() == pytest.approx((0, 1))
+    assert len(modified) == 1
+    lut.rescale(-1, 1)
+    assert len(modified) == 2
+
+    # Midpoint and sharpness survive a rescale
+    nodes = np.array(lut.nodes)
+    nodes[1, 4:] = (0.25, 0.5)
+    lut.set_nodes(nodes)
+    lut.rescale(0, 2)
+    assert tuple(lut.nodes[1, 4:]) == (0.25, 0.5)
+    node = [0.0] * 6
+    lut.GetNodeValue(1, node)
+    assert node[4:] == [0.25, 0.5]
+
+    # Nodes added through VTK are picked up
+    lut.AddRGBPoint(1.5, 1, 1, 1)
+    assert lut.nodes.shape[0] == size + 1
+
+
+def test_preset_store(tmp_path):
+    (tmp_path / "mine.json").write_text(
+        '[{"Name": "Mine {1}", "ColorSpace": "Lab", "NanColor": [1, 0, 0],'
+        ' "RGBPoints": [0, 0, 0, 0, 1, 1, 1, 1]},'
+        ' {"Name": "Cool to Warm", "ColorSpace": "RGB",'
+        ' "RGBPoints": [0, 1, 1, 1, 2, 0, 0, 0]}]'
+    )
+    store = PresetStore()
+    assert "Cool to Warm" in store
+    assert "Mine {1}" not in store
+    builtin = store.preset("Cool to Warm")
+    assert store.preset("Cool to Warm") is builtin
+    assert store.preset("missing") is None
+
+    store.add_directory(tmp_path)
+    assert len(store) > 1
+    preset = store.preset("Mine {1}")
+    assert preset.color_space == "Lab"
+    assert preset.nan_color == (1, 0, 0)
+    assert preset.nodes.shape == (2, 4)
+    assert not preset.nodes.flags.writeable
+    assert store.preset("Cool to Warm").nodes[-1, 0] == 2
+
+
+def test_color_table_cache():
+    COLOR_TABLE_CACHE.clear()
+    first = LookupTable("baked_a", preset_name="Cool to Warm")
+    second = LookupTable("baked_b", preset_name="Cool to Warm")
+    first.rescale(0, 10)
+    second.rescale(0, 10)
+
+    table = first.color_table()
+    assert table.shape == (257, 4)
+    assert table.dtype == np.uint8
+    assert second.color_table() is table
+    assert COLOR_TABLE_CACHE.stats["hits"] == 1
+
+    baked = first.baked()
+    assert baked.GetTableRange() == pytest.approx((0, 10))
+    first.rescale(-5, 5)
+    assert baked.GetTableRange() == pytest.approx((-5, 5))
+    assert first.color_table() is not table
+
+    first.apply_preset("Rainbow Uniform")
+    assert first.color_table() is not second.color_table()
+
+
+def test_lut_map_array():
+    lut = LookupTable("mapped", preset_name="Cool to Warm")
+    lut.rescale(0, 10)
+    table = lut.color_table()
+
+    colors = lut.map_array(np.array([0.0, 10.0, 20.0, np.nan]))
+    assert colors.dtype == np.uint8
+    assert colors.shape == (4, 4)
+    assert (colors[0] == table[0]).all()
+    assert (colors[1] == table[-2]).all()
+    assert (colors[2] == table[-2]).all()
+    assert (colors[3] == table[-1]).all()
+
+    vectors = np.array([[3.0, 4.0, 0.0], [0.0, 0.0, 0.0]] * 1000)
+    chunked = lut.map_array(numpy_to_vtk(vectors), chunk_size=30)
+    assert (chunked[0] == lut.map_array(np.array([5.0]))[0]).all()
+    assert (chunked == lut.map_array(vectors, parallel=False)).all()
+    assert (lut.map_array(vectors, 1)[0] == lut.map_array(np.array([4.0]))[0]).all()
+    assert (lut.map_array(vectors[:, :3], ColorMode.RGB)[1] == (0, 0, 0, 255)).all()
+
+    with pytest.raises(ValueError, match="Invalid component"):
+        lut.map_array(vectors, 5)
+
+
+def test_lut_range_policies():
+    lut = LookupTable("temporal", preset_name="Cool to Warm")
+    lut.rescale(0, 1)
+    assert not lut.update_range(np.array([5.0, 6.0]))
+
+    lut.range_policy = "per_step"
+    assert lut.update_range(np.array([5.0, 6.0]))
+    assert lut.GetRange() == pytest.approx((5, 6))
+    assert lut.update_range(np.array([2.0, 3.0]))
+    assert lut.GetRange() == pytest.approx((2, 3))
+
+    lut.range_policy = "grow"
+    lut.update_range(np.array([5.0, 6.0]))
+    lut.update_range(np.array([2.0, 3.0]))
+    assert lut.GetRange() == pytest.approx((2, 6))
+    assert not lut.update_range(np.array([3.0, 4.0]))
+
+    lut.range_policy = "global_over_time"
+    lut.update_range(np.array([5.0, 6.0]))
+    assert lut.GetRange() == pytest.approx((5, 6))
+    lut.update_range(np.array([5.0, 6.0]), global_range=(-1, 10))
+    assert lut.GetRange() == pytest.approx((-1, 10))
+
+    with pytest.raises(ValueError, match="Invalid range policy"):
+        lut.range_policy = "sometimes"
+
+
+def test_global_range_of_filter():
+    # Neither the source nor the filter read a file: the range grows instead
+    source = vtkTimeSourceExample(x_amplitude=1, analytic=0)
+    triangles = vtkDataSetTriangleFilter()
+    source >> triangles
+    rep = GeometryRepresentation(triangles)
+    rep.color_by("Point X", FieldLocation.PointData)
+    lut = rep.scene.luts["Point X"]
+    lut.range_policy = "global_over_time"
+
+    expected = None
+    for time_value in rep.time_values()[:4]:
+        rep.time_value = time_value
+        rep.update()
+        rep.update_color_range()
+        array = rep.input_data.GetPointData().GetArray("Point X")
+        expected = merge_range(expected, array.GetRange())
+    assert lut.GetRange() == pytest.approx(expected)
+
+
+def test_surface_cache():
+    source = vtkTimeSourceExample(x_amplitude=1, analytic=0)
+    rep = GeometryRepresentation(source)
+    rep.enable_surface_cache()
+    time_values = rep.time_values()[:3]
+
+    surfaces = []
+    for time_value in time_values:
+        rep.time_value = time_value
+        rep.update()
+        surfaces.append(rep.mapper.GetInputDataObject(0, 0))
+    assert rep.surface_cache.stats["misses"] == len(time_values)
+    assert surfaces[0].GetNumberOfPoints() > 0
+
+    # Replay only swaps the mapper input
+    for time_value, surface in zip(time_values, surfaces):
+        rep.time_value = time_value
+        rep.update()
+        assert rep.mapper.GetInputDataObject(0, 0) is surface
+    assert rep.surface_cache.stats["hits"] == len(time_values)
+
+    # Upstream modifications are not served from the cache
+    source.x_amplitude = 2
+    rep.update()
+    assert rep.mapper.GetInputDataObject(0, 0) is not surfaces[-1]
+
+    # Neither are the surface filter settings
+    surface = rep.mapper.GetInputDataObject(0, 0)
+    rep.geometry.pass_through_cell_ids = 1
+    rep.update()
+    surface_with_ids = rep.mapper.GetInputDataObject(0, 0)
+    assert surface_with_ids is not surface
+    assert surface_with_ids.GetCellData().GetArray("vtkOriginalCellIds") is not None
+    assert rep.surface_cache.stats["misses"] == len(time_values) + 2
+    assert rep.surface_cache.stats["hits"] == len(time_values)
+
+
+def test_surface_paths():
+    polydata = vtkPolyData()
+    rep = GeometryRepresentation(polydata)
+    assert rep.surface_path == "polydata"
+    assert rep.mapper.GetInputDataObject(0, 0) is polydata
+
+    slice_source = vtkRTAnalyticSource(whole_extent=(-10, 10, -10, 10, 0, 0))
+    rep = GeometryRepresentation(slice_source)
+    assert rep.surface_path == "structured_2d"
+    rep.mapper.Update()
+    surface = rep.mapper.GetInputDataObject(0, 0)
+    assert surface.GetNumberOfPolys() == 20 * 20
+    assert surface.GetPointData().GetArray("RTData") is not None
+
+    rep = GeometryRepresentation(vtkRTAnalyticSource())
+    assert rep.surface_path == "surface"
+
+    triangles = vtkDataSetTriangleFilter()
+    vtkRTAnalyticSource(whole_extent=(0, 4, 0, 4, 0, 4)) >> triangles
+    rep = GeometryRepresentation(triangles)
+    assert rep.surface_path == "surface"
+    rep.mapper.Update()
+    assert rep.mapper.GetInputDataObject(0, 0).GetNumberOfPolys() > 0
+
+
+def test_views_sharing_a_source():
+    source = vtkTimeSourceExample(x_amplitude=1, analytic=0)
+    threshold = vtkThreshold()
+    source >> threshold
+    assert pipeline_lock(threshold) is pipeline_lock(source)
+
+    state = {"running": 0, "overlaps": 0}
+    lock = threading.Lock()
+
+    def on_start(*_):
+        with lock:
+            state["running"] += 1
+            state["overlaps"] += state["running"] > 1
+
+    def on_end(*_):
+        with lock:
+            state["running"] -= 1
+
+    source.AddObserver("StartEvent", on_start)
+    source.AddObserver("EndEvent", on_end)
+
+    views = [RenderView(), RenderView()]
+    views[0].create_representation(source)
+    views[1].create_representation(threshold)
+    time_values = source.GetOutputInformation(0).Get(
+        vtkStreamingDemandDrivenPipeline.TIME_STEPS()
+    )
+
+    async def play():
+        for time_value in time_values[:5]:
+            await asyncio.gather(*[view.update_async(time_value) for view in views])
+
+    asyncio.run(play())
+    assert state["overlaps"] == 0
+    assert all(view.time_value == time_values[4] for view in views)